@@ -0,0 +1,341 @@
+"""
+Binary bundle format for BioCrayon colormap collections.
+
+A bundle stores a validated colormap collection in a compact binary layout
+that is opened through ``mmap``: colors and positions are read as zero-copy
+NumPy views and no JSON parsing of colors or schema validation happens on
+read. Bundles are validated once, when they are written.
+
+Layout (all integers little-endian)::
+
+    magic        8 bytes   b"BCRAYON\\0"
+    version      uint16
+    flags        uint16    (reserved, 0)
+    header_size  uint32
+    header       UTF-8 JSON (metadata, colormap table, section offsets)
+    padding      to an 8-byte boundary
+    data         string table offsets (uint32), string table bytes,
+                 packed uint8 RGB arrays and float64 position arrays
+
+Offsets in the header are relative to the start of the data section.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from .compiled import CompiledColormap
+from .utils import hex_to_rgb_array, rgb_array_to_hex
+
+# File signature of a bundle
+BUNDLE_MAGIC = b"BCRAYON\0"
+
+# Current bundle format version
+BUNDLE_VERSION = 1
+
+# File suffix that selects the bundle format in BioCrayon.save
+BUNDLE_SUFFIX = ".bcb"
+
+_PREAMBLE = struct.Struct("<8sHHI")
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    """Round an offset up to a multiple of alignment."""
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def is_bundle(filepath: Union[str, Path]) -> bool:
+    """
+    Check whether a file is a colormap bundle.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        True if the file starts with the bundle signature
+    """
+    try:
+        with open(filepath, "rb") as f:
+            return f.read(len(BUNDLE_MAGIC)) == BUNDLE_MAGIC
+    except OSError:
+        return False
+
+
+def write_bundle(filepath: Union[str, Path], data: Dict[str, Any]) -> None:
+    """
+    Write colormap data to a binary bundle.
+
+    Colors are stored as packed RGB, so hex strings are normalized to the
+    '#RRGGBB' form when the bundle is read back. The data is expected to be
+    validated already (BioCrayon.save validates before writing).
+
+    The bundle is written to a temporary file that replaces filepath, so
+    bundles that are open (including the one the data was read from) keep
+    their contents.
+
+    Args:
+        filepath: Path of the bundle file
+        data: Dictionary with 'colormaps' and optional 'metadata'
+
+    Raises:
+        ValueError: If a colormap type is unknown or a color is invalid
+    """
+    labels: List[bytes] = []
+    arrays: List[Tuple[int, bytes]] = []
+    table = []
+    offset = 0
+
+    def add_array(array: np.ndarray) -> int:
+        nonlocal offset
+        offset = _align(offset)
+        arrays.append((offset, array.tobytes()))
+        start = offset
+        offset += array.nbytes
+        return start
+
+    for name, colormap in data.get("colormaps", {}).items():
+        colormap_type = colormap["type"]
+        colors = colormap["colors"]
+        entry = {
+            "name": name,
+            "type": colormap_type,
+            "count": len(colors),
+            "fields": {
+                key: value
+                for key, value in colormap.items()
+                if key not in ("type", "colors", "positions")
+            },
+        }
+
+        if colormap_type == "categorical":
+            entry["labels"] = len(labels)
+            labels.extend(str(label).encode("utf-8") for label in colors)
+            hex_colors = list(colors.values())
+        elif colormap_type == "continuous":
+            hex_colors = list(colors)
+        else:
+            raise ValueError(f"Unknown colormap type: {colormap_type}")
+
+        entry["rgb"] = add_array(hex_to_rgb_array(hex_colors))
+        if colormap_type == "continuous":
+            positions = np.asarray(colormap["positions"], dtype="<f8")
+            entry["positions"] = add_array(positions)
+        table.append(entry)
+
+    # String table: (count + 1) uint32 byte offsets followed by UTF-8 bytes
+    string_offsets = np.zeros(len(labels) + 1, dtype="<u4")
+    np.cumsum([len(label) for label in labels], out=string_offsets[1:])
+    strings = {"count": len(labels)}
+    strings["offsets"] = add_array(string_offsets)
+    strings["data"] = add_array(np.frombuffer(b"".join(labels), dtype=np.uint8))
+
+    header = json.dumps(
+        {
+            "metadata": data.get("metadata", {}),
+            "strings": strings,
+            "colormaps": table,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    # Open bundles map the old file; replacing it leaves their mapping intact
+    filepath = Path(filepath)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(filepath.parent), prefix=filepath.name, suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, len(header)))
+            f.write(header)
+            f.write(b"\0" * (data_start - _PREAMBLE.size - len(header)))
+            position = 0
+            for array_offset, array_bytes in arrays:
+                f.write(b"\0" * (array_offset - position))
+                f.write(array_bytes)
+                position = array_offset + len(array_bytes)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _LazyEntries(MutableMapping):
+    """
+    Mapping whose values are built from the bundle on first access.
+
+    Assigned values are stored as given; deleted names are forgotten.
+    Iteration follows the order of the bundle, followed by added names.
+    """
+
+    def __init__(self, names: Iterable[str], build: Callable[[str], Any]):
+        self._build = build
+        # Ordered set of the names; dict keys keep insertion order
+        self._names: Dict[str, None] = dict.fromkeys(names)
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        if name not in self._names:
+            raise KeyError(name)
+        # setdefault keeps the first result if two threads build the entry
+        return self._values.setdefault(name, self._build(name))
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._names[name] = None
+        self._values[name] = value
+
+    def __delitem__(self, name: str) -> None:
+        del self._names[name]
+        self._values.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def clear(self) -> None:
+        # MutableMapping.clear would build every value before dropping it
+        self._names.clear()
+        self._values.clear()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self._values)}/{len(self._names)} built)"
+
+
+class Bundle:
+    """
+    Colormap collection read from a binary bundle.
+
+    Opening a bundle parses only its header. The dictionary and compiled
+    form of a colormap are built from the mapped file the first time either
+    is looked up, so opening costs the same whatever the number of colors
+    and labels.
+
+    Attributes:
+        metadata: Metadata dictionary of the collection
+        colormaps: Colormap dictionaries, as stored in BioCrayon
+        compiled: CompiledColormap for each colormap, backed by zero-copy
+            views into the memory-mapped file
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        with open(filepath, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(buffer) < _PREAMBLE.size:
+            raise ValueError(f"Not a BioCrayon bundle: {filepath}")
+        magic, version, _, header_size = _PREAMBLE.unpack_from(buffer)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"Not a BioCrayon bundle: {filepath}")
+        if version > BUNDLE_VERSION:
+            raise ValueError(
+                f"Unsupported bundle version {version} (supported: {BUNDLE_VERSION})"
+            )
+
+        header_end = _PREAMBLE.size + header_size
+        header = json.loads(buffer[_PREAMBLE.size : header_end].decode("utf-8"))
+
+        self._buffer = buffer
+        self._data_start = _align(header_end)
+        strings = header["strings"]
+        self._string_offsets = self._view(
+            "<u4", strings["count"] + 1, strings["offsets"]
+        )
+        self._string_data = strings["data"]
+        self._entries = {entry["name"]: entry for entry in header["colormaps"]}
+        self._decoded: Dict[str, Tuple[Dict[str, Any], CompiledColormap]] = {}
+
+        self.metadata = header["metadata"]
+        self.colormaps = _LazyEntries(self._entries, lambda name: self._decode(name)[0])
+        self.compiled = _LazyEntries(self._entries, lambda name: self._decode(name)[1])
+
+    def _view(self, dtype: str, count: int, offset: int) -> np.ndarray:
+        """Return a zero-copy view into the data section."""
+        return np.frombuffer(
+            self._buffer, dtype=dtype, count=count, offset=self._data_start + offset
+        )
+
+    def _decode(self, name: str) -> Tuple[Dict[str, Any], CompiledColormap]:
+        """Build the dictionary and compiled form of a colormap."""
+        try:
+            return self._decoded[name]
+        except KeyError:
+            pass
+
+        entry = self._entries[name]
+        count = entry["count"]
+        rgb = self._view("u1", count * 3, entry["rgb"]).reshape(count, 3)
+        hex_colors = rgb_array_to_hex(rgb)
+        colormap = {"type": entry["type"]}
+
+        positions = None
+        if entry["type"] == "categorical":
+            first = entry["labels"]
+            bounds = self._string_offsets[first : first + count + 1].tolist()
+            label_bytes = bytes(
+                self._view("u1", bounds[-1] - bounds[0], self._string_data + bounds[0])
+            )
+            labels = [
+                label_bytes[begin - bounds[0] : end - bounds[0]].decode("utf-8")
+                for begin, end in zip(bounds[:-1], bounds[1:])
+            ]
+            colormap["colors"] = dict(zip(labels, hex_colors.tolist()))
+        else:
+            positions = self._view("<f8", count, entry["positions"])
+            colormap["colors"] = hex_colors.tolist()
+            colormap["positions"] = positions.tolist()
+        colormap.update(entry["fields"])
+
+        compiled = CompiledColormap(
+            colormap, rgb=rgb, positions=positions, hex_colors=hex_colors
+        )
+        return self._decoded.setdefault(name, (colormap, compiled))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the collection as a colormap data dictionary."""
+        data = {"colormaps": self.colormaps}
+        if self.metadata:
+            data = {"metadata": self.metadata, **data}
+        return data
+
+    def __len__(self) -> int:
+        """Return number of colormaps."""
+        return len(self.colormaps)
+
+    def __repr__(self):
+        return f"Bundle(colormaps={list(self.colormaps)})"
+
+
+def read_bundle(filepath: Union[str, Path]) -> Bundle:
+    """
+    Open a binary bundle.
+
+    Args:
+        filepath: Path of the bundle file
+
+    Returns:
+        Bundle with the colormaps and their compiled forms
+
+    Raises:
+        ValueError: If the file is not a supported bundle
+        FileNotFoundError: If the file doesn't exist
+    """
+    return Bundle(filepath)
@@ -0,0 +1,569 @@
+"""
+Access to the BioCrayon community colormap collection.
+
+The collection ships with the package together with an index manifest, so
+bundled colormaps resolve locally without network access. Colormaps that are
+not bundled are fetched from the bio-crayon GitHub repository and kept in a
+persistent on-disk cache, so repeated loads across processes cost at most one
+conditional request (and none while the cached copy is fresh).
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    import requests
+
+# Raw file URL of the community colormap collection
+COMMUNITY_RAW_URL = (
+    "https://raw.githubusercontent.com/maflot/bio-crayon/main/community_colormaps"
+)
+
+# GitHub contents API URL of the community colormap collection
+COMMUNITY_API_URL = (
+    "https://api.github.com/repos/maflot/bio-crayon/contents/community_colormaps"
+)
+
+# File name of the index manifest at the root of the collection
+INDEX_FILENAME = "index.json"
+
+# Maximum number of concurrent requests when listing categories
+DEFAULT_MAX_WORKERS = 8
+
+# Version of the index manifest format
+INDEX_VERSION = 1
+
+# Bundled index manifest, loaded on first use by load_bundled_index
+_bundled_index: Optional[Dict[str, Any]] = None
+
+# Seconds a cached entry is served without revalidation
+DEFAULT_TTL = 24 * 60 * 60
+
+# Top-level directories of the cache; clear() only touches these
+CACHE_NAMESPACES = ("colormaps", "listing")
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+_KEY_PART = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the default community cache directory.
+
+    Uses ``BIO_CRAYON_CACHE_DIR`` if set, else ``$XDG_CACHE_HOME/bio_crayon``,
+    else ``~/.cache/bio_crayon``.
+
+    Returns:
+        Path of the cache directory (not created)
+    """
+    cache_dir = os.environ.get("BIO_CRAYON_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir).expanduser()
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache:
+        return Path(xdg_cache).expanduser() / "bio_crayon"
+    return Path.home() / ".cache" / "bio_crayon"
+
+
+def offline_default() -> bool:
+    """Check whether offline mode is enabled through ``BIO_CRAYON_OFFLINE``."""
+    return os.environ.get("BIO_CRAYON_OFFLINE", "").strip().lower() in _TRUE_VALUES
+
+
+def community_url(category: str, name: str, base_url: Optional[str] = None) -> str:
+    """
+    Build the URL of a community colormap file.
+
+    Args:
+        category: Category of the colormap (e.g., "genomics")
+        name: Name of the colormap file (without .json extension)
+        base_url: Root URL of the collection (default: COMMUNITY_RAW_URL)
+
+    Returns:
+        URL of the colormap JSON file
+    """
+    base_url = COMMUNITY_RAW_URL if base_url is None else base_url
+    return f"{base_url.rstrip('/')}/{category}/{name}.json"
+
+
+class CommunityCache:
+    """
+    Persistent cache of JSON documents fetched over HTTP.
+
+    Each entry is stored as one JSON file holding the document together with
+    its ETag, Last-Modified header and fetch time. Entries younger than
+    ``ttl`` are served directly; older entries are revalidated with a
+    conditional request. Writes go through a temporary file and
+    ``os.replace``, so concurrent processes never read a partial entry.
+
+    Args:
+        cache_dir: Cache directory (default: default_cache_dir())
+        ttl: Seconds an entry is served without revalidation
+        offline: Never touch the network and serve cached entries regardless
+            of age (default: ``BIO_CRAYON_OFFLINE`` environment variable)
+        timeout: Timeout of network requests in seconds
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        ttl: float = DEFAULT_TTL,
+        offline: Optional[bool] = None,
+        timeout: float = 10,
+    ):
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.offline = offline_default() if offline is None else offline
+        self.timeout = timeout
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """Pooled HTTP session shared by all requests of this cache."""
+        if self._session is None:
+            # Worker threads of list_community may get here at the same time
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=DEFAULT_MAX_WORKERS,
+                        pool_maxsize=DEFAULT_MAX_WORKERS,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def path_for(self, key: str) -> Path:
+        """
+        Get the file backing a cache key.
+
+        Args:
+            key: Slash-separated key starting with one of CACHE_NAMESPACES,
+                e.g. "colormaps/genomics/quality_scores"
+
+        Returns:
+            Path of the cache entry
+
+        Raises:
+            ValueError: If the key contains unsafe path components or is
+                outside the cache namespaces
+        """
+        parts = key.split("/")
+        if len(parts) < 2 or parts[0] not in CACHE_NAMESPACES:
+            raise ValueError(
+                f"Invalid cache key: {key} (must start with one of "
+                f"{list(CACHE_NAMESPACES)})"
+            )
+        for part in parts:
+            if not _KEY_PART.match(part) or part in (".", ".."):
+                raise ValueError(f"Invalid cache key: {key}")
+        return self.cache_dir.joinpath(*parts[:-1], parts[-1] + ".json")
+
+    def read(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a cache entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Entry dictionary with 'data', 'etag', 'last_modified' and
+            'fetched_at', or None if missing or unreadable
+        """
+        try:
+            with open(self.path_for(key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "data" not in entry:
+            return None
+        return entry
+
+    def write(
+        self,
+        key: str,
+        data: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Atomically write a cache entry.
+
+        Args:
+            key: Cache key
+            data: JSON-serializable document
+            etag: ETag header of the response
+            last_modified: Last-Modified header of the response
+        """
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "data": data,
+        }
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(path.parent), prefix=path.name, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is younger than the TTL."""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def fetch_json(self, url: str, key: str) -> Any:
+        """
+        Get a JSON document through the cache.
+
+        Fresh entries are returned without a request. Stale entries are
+        revalidated with If-None-Match/If-Modified-Since; a 304 response
+        refreshes the entry. If the network fails, a stale entry is served.
+
+        Args:
+            url: URL of the JSON document
+            key: Cache key of the document
+
+        Returns:
+            Parsed JSON document
+
+        Raises:
+            FileNotFoundError: If offline and the document is not cached
+            requests.RequestException: If the request fails and nothing is cached
+        """
+        entry = self.read(key)
+        if entry is not None and (self.offline or self.is_fresh(entry)):
+            return entry["data"]
+        if self.offline:
+            raise FileNotFoundError(
+                f"'{key}' is not cached and offline mode is enabled "
+                f"(cache directory: {self.cache_dir})"
+            )
+
+        import requests
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and entry is not None:
+                self.write(
+                    key,
+                    entry["data"],
+                    etag=response.headers.get("ETag", entry.get("etag")),
+                    last_modified=response.headers.get(
+                        "Last-Modified", entry.get("last_modified")
+                    ),
+                )
+                return entry["data"]
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError):
+            if entry is not None:
+                return entry["data"]
+            raise
+
+        self.write(
+            key,
+            data,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return data
+
+    def clear(self) -> None:
+        """
+        Remove all cache entries.
+
+        Only the namespace directories written by the cache are touched, so
+        other files in the cache directory are kept.
+        """
+        for namespace in CACHE_NAMESPACES:
+            root = self.cache_dir / namespace
+            if not root.is_dir():
+                continue
+            for path in list(root.rglob("*.json")) + list(root.rglob("*.tmp")):
+                path.unlink()
+            # Remove the emptied directories, deepest first
+            directories = [path for path in root.rglob("*") if path.is_dir()]
+            for directory in sorted(directories, reverse=True) + [root]:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    pass
+
+    def __repr__(self):
+        return (
+            f"CommunityCache(cache_dir='{self.cache_dir}', ttl={self.ttl}, "
+            f"offline={self.offline})"
+        )
+
+
+def list_community(
+    cache: CommunityCache,
+    use_index: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    api_url: Optional[str] = None,
+    base_url: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    """
+    List the community colormaps by category through the cache.
+
+    By default the collection root and every category directory are listed
+    through the GitHub contents API, with the category listings fetched
+    concurrently. With ``use_index`` the listing is read from the index
+    manifest instead, which costs a single request.
+
+    Args:
+        cache: Cache used for all requests
+        use_index: Read the listing from the index manifest
+        max_workers: Maximum number of concurrent category requests
+        api_url: Contents API URL of the collection (default: COMMUNITY_API_URL)
+        base_url: Raw file URL of the collection (default: COMMUNITY_RAW_URL)
+
+    Returns:
+        Dictionary mapping category names to sorted lists of colormap names
+        (categories without colormaps are omitted)
+
+    Raises:
+        FileNotFoundError: If offline and the listing is not cached
+        requests.RequestException: If a request fails and nothing is cached
+    """
+    if use_index:
+        base_url = COMMUNITY_RAW_URL if base_url is None else base_url
+        index = cache.fetch_json(
+            f"{base_url.rstrip('/')}/{INDEX_FILENAME}", "listing/index"
+        )
+        return listing_from_index(index)
+
+    api_url = (COMMUNITY_API_URL if api_url is None else api_url).rstrip("/")
+    root = cache.fetch_json(api_url, "listing/root")
+    category_names = [item["name"] for item in root if item["type"] == "dir"]
+    if not category_names:
+        return {}
+
+    def list_category(category: str) -> List[str]:
+        items = cache.fetch_json(f"{api_url}/{category}", f"listing/{category}")
+        return sorted(
+            item["name"][: -len(".json")]
+            for item in items
+            if item["type"] == "file" and item["name"].endswith(".json")
+        )
+
+    workers = max(1, min(max_workers, len(category_names)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        listings = executor.map(list_category, category_names)
+        categories = dict(zip(category_names, listings))
+
+    return {category: names for category, names in categories.items() if names}
+
+
+def listing_from_index(index: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Extract the category listing from an index manifest.
+
+    Args:
+        index: Parsed index manifest
+
+    Returns:
+        Dictionary mapping category names to sorted lists of colormap names
+        (categories without colormaps are omitted)
+    """
+    listing = {}
+    for category, entry in index["categories"].items():
+        names = sorted(entry["colormaps"])
+        if names:
+            listing[category] = names
+    return listing
+
+
+def bundled_dir() -> Optional[Path]:
+    """
+    Get the directory of the bundled community collection.
+
+    Installed packages carry the collection as ``bio_crayon/community_colormaps``;
+    source checkouts use the ``community_colormaps`` directory next to the
+    package.
+
+    Returns:
+        Path of the bundled collection, or None if it is not available
+    """
+    package_dir = Path(__file__).parent
+    for candidate in (
+        package_dir / "community_colormaps",
+        package_dir.parent / "community_colormaps",
+    ):
+        if (candidate / INDEX_FILENAME).is_file():
+            return candidate
+    return None
+
+
+def load_bundled_index() -> Optional[Dict[str, Any]]:
+    """
+    Get the index manifest of the bundled community collection.
+
+    The manifest is read once per process.
+
+    Returns:
+        Parsed index manifest, or None if no bundled collection is available
+    """
+    global _bundled_index
+    if _bundled_index is None:
+        root = bundled_dir()
+        if root is None:
+            return None
+        with open(root / INDEX_FILENAME, "r") as f:
+            _bundled_index = json.load(f)
+    return _bundled_index
+
+
+def bundled_path(category: str, name: str) -> Optional[Path]:
+    """
+    Resolve a community colormap in the bundled collection.
+
+    Args:
+        category: Category of the colormap (e.g., "genomics")
+        name: Name of the colormap file (without .json extension)
+
+    Returns:
+        Path of the bundled colormap file, or None if it is not bundled
+    """
+    index = load_bundled_index()
+    if index is None:
+        return None
+    entry = index["categories"].get(category, {}).get("colormaps", {}).get(name)
+    if entry is None:
+        return None
+    return bundled_dir() / entry["path"]
+
+
+def build_index(root: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Build the index manifest of a community collection directory.
+
+    The manifest lists, per category, the number of colormap files and for
+    each file its path, metadata name, description, keywords and the types of
+    the colormaps it contains.
+
+    Args:
+        root: Directory containing one subdirectory per category
+
+    Returns:
+        Index manifest dictionary
+    """
+    root = Path(root)
+    categories = {}
+    for category_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        colormaps = {}
+        for path in sorted(category_dir.glob("*.json")):
+            with open(path, "r") as f:
+                data = json.load(f)
+            metadata = data.get("metadata", {})
+            keywords = list(metadata.get("keywords", [])) + list(
+                metadata.get("tags", [])
+            )
+            colormaps[path.stem] = {
+                "path": path.relative_to(root).as_posix(),
+                "name": metadata.get("name", path.stem),
+                "description": metadata.get("description", ""),
+                "keywords": sorted(set(keywords)),
+                "colormaps": {
+                    colormap_name: colormap["type"]
+                    for colormap_name, colormap in data.get("colormaps", {}).items()
+                },
+            }
+        if colormaps:
+            categories[category_dir.name] = {
+                "count": len(colormaps),
+                "colormaps": colormaps,
+            }
+    return {"version": INDEX_VERSION, "categories": categories}
+
+
+def write_index(root: Union[str, Path]) -> Path:
+    """
+    Regenerate the index manifest of a community collection directory.
+
+    Args:
+        root: Directory containing one subdirectory per category
+
+    Returns:
+        Path of the written index manifest
+    """
+    path = Path(root) / INDEX_FILENAME
+    with open(path, "w") as f:
+        json.dump(build_index(root), f, indent=2)
+        f.write("\n")
+    return path
+
+
+def audit_colorblind_safety(
+    root: Optional[Union[str, Path]] = None,
+    colorblind_types: Optional[List[str]] = None,
+    severity: float = 1.0,
+) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+    """
+    Check every categorical colormap of a community collection for colorblind safety.
+
+    Args:
+        root: Directory containing one subdirectory per category; defaults
+            to the bundled collection
+        colorblind_types: Deficiencies to check for; defaults to all
+            supported types
+        severity: Degree of the deficiencies, from 0 to 1
+
+    Returns:
+        Dictionary mapping "category/name" of each colormap file to the
+        results of bio_crayon.colorblind.audit_colormaps for its colormaps
+
+    Raises:
+        FileNotFoundError: If no root is given and no bundled collection is
+            available
+    """
+    from .colorblind import COLORBLIND_TYPES, audit_colormaps
+
+    if root is None:
+        root = bundled_dir()
+        if root is None:
+            raise FileNotFoundError("No bundled community collection is available")
+    if colorblind_types is None:
+        colorblind_types = list(COLORBLIND_TYPES)
+
+    results = {}
+    for category_dir in sorted(p for p in Path(root).iterdir() if p.is_dir()):
+        for path in sorted(category_dir.glob("*.json")):
+            with open(path, "r") as f:
+                data = json.load(f)
+            results[f"{category_dir.name}/{path.stem}"] = audit_colormaps(
+                data.get("colormaps", {}), colorblind_types, severity
+            )
+    return results
@@ -0,0 +1,373 @@
+"""
+Compiled NumPy representation of BioCrayon colormaps.
+
+Colormaps are stored as JSON-like dictionaries of hex strings. Parsing those
+strings on every lookup dominates the cost of coloring large datasets, so each
+colormap is compiled once into contiguous arrays that all lookups read from.
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .utils import (
+    hex_to_rgb_array,
+    lab_to_rgb_array,
+    rgb_array_to_hex,
+    rgb_to_lab_array,
+)
+
+INTERPOLATIONS = ("linear", "lab")
+
+
+class CompiledColormap:
+    """
+    Array form of a single colormap.
+
+    Args:
+        colormap: Dictionary containing colormap data
+        rgb: Precomputed uint8 anchor colors of shape (K, 3), used instead of
+            parsing the hex strings of ``colormap``
+        positions: Precomputed float64 positions (continuous only)
+        hex_colors: Precomputed hex strings matching ``rgb``
+
+    Attributes:
+        type: Colormap type ('categorical' or 'continuous')
+        colors: float32 array of shape (K, 4) with RGBA values in [0, 1]
+        rgb: uint8 array of shape (K, 3) with the exact anchor RGB values
+        positions: float64 array of shape (K,) (continuous only, else None)
+        categories: Tuple of category names (categorical only, else None)
+        index: Mapping of category name to row (categorical only, else None)
+        hex_colors: Array of the hex strings as stored in the colormap
+        lab: float64 array of shape (K, 3) with the anchor colors in LAB
+            space, computed once on first use
+    """
+
+    __slots__ = (
+        "type",
+        "colors",
+        "rgb",
+        "positions",
+        "categories",
+        "index",
+        "hex_colors",
+        "position_list",
+        "rgb_list",
+        "_lab",
+        "_lab_list",
+        "_source",
+        "_size",
+    )
+
+    def __init__(
+        self,
+        colormap: Dict[str, Any],
+        rgb: Optional[np.ndarray] = None,
+        positions: Optional[np.ndarray] = None,
+        hex_colors: Optional[np.ndarray] = None,
+    ):
+        colormap_type = colormap["type"]
+        source = colormap["colors"]
+        colors = source
+
+        if colormap_type == "categorical":
+            # Work on one snapshot: fill_missing may add categories meanwhile
+            colors = dict(source)
+            self.categories = tuple(colors.keys())
+            self.index = {category: i for i, category in enumerate(colors)}
+            self.positions = None
+            self.position_list = None
+        elif colormap_type == "continuous":
+            self.categories = None
+            self.index = None
+            if positions is None:
+                positions = np.ascontiguousarray(
+                    colormap["positions"], dtype=np.float64
+                )
+            self.positions = positions
+            self.position_list = positions.tolist()
+        else:
+            raise ValueError(f"Unknown colormap type: {colormap_type}")
+
+        # Arrays decoded elsewhere (e.g. views into a binary bundle) are used
+        # as-is instead of re-parsing the hex strings
+        if rgb is None:
+            if colormap_type == "categorical":
+                hex_list = list(colors.values())
+            else:
+                hex_list = list(colors)
+            rgb = hex_to_rgb_array(hex_list)
+            hex_colors = np.array(hex_list, dtype="U7")
+        elif hex_colors is None:
+            hex_colors = rgb_array_to_hex(rgb)
+
+        self.type = colormap_type
+        self.rgb = rgb
+        self.rgb_list = rgb.tolist()
+        self.hex_colors = hex_colors
+
+        rgba = np.ones((len(rgb), 4), dtype=np.float32)
+        rgba[:, :3] = rgb / np.float32(255.0)
+        self.colors = rgba
+
+        self._lab = None
+        self._lab_list = None
+        self._source = source
+        self._size = len(colors)
+
+    @property
+    def lab(self) -> np.ndarray:
+        """Anchor colors in LAB space, converted once and cached."""
+        if self._lab is None:
+            self._lab = rgb_to_lab_array(self.rgb)
+        return self._lab
+
+    @property
+    def lab_list(self) -> List[List[float]]:
+        """Anchor LAB colors as nested lists for scalar lookups."""
+        if self._lab_list is None:
+            self._lab_list = self.lab.tolist()
+        return self._lab_list
+
+    def interpolate(
+        self, values: np.ndarray, interpolation: str = "linear"
+    ) -> np.ndarray:
+        """
+        Interpolate the anchor colors for a flat array of values.
+
+        Args:
+            values: 1-D float array of values
+            interpolation: 'linear' (RGB, like get_color) or 'lab' (LAB, like
+                get_color_lab)
+
+        Returns:
+            Float array of shape (len(values), 3) with RGB values 0-255
+
+        Raises:
+            ValueError: If the colormap is not continuous or the
+                interpolation is not supported
+        """
+        if self.type != "continuous":
+            raise ValueError("Interpolation only applies to continuous colormaps")
+        if interpolation == "linear":
+            return interpolate_linear(values, self.positions, self.rgb)
+        if interpolation == "lab":
+            return interpolate_lab(values, self.positions, self.rgb, lab=self.lab)
+        raise ValueError(
+            f"Unsupported interpolation '{interpolation}'. Use one of {list(INTERPOLATIONS)}"
+        )
+
+    def matches(self, colormap: Dict[str, Any]) -> bool:
+        """
+        Check whether this compiled form is still current for a colormap.
+
+        Catches colormaps whose colors were replaced or extended in place
+        (e.g. through bracket access) after compilation.
+
+        Args:
+            colormap: Dictionary containing colormap data
+
+        Returns:
+            True if the colormap colors are unchanged since compilation
+        """
+        colors = colormap.get("colors")
+        return colors is self._source and len(colors) == self._size
+
+    def __len__(self) -> int:
+        """Return number of colors."""
+        return self._size
+
+    def __repr__(self):
+        return f"CompiledColormap(type='{self.type}', n_colors={self._size})"
+
+
+def compile_colormap(colormap: Dict[str, Any]) -> CompiledColormap:
+    """
+    Compile a colormap dictionary into its array form.
+
+    Args:
+        colormap: Dictionary containing categorical or continuous colormap data
+
+    Returns:
+        CompiledColormap for the colormap
+
+    Raises:
+        ValueError: If the colormap type is unknown or a color is invalid
+    """
+    return CompiledColormap(colormap)
+
+
+def _locate_segments(values: np.ndarray, positions: np.ndarray):
+    """
+    Find the interpolation segment and factor for each value.
+
+    Interior values use the first segment [positions[i], positions[i + 1]]
+    containing them, like the linear scan in BioCrayon.get_color.
+
+    Returns:
+        Tuple of (segment end index array, interpolation factor array)
+    """
+    idx = np.searchsorted(positions, values, side="left")
+    idx = np.clip(idx, 1, len(positions) - 1)
+    lo = positions[idx - 1]
+    hi = positions[idx]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (values - lo) / (hi - lo)
+    return idx, t
+
+
+def interpolate_linear(
+    values: np.ndarray, positions: np.ndarray, rgb: np.ndarray
+) -> np.ndarray:
+    """
+    Linearly interpolate anchor colors for a flat array of values.
+
+    Mirrors the scalar logic of BioCrayon.get_color: values at or beyond the
+    first/last position are clamped to the end colors, and interior values
+    use the first segment [positions[i], positions[i + 1]] containing them.
+
+    Args:
+        values: 1-D float array of values
+        positions: 1-D float array of ascending anchor positions
+        rgb: Array of shape (len(positions), C) with anchor colors
+
+    Returns:
+        Float array of shape (len(values), C)
+    """
+    rgb = np.asarray(rgb, dtype=np.float64)
+    idx, t = _locate_segments(values, positions)
+    t = t[:, None]
+    out = rgb[idx - 1] * (1 - t) + rgb[idx] * t
+
+    out[values <= positions[0]] = rgb[0]
+    out[values >= positions[-1]] = rgb[-1]
+    return out
+
+
+def interpolate_lab(
+    values: np.ndarray,
+    positions: np.ndarray,
+    rgb: np.ndarray,
+    lab: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Interpolate anchor colors in LAB color space for a flat array of values.
+
+    Mirrors the scalar logic of BioCrayon.get_color_lab, including the
+    clamping to the exact end colors.
+
+    Args:
+        values: 1-D float array of values
+        positions: 1-D float array of ascending anchor positions
+        rgb: Array of shape (len(positions), 3) with anchor RGB values 0-255
+        lab: Precomputed LAB form of ``rgb`` (converted here if None)
+
+    Returns:
+        Float array of shape (len(values), 3) with integral RGB values 0-255
+    """
+    if lab is None:
+        lab = rgb_to_lab_array(rgb)
+    idx, t = _locate_segments(values, positions)
+    t = np.nan_to_num(t)[:, None]
+    lab1 = lab[idx - 1]
+    out = lab_to_rgb_array(lab1 + t * (lab[idx] - lab1)).astype(np.float64)
+
+    out[values <= positions[0]] = rgb[0]
+    out[values >= positions[-1]] = rgb[-1]
+    return out
+
+
+class QuantizedLUT:
+    """
+    Dense fixed-resolution lookup table over a continuous colormap.
+
+    The table samples the exact interpolation at ``lut_size`` evenly spaced
+    points over [positions[0], positions[-1]], so each value is mapped to a
+    row with a single multiply-and-truncate instead of a segment search.
+
+    Attributes:
+        table: Float array of shape (lut_size, C) with the sampled colors
+        start: Value mapped to the first row (positions[0])
+        scale: Rows per unit value, (lut_size - 1) / (stop - start)
+        max_error: Maximum absolute per-channel difference between the table
+            lookup and the exact interpolation, in the units of ``table``.
+            Exact for linear interpolation, sampled within each row's bin
+            otherwise
+        compiled: The CompiledColormap the table was built from
+    """
+
+    __slots__ = ("table", "start", "scale", "max_error", "compiled")
+
+    def __init__(
+        self, compiled: CompiledColormap, lut_size: int, interpolation: str = "linear"
+    ):
+        if compiled.type != "continuous":
+            raise ValueError("Lookup tables only apply to continuous colormaps")
+        if not isinstance(lut_size, (int, np.integer)) or lut_size < 2:
+            raise ValueError(f"lut_size must be an integer >= 2: {lut_size}")
+
+        positions = compiled.positions
+        start = float(positions[0])
+        span = float(positions[-1]) - start
+
+        samples = np.linspace(start, start + span, lut_size)
+        self.table = compiled.interpolate(samples, interpolation)
+        self.start = start
+        self.scale = (lut_size - 1) / span if span > 0 else 0.0
+        self.compiled = compiled
+        self.max_error = self._measure_error(interpolation)
+
+    def indices(self, values: np.ndarray) -> np.ndarray:
+        """
+        Map values to table rows by one multiply-and-truncate.
+
+        Args:
+            values: 1-D float array of values (NaN maps to row 0)
+
+        Returns:
+            Integer array of table rows
+        """
+        rows = (values - self.start) * self.scale + 0.5
+        np.clip(rows, 0, len(self.table) - 1, out=rows)
+        rows[np.isnan(rows)] = 0
+        return rows.astype(np.intp)
+
+    def lookup(self, values: np.ndarray) -> np.ndarray:
+        """
+        Look up colors for a flat array of values.
+
+        Args:
+            values: 1-D float array of values
+
+        Returns:
+            Float array of shape (len(values), C)
+        """
+        return self.table[self.indices(values)]
+
+    def _measure_error(self, interpolation: str) -> float:
+        """Compute the maximum quantization error against exact interpolation."""
+        if self.scale == 0:
+            return 0.0
+
+        # Each row covers the bin [row - 0.5, row + 0.5] in row units. For
+        # linear interpolation the exact colors are piecewise linear, so the
+        # largest deviation from the row color is attained at the bin edges or
+        # at anchor positions inside the bin; interior samples cover the
+        # curvature of LAB interpolation.
+        n = len(self.table)
+        offsets = np.linspace(-0.5, 0.5, 9)
+        rows = np.repeat(np.arange(n), len(offsets))
+        probes = np.clip(rows + np.tile(offsets, n), 0, n - 1)
+        values = self.start + probes / self.scale
+
+        positions = self.compiled.positions
+        exact = self.compiled.interpolate(values, interpolation)
+        exact_anchors = self.compiled.interpolate(positions, interpolation)
+
+        return float(
+            max(
+                np.abs(exact - self.table[rows]).max(),
+                np.abs(exact_anchors - self.lookup(positions)).max(),
+            )
+        )
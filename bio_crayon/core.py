@@ -3,13 +3,14 @@ Core BioCrayon class for managing biological data colormaps.
 """
 
 import json
+import threading
+import warnings
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Union, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Any, List, Union, Optional, Tuple
 
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
 import numpy as np
-import requests
 
 from .utils import (
     load_from_file,
@@ -18,23 +19,331 @@ from .utils import (
     detect_source_type,
     hex_to_rgb,
     rgb_to_hex,
-    interpolate_colors,
-    normalize_color,
-    interpolate_color_lab,
+    rgb_array_to_hex,
+    lab_to_rgb,
     is_colorblind_safe,
+    colorblind_safety_report,
     get_colorblind_safe_colors,
+    safe_palette_options,
+)
+from .compiled import (
+    INTERPOLATIONS,
+    CompiledColormap,
+    QuantizedLUT,
+    compile_colormap,
+)
+from .bundle import BUNDLE_SUFFIX, Bundle, is_bundle, read_bundle, write_bundle
+from .palettes import PaletteSampler
+from .streaming import open_json_collection
+from .community import (
+    CommunityCache,
+    bundled_path,
+    community_url,
+    list_community,
+    listing_from_index,
+    load_bundled_index,
 )
 from .validators import (
     validate_colormap_data,
+    validate_colormap_entry,
+    validate_colormap_structure,
+    validate_metadata_required,
     validate_colormap_name,
-    validate_hex_color,
     validate_categorical_colormap,
     validate_continuous_colormap,
     validate_expression_range,
-    validate_colorblind_safety,
     validate_bio_specific_requirements,
 )
 
+if TYPE_CHECKING:
+    import matplotlib.colors as mcolors
+    from matplotlib.figure import Figure
+
+
+_COLOR_OUTPUTS = ("rgba", "rgb", "hex")
+
+# Prefix of colormap names registered with matplotlib (see register_matplotlib)
+MATPLOTLIB_PREFIX = "biocrayon"
+_MISSING_LABELS = ("NaN", "nan", "NAN", "Nan")
+
+
+def _as_value_array(values: Any) -> np.ndarray:
+    """Coerce list/array/Series input to a float64 array (None -> NaN)."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(
+            "Values must be numeric for continuous colormap (NaN/None allowed)"
+        )
+
+
+def _factorize_categories(
+    values: Any, categories: Optional[List[Any]] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Split categorical input into integer codes and the labels they refer to.
+
+    pandas Categoricals (and Series with a category dtype) are consumed via
+    their codes and categories, so no per-element strings are materialized.
+    Plain arrays are factorized with np.unique. Missing entries (NaN/None or
+    a NaN string) get code -1.
+
+    Args:
+        values: pandas Categorical/Series, NumPy array or list of labels, or
+            integer codes when ``categories`` is given
+        categories: Labels that integer codes in ``values`` refer to
+
+    Returns:
+        Tuple of (int64 code array with the shape of values, list of labels)
+    """
+    cat_accessor = getattr(values, "cat", None)
+    if cat_accessor is not None:
+        # pandas Series with a category dtype
+        values = values.values
+    if (
+        categories is None
+        and hasattr(values, "codes")
+        and hasattr(values, "categories")
+    ):
+        # pandas Categorical
+        categories = list(values.categories)
+        values = values.codes
+
+    if categories is not None:
+        codes = np.asarray(values)
+        if codes.size and not np.issubdtype(codes.dtype, np.integer):
+            raise ValueError("Codes must be integers when categories are given")
+        codes = codes.astype(np.int64)
+        if codes.size and codes.max() >= len(categories):
+            raise ValueError(
+                f"Code {codes.max()} out of range for {len(categories)} categories"
+            )
+        codes[codes < 0] = -1
+        return codes, [str(c) for c in categories]
+
+    values = np.asarray(values)
+    flat = values.reshape(-1)
+    if flat.dtype.kind == "f":
+        missing = np.isnan(flat)
+    elif flat.dtype.kind in "OUS":
+        missing = np.array(
+            [
+                v is None
+                or (isinstance(v, float) and v != v)
+                or (isinstance(v, str) and v in _MISSING_LABELS)
+                for v in flat.tolist()
+            ],
+            dtype=bool,
+        )
+    else:
+        missing = np.zeros(flat.shape, dtype=bool)
+
+    codes = np.full(flat.shape, -1, dtype=np.int64)
+    present = flat[~missing]
+    if present.dtype.kind == "O":
+        present = present.astype(str)
+    uniques, inverse = np.unique(present, return_inverse=True)
+    codes[~missing] = inverse.reshape(-1)
+
+    if uniques.dtype.kind == "f":
+        labels = [str(int(u)) if u.is_integer() else str(u) for u in uniques.tolist()]
+    else:
+        labels = [str(u) for u in uniques.tolist()]
+    return codes.reshape(values.shape), labels
+
+
+def _format_color_array(
+    rgb: np.ndarray,
+    missing: np.ndarray,
+    shape: Tuple[int, ...],
+    output: str,
+    default_color: str,
+) -> np.ndarray:
+    """
+    Convert interpolated 0-255 RGB rows to the requested output format.
+
+    Args:
+        rgb: Float array of shape (N, 3) with values 0-255
+        missing: Boolean array of shape (N,) marking NaN/None inputs
+        shape: Shape of the original input values
+        output: One of 'rgba', 'rgb' or 'hex'
+        default_color: Hex color used for missing entries
+
+    Returns:
+        Float array of shape shape + (4,) / (3,) in [0, 1], or array of hex
+        strings of shape ``shape``
+    """
+    if output == "hex":
+        hex_colors = rgb_array_to_hex(np.rint(np.nan_to_num(rgb)).astype(np.uint8))
+        hex_colors[missing] = default_color
+        return hex_colors.reshape(shape)
+
+    n_channels = 4 if output == "rgba" else 3
+    colors = np.ones((len(rgb), n_channels))
+    np.divide(rgb, 255.0, out=colors[:, :3])
+    colors[missing, :3] = np.asarray(hex_to_rgb(default_color)) / 255.0
+    return colors.reshape(shape + (n_channels,))
+
+
+def _finite_range(values: Any, chunk_rows: int) -> Tuple[float, float]:
+    """Get the smallest and largest finite value of a 2-D array, by row blocks."""
+    low, high = np.inf, -np.inf
+    for start in range(0, values.shape[0], chunk_rows):
+        chunk = np.asarray(values[start : start + chunk_rows], dtype=np.float64)
+        finite = chunk[np.isfinite(chunk)]
+        if finite.size:
+            low = min(low, float(finite.min()))
+            high = max(high, float(finite.max()))
+    if low > high:
+        return 0.0, 1.0
+    return low, high
+
+
+def _community_cache(
+    offline: Optional[bool], cache: Optional[CommunityCache]
+) -> CommunityCache:
+    """Get the community cache to use, honoring an explicit offline flag."""
+    if cache is None:
+        return CommunityCache(offline=offline)
+    if offline is not None and offline != cache.offline:
+        return CommunityCache(
+            cache.cache_dir, ttl=cache.ttl, offline=offline, timeout=cache.timeout
+        )
+    return cache
+
+
+def _color_table(rgb: np.ndarray, output: str, default_color: str) -> np.ndarray:
+    """
+    Build a color table in the requested output format for index lookups.
+
+    Args:
+        rgb: Array of shape (K, 3) with values 0-255
+        output: One of 'rgba', 'rgb' or 'hex'
+        default_color: Hex color appended as the extra last row
+
+    Returns:
+        Array of shape (K + 1,) of hex strings or (K + 1, 4) / (K + 1, 3)
+        floats in [0, 1]
+    """
+    if output == "hex":
+        hex_colors = rgb_array_to_hex(np.rint(rgb).astype(np.uint8))
+        return np.append(hex_colors, default_color)
+
+    table = np.vstack([rgb, hex_to_rgb(default_color)]) / 255.0
+    if output == "rgba":
+        table = np.hstack([table, np.ones((len(table), 1))])
+    return table
+
+
+_FILL_FALLBACK_COLOR = "#CCCCCC"
+
+
+class _FillCandidates:
+    """
+    Candidate colors for categories assigned by fill_missing.
+
+    The sequence is get_colorblind_safe_colors(n) for growing n: the safe
+    palette followed by generated colors, which are produced on demand and
+    shared by all instances.
+    """
+
+    # Number of colors generated at once when the sequence is extended
+    chunk_size = 64
+
+    def __init__(self, colorblind_type: str = "deuteranopia"):
+        options = safe_palette_options(colorblind_type)
+        self._colors = list(options["seeds"])
+        self._options = options
+        self._sampler: Optional[PaletteSampler] = None
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def get(self, index: int) -> Optional[str]:
+        """Get the candidate at an index, or None past the last candidate."""
+        if index >= len(self._colors) and not self._exhausted:
+            with self._lock:
+                while index >= len(self._colors) and not self._exhausted:
+                    if self._sampler is None:
+                        self._sampler = PaletteSampler(**self._options)
+                    colors = self._sampler.take(self.chunk_size)
+                    self._exhausted = len(colors) < self.chunk_size
+                    self._colors.extend(colors)
+        if index < len(self._colors):
+            return self._colors[index]
+        return None
+
+
+@lru_cache(maxsize=None)
+def _fill_candidates(colorblind_type: str = "deuteranopia") -> _FillCandidates:
+    """Get the shared fill_missing candidates for a colorblind type."""
+    return _FillCandidates(colorblind_type)
+
+
+class _FillState:
+    """Colors used by a categorical colormap and the next fill candidate."""
+
+    __slots__ = ("colors", "size", "used", "cursor")
+
+    def __init__(self, colors: Dict[str, str]):
+        self.colors = colors
+        self.size = len(colors)
+        self.used = set(colors.values())
+        self.cursor = 0
+
+    def matches(self, colors: Dict[str, str]) -> bool:
+        """Check whether the state still describes a colors dictionary."""
+        return colors is self.colors and len(colors) == self.size
+
+    def next_color(self, candidates: _FillCandidates) -> str:
+        """Take the next unused candidate color."""
+        while True:
+            color = candidates.get(self.cursor)
+            if color is None:
+                return _FILL_FALLBACK_COLOR
+            self.cursor += 1
+            if color not in self.used:
+                self.used.add(color)
+                return color
+
+
+class _Mount:
+    """Source of a mounted collection and its lazily loaded instance."""
+
+    __slots__ = ("source", "require_metadata", "instance")
+
+    def __init__(self, source: Any, require_metadata: bool):
+        self.source = source
+        self.require_metadata = require_metadata
+        self.instance: Optional["BioCrayon"] = None
+
+
+class _MatplotlibEntry:
+    """Cached matplotlib colormap and the compiled colormap it was built from."""
+
+    __slots__ = ("compiled", "cmap")
+
+    def __init__(self, compiled: CompiledColormap, cmap: "mcolors.Colormap"):
+        self.compiled = compiled
+        self.cmap = cmap
+
+
+def _build_matplotlib(
+    name: str, compiled: CompiledColormap, n_colors: int
+) -> "mcolors.Colormap":
+    """Build a matplotlib colormap from a compiled colormap."""
+    import matplotlib.colors as mcolors
+
+    if compiled.type == "continuous":
+        # Create matplotlib colormap from the compiled RGBA anchors
+        return mcolors.LinearSegmentedColormap.from_list(
+            name,
+            list(zip(compiled.position_list, compiled.colors.tolist())),
+            N=n_colors,
+        )
+
+    # Create discrete colormap
+    return mcolors.ListedColormap(compiled.colors, name=name)
+
 
 class ColormapAccessor:
     """
@@ -155,12 +464,26 @@ class BioCrayon:
 
     Supports loading colormaps from files, URLs, or dictionaries,
     and provides methods for accessing and converting colormaps.
+
+    Thread safety: one instance can be shared by threads that read colors.
+    Reads do not lock. Changes made by the library (categories assigned by
+    fill_missing, add_colormap, create_colorblind_safe_colormap, loading
+    mounted collections) are serialized through an instance lock, so two
+    threads never assign different colors to the same category.
+    fill_missing only adds entries to a colors dictionary owned by the
+    instance and never changes assigned colors, so lookups by category are
+    always consistent; code that iterates over the colors of a colormap
+    while other threads fill it should iterate over a copy
+    (``dict(colors)``). Editing a colors dictionary in place (e.g.
+    ``bc["cells"]["X"] = "#FF0000"``) or calling load while other threads
+    read is not synchronized.
     """
 
     def __init__(
         self,
         source: Optional[Union[str, Path, Dict[str, Any]]] = None,
         require_metadata: bool = False,
+        strict: bool = True,
     ):
         """
         Initialize BioCrayon with optional source.
@@ -168,23 +491,56 @@ class BioCrayon:
         Args:
             source: File path, URL, or dictionary containing colormap data
             require_metadata: Whether metadata is required (True for community colormaps)
+            strict: Validate the whole document on load. If False, only the
+                document structure is checked on load and each colormap is
+                fully validated the first time it is accessed (see load)
         """
         self._data = {"metadata": {}, "colormaps": {}}
         self._metadata = {}
         self._colormaps = {}
+        self._compiled = {}
+        self._luts = {}
+        self._matplotlib: Dict[Tuple[str, Optional[int]], _MatplotlibEntry] = {}
+        self._mounts: Dict[str, _Mount] = {}
+        self._mount_index: Dict[str, str] = {}
+        self._strict = strict
+        self._unvalidated: set = set()
+        self._validation_errors: Dict[str, List[str]] = {}
+        # Serializes changes to the colormaps; see the class docstring
+        self._lock = threading.RLock()
+        self._fill_states: Dict[str, _FillState] = {}
 
         if source is not None:
             self.load(source, require_metadata=require_metadata)
 
     def load(
-        self, source: Union[str, Path, Dict[str, Any]], require_metadata: bool = False
+        self,
+        source: Union[str, Path, Dict[str, Any]],
+        require_metadata: bool = False,
+        strict: Optional[bool] = None,
     ) -> None:
         """
         Load colormap data from source.
 
+        Binary bundles written by save (see bio_crayon.bundle) are detected by
+        their signature; they were validated when written, so only the
+        metadata requirement is checked when reading them.
+
+        In lazy mode (strict=False) only the structure of the document is
+        checked here: metadata, colormap names and types. The JSON schema and
+        the per-type checks run for a colormap the first time it is accessed,
+        and the result is memoized; an invalid colormap raises ValueError on
+        every access while the rest of the collection stays usable. JSON files
+        are also read incrementally in lazy mode (see bio_crayon.streaming):
+        the file is indexed on load and a colormap is only parsed when it is
+        first accessed.
+
         Args:
-            source: File path, URL, or dictionary containing colormap data
+            source: File path (JSON or bundle), URL, or dictionary containing
+                colormap data
             require_metadata: Whether metadata is required (True for community colormaps)
+            strict: Validate the whole document now (default: the mode given
+                to the constructor)
 
         Raises:
             ValueError: If source is invalid or validation fails
@@ -193,7 +549,16 @@ class BioCrayon:
         """
         source_type = detect_source_type(source)
 
-        if source_type == "file":
+        if source_type == "file" and is_bundle(source):
+            self._load_bundle(read_bundle(source), require_metadata)
+            return
+
+        if strict is None:
+            strict = self._strict
+
+        if source_type == "file" and not strict:
+            data = open_json_collection(source)
+        elif source_type == "file":
             data = load_from_file(source)
         elif source_type == "url":
             data = load_from_url(source)
@@ -201,7 +566,12 @@ class BioCrayon:
             data = load_from_dict(source)
 
         # Validate the data
-        errors = validate_colormap_data(data, require_metadata=require_metadata)
+        if strict:
+            errors = validate_colormap_data(data, require_metadata=require_metadata)
+        else:
+            errors = validate_colormap_structure(
+                data, require_metadata=require_metadata
+            )
         if errors:
             raise ValueError(f"Invalid colormap data:\n" + "\n".join(errors))
 
@@ -209,6 +579,59 @@ class BioCrayon:
         self._data = data
         self._metadata = data.get("metadata", {})
         self._colormaps = data.get("colormaps", {})
+        self._compiled = {}
+        self._luts = {}
+        self._matplotlib = {}
+        self._unvalidated = set() if strict else set(self._colormaps)
+        self._validation_errors = {}
+
+    def _load_bundle(self, bundle: Bundle, require_metadata: bool = False) -> None:
+        """
+        Load colormap data from an opened binary bundle.
+
+        The compiled cache is the bundle's own, built lazily from its array
+        views.
+
+        Args:
+            bundle: Bundle returned by read_bundle
+            require_metadata: Whether metadata is required (True for community colormaps)
+
+        Raises:
+            ValueError: If required metadata is missing
+        """
+        if require_metadata:
+            errors = validate_metadata_required(bundle.metadata)
+            if errors:
+                raise ValueError(f"Invalid colormap data:\n" + "\n".join(errors))
+
+        self._data = bundle.to_dict()
+        self._metadata = self._data.get("metadata", {})
+        self._colormaps = self._data["colormaps"]
+        self._compiled = bundle.compiled
+        self._luts = {}
+        self._matplotlib = {}
+        self._unvalidated = set()
+        self._validation_errors = {}
+
+    def _validate_colormap(self, name: str) -> None:
+        """
+        Fully validate a lazily loaded colormap on first access.
+
+        Args:
+            name: Name of a local colormap
+
+        Raises:
+            ValueError: If the colormap is invalid
+        """
+        errors = self._validation_errors.get(name)
+        if errors is None:
+            errors = validate_colormap_entry(name, self._colormaps[name])
+            if errors:
+                self._validation_errors[name] = errors
+            else:
+                self._unvalidated.discard(name)
+                return
+        raise ValueError(f"Invalid colormap '{name}':\n" + "\n".join(errors))
 
     def get_colormap(self, name: str) -> Dict[str, Any]:
         """
@@ -223,11 +646,148 @@ class BioCrayon:
         Raises:
             KeyError: If colormap doesn't exist
         """
-        if name not in self._colormaps:
-            available = list(self._colormaps.keys())
-            raise KeyError(f"Colormap '{name}' not found. Available: {available}")
+        owner, local_name = self._resolve(name)
+        if local_name in owner._unvalidated:
+            owner._validate_colormap(local_name)
+        return owner._colormaps[local_name]
+
+    def mount(
+        self,
+        namespace: str,
+        source: Union[str, Path, Dict[str, Any], "BioCrayon"],
+        require_metadata: bool = False,
+    ) -> None:
+        """
+        Mount another colormap collection under a namespace.
+
+        The source is loaded lazily, the first time one of its colormaps is
+        looked up, with the validation mode of this instance. Its colormaps are then available as ``"namespace:name"``
+        everywhere a colormap name is accepted, e.g.
+        ``bc.get_color("allen_immune:immune_cell_l1", "T cell")``. Unqualified
+        names that are not local resolve to the first mount (in mount order)
+        providing them.
+
+        Args:
+            namespace: Namespace of the collection (same rules as colormap names)
+            source: File path (JSON or bundle), URL, dictionary or BioCrayon
+                instance
+            require_metadata: Whether metadata is required (True for community colormaps)
+
+        Raises:
+            ValueError: If the namespace is invalid or already mounted
+        """
+        if not validate_colormap_name(namespace):
+            raise ValueError(f"Invalid namespace: {namespace}")
+        with self._lock:
+            if namespace in self._mounts:
+                raise ValueError(f"Namespace '{namespace}' is already mounted")
+            self._mounts[namespace] = _Mount(source, require_metadata)
+
+    def unmount(self, namespace: str) -> None:
+        """
+        Remove a mounted collection.
 
-        return self._colormaps[name]
+        Args:
+            namespace: Namespace of the collection
+
+        Raises:
+            KeyError: If the namespace is not mounted
+        """
+        with self._lock:
+            if namespace not in self._mounts:
+                raise KeyError(f"Namespace '{namespace}' is not mounted")
+            del self._mounts[namespace]
+            self._mount_index = {
+                name: owner
+                for name, owner in self._mount_index.items()
+                if owner != namespace
+            }
+            self._invalidate_compiled()
+
+    def list_mounts(self) -> List[str]:
+        """
+        List mounted namespaces.
+
+        Returns:
+            List of namespaces in mount order
+        """
+        return list(self._mounts)
+
+    def _get_mounted(self, namespace: str) -> "BioCrayon":
+        """
+        Get the collection mounted under a namespace, loading it on first use.
+
+        Args:
+            namespace: Namespace of the collection
+
+        Returns:
+            BioCrayon instance of the mounted collection
+        """
+        mount = self._mounts[namespace]
+        if mount.instance is not None:
+            return mount.instance
+
+        with self._lock:
+            if mount.instance is not None:
+                return mount.instance
+            if isinstance(mount.source, BioCrayon):
+                instance = mount.source
+            else:
+                instance = BioCrayon(
+                    mount.source,
+                    require_metadata=mount.require_metadata,
+                    strict=self._strict,
+                )
+            for name in instance.list_colormaps():
+                self._mount_index.setdefault(name, namespace)
+            # Published last, so lock-free readers see a complete index
+            mount.instance = instance
+        return instance
+
+    def _resolve(self, name: str) -> Tuple["BioCrayon", str]:
+        """
+        Find the collection holding a colormap.
+
+        Local colormaps come first. Qualified names (``"namespace:name"``)
+        go straight to their mount; other names are looked up in the index of
+        loaded mounts, loading further mounts in order only on a miss.
+
+        Args:
+            name: Colormap name, optionally qualified with a namespace
+
+        Returns:
+            Tuple of (BioCrayon instance holding the colormap, name in it)
+
+        Raises:
+            KeyError: If colormap doesn't exist
+        """
+        if name in self._colormaps:
+            return self, name
+
+        if isinstance(name, str) and self._mounts:
+            namespace, sep, local_name = name.partition(":")
+            if sep:
+                if namespace in self._mounts:
+                    return self._get_mounted(namespace)._resolve(local_name)
+            else:
+                namespace = self._mount_index.get(name)
+                if namespace is None:
+                    for pending, mount in self._mounts.items():
+                        if mount.instance is None:
+                            self._get_mounted(pending)
+                            if name in self._mount_index:
+                                break
+                    namespace = self._mount_index.get(name)
+                if namespace is not None:
+                    return self._get_mounted(namespace)._resolve(name)
+
+        available = list(self._colormaps.keys())
+        if self._mounts:
+            raise KeyError(
+                f"Colormap '{name}' not found. Available: {available}, "
+                f"mounted namespaces: {list(self._mounts)}"
+            )
+        raise KeyError(f"Colormap '{name}' not found. Available: {available}")
 
     def get_color(
         self,
@@ -267,7 +827,7 @@ class BioCrayon:
                 if fill_missing:
                     # Auto-assign a color for missing category
                     return self._assign_color_for_missing_category(
-                        colormap_name, key_or_value, colors
+                        colormap_name, key_or_value
                     )
                 else:
                     available = list(colors.keys())
@@ -278,7 +838,6 @@ class BioCrayon:
 
         elif colormap_type == "continuous":
             colors = colormap["colors"]
-            positions = colormap["positions"]
 
             # Handle NaN/nan values for continuous colormaps
             if key_or_value in [None, "NaN", "nan", "NAN", "Nan"]:
@@ -290,39 +849,377 @@ class BioCrayon:
                 )
 
             value = float(key_or_value)
+            compiled = self._get_compiled(colormap_name)
+            positions = compiled.position_list
 
             # Handle edge cases
             if value <= positions[0]:
                 return colors[0]
             if value >= positions[-1]:
                 return colors[-1]
+            if value != value:
+                raise ValueError(f"Could not interpolate value {value}")
+
+            # Find the appropriate segment and interpolate linearly
+            i = bisect_left(positions, value)
+            t = (value - positions[i - 1]) / (positions[i] - positions[i - 1])
+            rgb1 = compiled.rgb_list[i - 1]
+            rgb2 = compiled.rgb_list[i]
+
+            r = int(round(rgb1[0] * (1 - t) + rgb2[0] * t))
+            g = int(round(rgb1[1] * (1 - t) + rgb2[1] * t))
+            b = int(round(rgb1[2] * (1 - t) + rgb2[2] * t))
 
-            # Find the appropriate segment
-            for i in range(len(positions) - 1):
-                if positions[i] <= value <= positions[i + 1]:
-                    # Interpolate between colors
-                    t = (value - positions[i]) / (positions[i + 1] - positions[i])
-                    color1 = colors[i]
-                    color2 = colors[i + 1]
+            return rgb_to_hex(r, g, b)
 
-                    # Simple linear interpolation
-                    rgb1 = hex_to_rgb(color1)
-                    rgb2 = hex_to_rgb(color2)
+        else:
+            raise ValueError(f"Unknown colormap type: {colormap_type}")
+
+    def get_colors(
+        self,
+        colormap_name: str,
+        values: Any,
+        output: str = "rgba",
+        default_color: str = "#CCCCCC",
+        lut_size: Optional[int] = None,
+        interpolation: str = "linear",
+    ) -> np.ndarray:
+        """
+        Get colors for a whole array of values in one pass.
+
+        Vectorized counterpart of get_color: values at or beyond the ends of
+        the colormap are clamped to the end colors and NaN/None values map to
+        default_color. Hex output matches get_color (or get_color_lab with
+        interpolation='lab') per value, normalized to the '#RRGGBB' form.
+        Categorical colormaps are delegated to map_categories.
 
-                    r = int(round(rgb1[0] * (1 - t) + rgb2[0] * t))
-                    g = int(round(rgb1[1] * (1 - t) + rgb2[1] * t))
-                    b = int(round(rgb1[2] * (1 - t) + rgb2[2] * t))
+        With ``lut_size`` set, continuous colormaps are sampled once into a
+        dense lookup table of that many rows (cached per colormap) and each
+        value is mapped to a row by a single multiply-and-truncate. This
+        trades exactness for speed; see get_lut_error for the bound.
 
-                    return rgb_to_hex(r, g, b)
+        Args:
+            colormap_name: Name of the colormap
+            values: NumPy array, pandas Series or list of numeric values (or
+                category labels for categorical colormaps)
+            output: 'rgba' or 'rgb' for float arrays in [0, 1] with shape
+                values.shape + (4,) or (3,), 'hex' for an array of hex strings
+            default_color: Default color to use for missing values (default: "#CCCCCC")
+            lut_size: Number of rows of the quantized lookup table, or None
+                for exact interpolation (continuous colormaps only)
+            interpolation: 'linear' for RGB interpolation like get_color, or
+                'lab' for LAB interpolation like get_color_lab
 
-            # Should not reach here
-            raise ValueError(f"Could not interpolate value {value}")
+        Returns:
+            NumPy array of colors in the requested output format
 
+        Raises:
+            KeyError: If colormap doesn't exist
+            ValueError: If values are not numeric, output or interpolation
+                is not supported or lut_size is invalid
+        """
+        if output not in _COLOR_OUTPUTS:
+            raise ValueError(
+                f"Unsupported output '{output}'. Use one of {list(_COLOR_OUTPUTS)}"
+            )
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(
+                f"Unsupported interpolation '{interpolation}'. Use one of {list(INTERPOLATIONS)}"
+            )
+
+        colormap = self.get_colormap(colormap_name)
+        if colormap["type"] == "categorical":
+            if lut_size is not None:
+                raise ValueError("lut_size only applies to continuous colormaps")
+            return self.map_categories(
+                colormap_name, values, output=output, default_color=default_color
+            )
+
+        values = _as_value_array(values)
+        flat = values.reshape(-1)
+        missing = np.isnan(flat)
+
+        if lut_size is not None:
+            lut = self._get_lut(colormap_name, lut_size, interpolation)
+            rows = lut.indices(flat)
+            rows[missing] = len(lut.table)
+            table = _color_table(lut.table, output, default_color)
+            return table[rows].reshape(values.shape + table.shape[1:])
+
+        compiled = self._get_compiled(colormap_name)
+        rgb = compiled.interpolate(flat, interpolation)
+
+        return _format_color_array(rgb, missing, values.shape, output, default_color)
+
+    def get_lut_error(
+        self, colormap_name: str, lut_size: int = 4096, interpolation: str = "linear"
+    ) -> float:
+        """
+        Get the maximum quantization error of the lookup-table mode.
+
+        Args:
+            colormap_name: Name of a continuous colormap
+            lut_size: Number of rows of the lookup table
+            interpolation: 'linear' or 'lab', as passed to get_colors
+
+        Returns:
+            Maximum absolute per-channel difference between get_colors with
+            ``lut_size`` and exact interpolation, in 8-bit RGB levels (divide
+            by 255 for the units of float output)
+
+        Raises:
+            KeyError: If colormap doesn't exist
+            ValueError: If the colormap is not continuous, lut_size is invalid
+                or interpolation is not supported
+        """
+        return self._get_lut(colormap_name, lut_size, interpolation).max_error
+
+    def render_array(
+        self,
+        colormap_name: str,
+        values: Any,
+        vmin: Optional[float] = None,
+        vmax: Optional[float] = None,
+        chunk_rows: int = 256,
+        lut_size: int = 4096,
+        interpolation: str = "linear",
+        default_color: Optional[str] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Color a 2-D array of values into an RGBA image.
+
+        Values are scaled from [vmin, vmax] onto the colormap and looked up in
+        a cached quantized table (see get_colors with lut_size), a block of
+        rows at a time, so memory beyond the output stays bounded for large
+        or memory-mapped inputs. Does not import matplotlib.
+
+        Args:
+            colormap_name: Name of a continuous colormap
+            values: 2-D array of numbers, e.g. a NumPy memmap
+            vmin: Value mapped to the start of the colormap (default: the
+                smallest finite value, which costs an extra pass)
+            vmax: Value mapped to the end of the colormap (default: the
+                largest finite value)
+            chunk_rows: Number of rows colored at once
+            lut_size: Number of rows of the lookup table
+            interpolation: 'linear' or 'lab'
+            default_color: Hex color for NaN values (default: transparent)
+            out: uint8 array of shape values.shape + (4,) to write into,
+                e.g. a memmap
+
+        Returns:
+            uint8 array of shape values.shape + (4,) with RGBA values
+
+        Raises:
+            KeyError: If colormap doesn't exist
+            ValueError: If the colormap is not continuous, values are not 2-D,
+                out has the wrong shape or type, vmin is greater than vmax, or
+                an argument is invalid
+        """
+        colormap = self.get_colormap(colormap_name)
+        if colormap["type"] != "continuous":
+            raise ValueError(
+                f"render_array only applies to continuous colormaps, got {colormap['type']}"
+            )
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(
+                f"Unsupported interpolation '{interpolation}'. Use one of {list(INTERPOLATIONS)}"
+            )
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be positive: {chunk_rows}")
+
+        if not hasattr(values, "shape"):
+            values = np.asarray(values, dtype=np.float64)
+        if len(values.shape) != 2:
+            raise ValueError(f"values must be 2-D, got shape {values.shape}")
+        height, width = values.shape
+
+        if out is None:
+            out = np.empty((height, width, 4), dtype=np.uint8)
+        elif out.shape != (height, width, 4) or out.dtype != np.uint8:
+            raise ValueError(
+                f"out must be a uint8 array of shape {(height, width, 4)}, "
+                f"got {out.dtype} {out.shape}"
+            )
+
+        if vmin is None or vmax is None:
+            low, high = _finite_range(values, chunk_rows)
+            vmin = low if vmin is None else vmin
+            vmax = high if vmax is None else vmax
+        if vmin > vmax:
+            raise ValueError(f"vmin must not be greater than vmax: {vmin} > {vmax}")
+
+        # RGBA table with one extra row for NaN
+        lut = self._get_lut(colormap_name, lut_size, interpolation)
+        table = np.empty((lut_size + 1, 4), dtype=np.uint8)
+        table[:-1, :3] = np.rint(lut.table)
+        table[:-1, 3] = 255
+        if default_color is None:
+            table[-1] = 0
         else:
-            raise ValueError(f"Unknown colormap type: {colormap_type}")
+            table[-1, :3] = hex_to_rgb(default_color)
+            table[-1, 3] = 255
+
+        scale = (lut_size - 1) / (vmax - vmin) if vmax > vmin else 0.0
+        for start in range(0, height, chunk_rows):
+            chunk = np.asarray(values[start : start + chunk_rows], dtype=np.float64)
+            missing = np.isnan(chunk)
+            if scale:
+                rows = (chunk - vmin) * scale + 0.5
+                np.clip(rows, 0, lut_size - 1, out=rows)
+            else:
+                rows = np.zeros_like(chunk)
+            rows[missing] = lut_size
+            indices = rows.astype(np.intp)
+            np.take(table, indices, axis=0, out=out[start : start + chunk_rows])
+        return out
+
+    def _get_lut(
+        self, colormap_name: str, lut_size: int, interpolation: str = "linear"
+    ) -> QuantizedLUT:
+        """
+        Get the cached quantized lookup table of a continuous colormap.
+
+        Tables are cached per (colormap, lut_size, interpolation) and rebuilt
+        whenever the underlying compiled colormap changed.
+
+        Args:
+            colormap_name: Name of a continuous colormap
+            lut_size: Number of rows of the lookup table
+            interpolation: Interpolation used to sample the table
+
+        Returns:
+            QuantizedLUT for the colormap
+        """
+        compiled = self._get_compiled(colormap_name)
+        key = (colormap_name, lut_size, interpolation)
+        lut = self._luts.get(key)
+        if lut is None or lut.compiled is not compiled:
+            lut = QuantizedLUT(compiled, lut_size, interpolation)
+            self._luts[key] = lut
+        return lut
+
+    def map_categories(
+        self,
+        colormap_name: str,
+        values: Any,
+        categories: Optional[List[Any]] = None,
+        output: str = "rgba",
+        fill_missing: bool = False,
+        default_color: str = "#CCCCCC",
+    ) -> np.ndarray:
+        """
+        Map a whole array of category labels to colors in one pass.
+
+        A category -> color lookup table is built once per colormap and the
+        labels are resolved by NumPy fancy indexing, so each distinct label is
+        looked up only once regardless of the number of elements.
+
+        Args:
+            colormap_name: Name of a categorical colormap
+            values: pandas Categorical or Series, NumPy array or list of
+                labels, or integer codes (with ``categories``). NaN/None
+                entries and negative codes map to default_color
+            categories: Labels referenced by integer codes in values, e.g.
+                ``cat.categories`` when passing ``cat.codes``
+            output: 'rgba' or 'rgb' for float arrays in [0, 1] with shape
+                values.shape + (4,) or (3,), 'hex' for an array of hex strings
+            fill_missing: If True, automatically assign colors for missing categories
+            default_color: Default color to use for missing values (default: "#CCCCCC")
+
+        Returns:
+            NumPy array of colors in the requested output format
+
+        Raises:
+            KeyError: If colormap doesn't exist, or a category is missing and
+                fill_missing is False
+            ValueError: If the colormap is not categorical or output is not supported
+        """
+        if output not in _COLOR_OUTPUTS:
+            raise ValueError(
+                f"Unsupported output '{output}'. Use one of {list(_COLOR_OUTPUTS)}"
+            )
+
+        colormap = self.get_colormap(colormap_name)
+        if colormap["type"] != "categorical":
+            raise ValueError(
+                f"map_categories only applies to categorical colormaps, got {colormap['type']}"
+            )
+
+        codes, labels = _factorize_categories(values, categories)
+
+        index = self._get_compiled(colormap_name).index
+        unknown = [label for label in labels if label not in index]
+        if unknown:
+            if not fill_missing:
+                available = list(colormap["colors"].keys())
+                raise KeyError(
+                    f"Category '{unknown[0]}' not found in colormap '{colormap_name}'. Available: {available}"
+                )
+            self.assign_missing_categories(colormap_name, unknown)
+
+        compiled = self._get_compiled(colormap_name)
+
+        # Map label codes to table rows; the extra last row holds default_color
+        lut_rows = np.array(
+            [compiled.index[label] for label in labels] + [len(compiled)]
+        )
+        rows = lut_rows[codes.reshape(-1)]
+
+        if output == "hex":
+            # Keep the hex strings exactly as stored, like get_color
+            table = np.append(compiled.hex_colors, default_color)
+        else:
+            table = _color_table(compiled.rgb, output, default_color)
+        return table[rows].reshape(codes.shape + table.shape[1:])
+
+    def _get_compiled(self, colormap_name: str) -> CompiledColormap:
+        """
+        Get the compiled array form of a colormap, compiling it on first use.
+
+        Args:
+            colormap_name: Name of the colormap
+
+        Returns:
+            CompiledColormap for the colormap
+
+        Raises:
+            KeyError: If colormap doesn't exist
+        """
+        owner, local_name = self._resolve(colormap_name)
+        if owner is not self:
+            return owner._get_compiled(local_name)
+
+        if colormap_name in self._unvalidated:
+            self._validate_colormap(colormap_name)
+        colormap = self._colormaps[colormap_name]
+        compiled = self._compiled.get(colormap_name)
+        if compiled is None or not compiled.matches(colormap):
+            compiled = compile_colormap(colormap)
+            self._compiled[colormap_name] = compiled
+        return compiled
+
+    def _invalidate_compiled(self, colormap_name: Optional[str] = None) -> None:
+        """
+        Drop cached compiled forms after a colormap was mutated.
+
+        Args:
+            colormap_name: Name of the mutated colormap, or None for all
+        """
+        if colormap_name is None:
+            self._compiled.clear()
+            self._luts.clear()
+            self._matplotlib.clear()
+        else:
+            self._compiled.pop(colormap_name, None)
+            # Snapshot the keys: other threads may be adding tables
+            for cache in (self._luts, self._matplotlib):
+                for key in [key for key in list(cache) if key[0] == colormap_name]:
+                    cache.pop(key, None)
 
     def _assign_color_for_missing_category(
-        self, colormap_name: str, category: str, existing_colors: Dict[str, str]
+        self, colormap_name: str, category: str
     ) -> str:
         """
         Assign a color for a missing category.
@@ -330,67 +1227,123 @@ class BioCrayon:
         Args:
             colormap_name: Name of the colormap
             category: The missing category
-            existing_colors: Dictionary of existing category-color mappings
 
         Returns:
             Hex color string for the missing category
         """
-        # Get colorblind-safe colors
-        from .utils import get_colorblind_safe_colors
-
-        # Count how many colors we need (existing + 1 for the new category)
-        n_needed = len(existing_colors) + 1
-
-        # Get colorblind-safe colors
-        safe_colors = get_colorblind_safe_colors(n_needed)
+        return self.assign_missing_categories(colormap_name, [category])[category]
 
-        # Find the first color that's not already used
-        for color in safe_colors:
-            if color not in existing_colors.values():
-                # Add the new category-color mapping to the colormap
-                self._colormaps[colormap_name]["colors"][category] = color
-                return color
+    def assign_missing_categories(
+        self, colormap_name: str, categories: List[Any]
+    ) -> Dict[Any, str]:
+        """
+        Assign colors to categories missing from a categorical colormap.
+
+        New categories take the next unused color of a fixed candidate
+        sequence: the colorblind-safe palette, then colors generated to be
+        maximally distinct from it and each other, also for deuteranopes (see
+        get_colorblind_safe_colors; '#CCCCCC' once all are used). Each colormap keeps the
+        set of used colors and its position in the sequence, so a new
+        category costs amortized O(1), also when labels arrive one at a time
+        (e.g. through get_color(..., fill_missing=True)).
+
+        The first fill copies the colors dictionary once; later fills add to
+        that copy in place and never change or remove entries. Assignments
+        are serialized through the instance lock, so categories assigned by
+        another thread in the meantime keep their color. Every call that adds
+        categories drops the cached compiled form, lookup tables and
+        matplotlib colormaps of the colormap, which are rebuilt on next use,
+        so batch lookups should still pass all unseen labels in one call.
 
-        # If all safe colors are used, generate a new one
-        # Use a simple algorithm to generate a distinct color
-        used_colors = set(existing_colors.values())
+        Args:
+            colormap_name: Name of a categorical colormap
+            categories: Category labels; labels already in the colormap,
+                duplicates and NaN labels are left alone
 
-        # Try different hues to find a distinct color
-        for hue in range(0, 360, 30):  # Every 30 degrees
-            # Convert HSV to RGB
-            from .utils import hsv_to_rgb, rgb_to_hex
+        Returns:
+            Dictionary mapping each requested (non-NaN) category to its color
 
-            rgb = hsv_to_rgb(hue, 0.7, 0.8)  # Saturation 0.7, Value 0.8
-            new_color = rgb_to_hex(*rgb)
+        Raises:
+            KeyError: If colormap doesn't exist
+            ValueError: If the colormap is not categorical
+        """
+        owner, local_name = self._resolve(colormap_name)
+        if owner is not self:
+            return owner.assign_missing_categories(local_name, categories)
 
-            if new_color not in used_colors:
-                # Add the new category-color mapping to the colormap
-                self._colormaps[colormap_name]["colors"][category] = new_color
-                return new_color
+        colormap = self.get_colormap(colormap_name)
+        if colormap["type"] != "categorical":
+            raise ValueError(
+                f"Missing categories can only be assigned in categorical colormaps, got {colormap['type']}"
+            )
+        categories = [
+            category
+            for category in dict.fromkeys(categories)
+            if category is not None
+            and category == category
+            and category not in _MISSING_LABELS
+        ]
+
+        with self._lock:
+            existing_colors = colormap["colors"]
+            missing = [c for c in categories if c not in existing_colors]
+            if missing:
+                state = self._fill_states.get(colormap_name)
+                if state is None or not state.matches(existing_colors):
+                    # Copy once; later fills extend the owned dictionary
+                    state = _FillState(dict(existing_colors))
+                    self._fill_states[colormap_name] = state
+                    colormap["colors"] = state.colors
+                candidates = _fill_candidates()
+
+                colors = state.colors
+                for category in missing:
+                    colors[category] = state.next_color(candidates)
+                state.size = len(colors)
+                self._invalidate_compiled(colormap_name)
+            else:
+                colors = existing_colors
 
-        # Fallback: use a gray color
-        fallback_color = "#CCCCCC"
-        self._colormaps[colormap_name]["colors"][category] = fallback_color
-        return fallback_color
+        return {category: colors[category] for category in categories}
 
-    def list_colormaps(self) -> List[str]:
+    def list_colormaps(self, include_mounted: bool = False) -> List[str]:
         """
         List available colormaps.
 
+        Args:
+            include_mounted: Also list the colormaps of mounted collections as
+                ``"namespace:name"`` (loads every mounted collection)
+
         Returns:
             List of colormap names
         """
-        return list(self._colormaps.keys())
+        names = list(self._colormaps.keys())
+        if include_mounted:
+            for namespace in self._mounts:
+                names.extend(
+                    f"{namespace}:{name}"
+                    for name in self._get_mounted(namespace).list_colormaps(
+                        include_mounted=True
+                    )
+                )
+        return names
 
     def to_matplotlib(
         self, colormap_name: str, n_colors: int = 256
-    ) -> mcolors.Colormap:
+    ) -> "mcolors.Colormap":
         """
         Convert colormap to matplotlib Colormap object.
 
+        Colormap objects are cached per (colormap, n_colors) and rebuilt
+        whenever the colormap changed, so repeated calls are cheap. The
+        cached object is shared between callers: use its copy() method
+        before modifying it (e.g. with set_bad).
+
         Args:
             colormap_name: Name of the colormap
-            n_colors: Number of colors in the matplotlib colormap
+            n_colors: Number of colors in the matplotlib colormap (continuous
+                colormaps only; categorical colormaps have one color per
+                category)
 
         Returns:
             matplotlib.colors.Colormap object
@@ -401,41 +1354,67 @@ class BioCrayon:
         """
         colormap = self.get_colormap(colormap_name)
         colormap_type = colormap["type"]
+        if colormap_type not in ("continuous", "categorical"):
+            raise ValueError(
+                f"Cannot convert colormap type '{colormap_type}' to matplotlib"
+            )
 
-        if colormap_type == "continuous":
-            colors = colormap["colors"]
-            positions = colormap["positions"]
-
-            # Convert hex colors to RGB (0-1 range)
-            rgb_colors = []
-            for color in colors:
-                r, g, b = hex_to_rgb(color)
-                rgb_colors.append([r / 255, g / 255, b / 255])
-
-            # Create matplotlib colormap
-            cmap = mcolors.LinearSegmentedColormap.from_list(
-                colormap_name, list(zip(positions, rgb_colors)), N=n_colors
+        compiled = self._get_compiled(colormap_name)
+        key = (colormap_name, n_colors if colormap_type == "continuous" else None)
+        entry = self._matplotlib.get(key)
+        if entry is None or entry.compiled is not compiled:
+            entry = _MatplotlibEntry(
+                compiled, _build_matplotlib(colormap_name, compiled, n_colors)
             )
-            return cmap
+            self._matplotlib[key] = entry
+        return entry.cmap
 
-        elif colormap_type == "categorical":
-            colors = colormap["colors"]
+    def register_matplotlib(
+        self,
+        namespace: str,
+        colormap_names: Optional[List[str]] = None,
+        n_colors: int = 256,
+    ) -> List[str]:
+        """
+        Register colormaps with matplotlib's colormap registry.
 
-            # For categorical, create a discrete colormap
-            color_list = list(colors.values())
-            rgb_colors = []
-            for color in color_list:
-                r, g, b = hex_to_rgb(color)
-                rgb_colors.append([r / 255, g / 255, b / 255])
+        Each colormap is registered as ``"biocrayon.<namespace>.<name>"``, so
+        it can be used by name, e.g.
+        ``plt.imshow(data, cmap="biocrayon.allen_immune.immune_cell_l1")``.
+        The registry holds a snapshot: register again after changing a
+        colormap. Existing registrations under the same names are replaced.
 
-            # Create discrete colormap
-            cmap = mcolors.ListedColormap(rgb_colors, name=colormap_name)
-            return cmap
+        Args:
+            namespace: Namespace of the registered names (e.g. the community
+                category)
+            colormap_names: Colormaps to register (default: all local
+                colormaps); ``":"`` in qualified names becomes ``"."``
+            n_colors: Number of colors of continuous colormaps
 
-        else:
-            raise ValueError(
-                f"Cannot convert colormap type '{colormap_type}' to matplotlib"
-            )
+        Returns:
+            List of registered matplotlib colormap names
+
+        Raises:
+            KeyError: If a colormap doesn't exist
+            ValueError: If the namespace is invalid
+        """
+        import matplotlib
+
+        if not validate_colormap_name(namespace):
+            raise ValueError(f"Invalid namespace: {namespace}")
+        if colormap_names is None:
+            colormap_names = self.list_colormaps()
+
+        registered = []
+        for colormap_name in colormap_names:
+            cmap = self.to_matplotlib(colormap_name, n_colors)
+            name = f"{MATPLOTLIB_PREFIX}.{namespace}.{colormap_name.replace(':', '.')}"
+            with warnings.catch_warnings():
+                # Replacing an earlier registration is intended
+                warnings.simplefilter("ignore", UserWarning)
+                matplotlib.colormaps.register(cmap, name=name, force=True)
+            registered.append(name)
+        return registered
 
     def add_colormap(self, name: str, colormap_data: Dict[str, Any]) -> None:
         """
@@ -470,28 +1449,75 @@ class BioCrayon:
             raise ValueError(f"Invalid colormap data:\n" + "\n".join(errors))
 
         # Add the colormap
-        self._colormaps[name] = colormap_data
-        self._data["colormaps"] = self._colormaps
+        self._insert_colormap(name, colormap_data)
+
+    def _insert_colormap(self, name: str, colormap_data: Dict[str, Any]) -> None:
+        """
+        Add a validated colormap under the instance lock.
+
+        Args:
+            name: Name for the new colormap
+            colormap_data: Dictionary containing colormap data
 
-    def save(self, filepath: Union[str, Path], require_metadata: bool = False) -> None:
+        Raises:
+            ValueError: If the colormap already exists
+        """
+        with self._lock:
+            if name in self._colormaps:
+                raise ValueError(f"Colormap '{name}' already exists")
+            self._colormaps[name] = colormap_data
+            self._data["colormaps"] = self._colormaps
+            self._invalidate_compiled(name)
+
+    def save(
+        self,
+        filepath: Union[str, Path],
+        require_metadata: bool = False,
+        format: Optional[str] = None,
+    ) -> None:
         """
         Save current colormaps to file.
 
         Args:
-            filepath: Path to save the JSON file
+            filepath: Path to save the file
             require_metadata: Whether metadata is required (True for community colormaps)
+            format: 'json', or 'bundle' for the memory-mapped binary format of
+                bio_crayon.bundle (default: 'bundle' for the '.bcb' suffix,
+                else 'json')
 
         Raises:
-            ValueError: If data is invalid
+            ValueError: If data is invalid or the format is not supported
         """
+        filepath = Path(filepath)
+        if format is None:
+            format = "bundle" if filepath.suffix == BUNDLE_SUFFIX else "json"
+        if format not in ("json", "bundle"):
+            raise ValueError(f"Unsupported format '{format}'. Use 'json' or 'bundle'")
+
+        data = self._data
+        if not isinstance(self._colormaps, dict):
+            # Incrementally loaded collections are parsed completely to save
+            data = dict(data, colormaps=dict(self._colormaps))
+
         # Validate the complete data structure
-        errors = validate_colormap_data(self._data, require_metadata=require_metadata)
+        errors = validate_colormap_data(data, require_metadata=require_metadata)
+        if format == "bundle":
+            # Bundles are not validated when read, so check each colormap too
+            for name, colormap in data["colormaps"].items():
+                if colormap.get("type") == "categorical":
+                    colormap_errors = validate_categorical_colormap(colormap)
+                else:
+                    colormap_errors = validate_continuous_colormap(colormap)
+                errors.extend(f"{name}: {error}" for error in colormap_errors)
         if errors:
             raise ValueError(f"Invalid data structure:\n" + "\n".join(errors))
 
-        filepath = Path(filepath)
+        if format == "bundle":
+            write_bundle(filepath, data)
+            return
+
         with open(filepath, "w") as f:
-            json.dump(self._data, f, indent=2)
+            json.dump(data, f, indent=2)
 
     def get_metadata(self) -> Dict[str, Any]:
         """
@@ -532,80 +1558,108 @@ class BioCrayon:
 
         return info
 
-    def plot_colormap(self, name: str, figsize: Tuple[int, int] = (8, 2)) -> None:
+    def plot_colormap(
+        self,
+        name: str,
+        figsize: Tuple[int, int] = (8, 2),
+        show: bool = True,
+        resolution: int = 512,
+    ) -> Optional["Figure"]:
         """
         Plot a colormap for visualization.
 
+        Continuous colormaps are drawn as a single image of a vectorized
+        lookup table and categorical colormaps as a single collection of
+        swatches, so the number of artists does not grow with the colormap.
+
         Args:
             name: Name of the colormap
             figsize: Figure size (width, height)
+            show: If True, show the figure with pyplot. If False, the figure
+                is created without pyplot (no GUI backend or global figure
+                state), e.g. for saving with fig.savefig on headless machines
+            resolution: Number of samples of a continuous gradient
+
+        Returns:
+            matplotlib Figure with the plot if show is False, else None (so
+            notebooks don't display the shown figure a second time)
 
         Raises:
             KeyError: If colormap doesn't exist
+            ValueError: If resolution is not positive
         """
+        from matplotlib.collections import PatchCollection
+        from matplotlib.patches import Rectangle
+
         colormap = self.get_colormap(name)
         colormap_type = colormap["type"]
+        if colormap_type == "continuous" and resolution < 1:
+            raise ValueError(f"resolution must be positive: {resolution}")
 
-        fig, ax = plt.subplots(figsize=figsize)
+        if show:
+            import matplotlib.pyplot as plt
 
-        if colormap_type == "categorical":
-            colors = colormap["colors"]
-            categories = list(colors.keys())
-            color_values = list(colors.values())
+            fig, ax = plt.subplots(figsize=figsize)
+        else:
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=figsize)
+            ax = fig.add_subplot()
 
-            # Create color patches
-            for i, (category, color) in enumerate(zip(categories, color_values)):
-                ax.bar(i, 1, color=color, label=category)
+        if colormap_type == "categorical":
+            compiled = self._get_compiled(name)
+            categories = list(compiled.categories)
+
+            # One collection of bar-shaped swatches, one per category
+            swatches = PatchCollection(
+                [Rectangle((i - 0.4, 0), 0.8, 1) for i in range(len(categories))],
+                facecolors=compiled.colors,
+                edgecolors="none",
+            )
+            ax.add_collection(swatches)
+            ax.set_xlim(-0.5, len(categories) - 0.5)
+            ax.set_ylim(0, 1.05)
 
             ax.set_xlabel("Categories")
             ax.set_ylabel("Color")
             ax.set_title(f"Categorical Colormap: {name}")
             ax.set_xticks(range(len(categories)))
             ax.set_xticklabels(categories, rotation=45)
-            ax.legend()
 
         else:  # continuous
-            colors = colormap["colors"]
-            positions = colormap["positions"]
-
-            # Create gradient
-            for i in range(len(positions) - 1):
-                x_start = positions[i]
-                x_end = positions[i + 1]
-                color_start = colors[i]
-                color_end = colors[i + 1]
-
-                # Interpolate colors for smooth gradient
-                n_steps = 50
-                for j in range(n_steps):
-                    t = j / n_steps
-                    x = x_start + t * (x_end - x_start)
-
-                    # Interpolate color
-                    rgb1 = hex_to_rgb(color_start)
-                    rgb2 = hex_to_rgb(color_end)
-                    r = int(rgb1[0] + t * (rgb2[0] - rgb1[0]))
-                    g = int(rgb1[1] + t * (rgb2[1] - rgb1[1]))
-                    b = int(rgb1[2] + t * (rgb2[2] - rgb1[2]))
-                    color = rgb_to_hex(r, g, b)
-
-                    ax.bar(x, 1, color=color, width=(x_end - x_start) / n_steps)
+            # Sample the gradient in one vectorized lookup
+            gradient = self.get_colors(
+                name, np.linspace(0.0, 1.0, resolution), output="rgb"
+            )
+            ax.imshow(
+                gradient[np.newaxis],
+                aspect="auto",
+                extent=(0.0, 1.0, 0.0, 1.0),
+                interpolation="nearest",
+            )
 
             ax.set_xlabel("Position")
             ax.set_ylabel("Color")
             ax.set_title(f"Continuous Colormap: {name}")
             ax.set_xlim(0, 1)
 
-        plt.tight_layout()
-        plt.show()
+        fig.tight_layout()
+        if show:
+            plt.show()
+            return None
+        return fig
 
     def __len__(self) -> int:
         """Return number of colormaps."""
         return len(self._colormaps)
 
     def __contains__(self, name: str) -> bool:
-        """Check if colormap exists."""
-        return name in self._colormaps
+        """Check if colormap exists (locally or in a mounted collection)."""
+        try:
+            self._resolve(name)
+        except KeyError:
+            return False
+        return True
 
     def __iter__(self):
         """Iterate over colormap names."""
@@ -633,13 +1687,7 @@ class BioCrayon:
         Raises:
             KeyError: If colormap doesn't exist
         """
-        if colormap_name not in self._colormaps:
-            available = list(self._colormaps.keys())
-            raise KeyError(
-                f"Colormap '{colormap_name}' not found. Available: {available}"
-            )
-
-        colormap = self._colormaps[colormap_name]
+        colormap = self.get_colormap(colormap_name)
 
         if colormap["type"] == "categorical":
             # Return the colors dictionary directly for categorical colormaps
@@ -669,7 +1717,10 @@ class BioCrayon:
         return validate_expression_range(colormap, min_val, max_val)
 
     def is_colorblind_safe(
-        self, colormap_name: str, colorblind_type: str = "deuteranopia"
+        self,
+        colormap_name: str,
+        colorblind_type: Optional[str] = "deuteranopia",
+        severity: float = 1.0,
     ) -> bool:
         """
         Check if categorical colormap is distinguishable for colorblind users.
@@ -677,12 +1728,50 @@ class BioCrayon:
         Args:
             colormap_name: Name of the colormap to check
             colorblind_type: Type of colorblindness to check for
+                ("deuteranopia", "protanopia", "tritanopia"), or None for
+                normal vision
+            severity: Degree of the deficiency, from 0 (normal vision) to 1
+                (dichromacy)
 
         Returns:
             True if colors are distinguishable for the specified colorblind type
 
         Raises:
             KeyError: If colormap doesn't exist
+            ValueError: If the colormap is not categorical or the colorblind
+                type is not supported
+        """
+        return self.colorblind_safety_report(colormap_name, colorblind_type, severity)[
+            "safe"
+        ]
+
+    def colorblind_safety_report(
+        self,
+        colormap_name: str,
+        colorblind_type: Optional[str] = "deuteranopia",
+        severity: float = 1.0,
+    ) -> Dict[str, Any]:
+        """
+        Report which categories of a colormap are too similar to tell apart.
+
+        Args:
+            colormap_name: Name of the colormap to check
+            colorblind_type: Type of colorblindness to check for
+                ("deuteranopia", "protanopia", "tritanopia"), or None for
+                normal vision
+            severity: Degree of the deficiency, from 0 (normal vision) to 1
+                (dichromacy)
+
+        Returns:
+            Dictionary with 'safe', 'min_distance', 'threshold' and
+            'offending_pairs': (category1, category2, distance) tuples of the
+            categories closer than the threshold, closest first (see
+            bio_crayon.utils.colorblind_safety_report)
+
+        Raises:
+            KeyError: If colormap doesn't exist
+            ValueError: If the colormap is not categorical or the colorblind
+                type is not supported
         """
         colormap = self.get_colormap(colormap_name)
         if colormap["type"] != "categorical":
@@ -690,10 +1779,18 @@ class BioCrayon:
                 f"Colorblind safety check only applies to categorical colormaps, got {colormap['type']}"
             )
 
-        colors = list(colormap["colors"].values())
-        return is_colorblind_safe(colors, colorblind_type)
+        colors = dict(colormap["colors"])
+        categories = list(colors)
+        report = colorblind_safety_report(
+            list(colors.values()), colorblind_type, severity=severity
+        )
+        report["offending_pairs"] = [
+            (categories[first], categories[second], distance)
+            for first, second, distance in report["offending_pairs"]
+        ]
+        return report
 
-    def get_colorbar(self, colormap_name: str, **kwargs) -> plt.Figure:
+    def get_colorbar(self, colormap_name: str, **kwargs) -> "Figure":
         """
         Return matplotlib colorbar for the colormap.
 
@@ -707,6 +1804,8 @@ class BioCrayon:
         Raises:
             KeyError: If colormap doesn't exist
         """
+        import matplotlib.pyplot as plt
+
         colormap = self.get_colormap(colormap_name)
         colormap_type = colormap["type"]
 
@@ -794,7 +1893,7 @@ class BioCrayon:
                 if fill_missing:
                     # Auto-assign a color for missing category
                     return self._assign_color_for_missing_category(
-                        colormap_name, key_or_value, colors
+                        colormap_name, key_or_value
                     )
                 else:
                     available = list(colors.keys())
@@ -805,7 +1904,6 @@ class BioCrayon:
 
         elif colormap_type == "continuous":
             colors = colormap["colors"]
-            positions = colormap["positions"]
 
             # Handle NaN/nan values for continuous colormaps
             if key_or_value in [None, "NaN", "nan", "NAN", "Nan"]:
@@ -817,29 +1915,72 @@ class BioCrayon:
                 )
 
             value = float(key_or_value)
+            compiled = self._get_compiled(colormap_name)
+            positions = compiled.position_list
 
             # Handle edge cases
             if value <= positions[0]:
                 return colors[0]
             if value >= positions[-1]:
                 return colors[-1]
+            if value != value:
+                raise ValueError(f"Could not interpolate value {value}")
 
-            # Find the appropriate segment
-            for i in range(len(positions) - 1):
-                if positions[i] <= value <= positions[i + 1]:
-                    # Interpolate between colors using LAB space
-                    t = (value - positions[i]) / (positions[i + 1] - positions[i])
-                    color1 = colors[i]
-                    color2 = colors[i + 1]
-
-                    return interpolate_color_lab(color1, color2, t)
+            # Find the appropriate segment and interpolate between its cached
+            # LAB endpoints
+            i = bisect_left(positions, value)
+            t = (value - positions[i - 1]) / (positions[i] - positions[i - 1])
+            lab1 = compiled.lab_list[i - 1]
+            lab2 = compiled.lab_list[i]
+            rgb = lab_to_rgb(*(c1 + t * (c2 - c1) for c1, c2 in zip(lab1, lab2)))
 
-            # Should not reach here
-            raise ValueError(f"Could not interpolate value {value}")
+            return rgb_to_hex(*rgb)
 
         else:
             raise ValueError(f"Unknown colormap type: {colormap_type}")
 
+    def get_colors_lab(
+        self,
+        colormap_name: str,
+        values: Any,
+        output: str = "rgba",
+        default_color: str = "#CCCCCC",
+        lut_size: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Get colors for a whole array of values using LAB interpolation.
+
+        Batch counterpart of get_color_lab, e.g. for coloring a full
+        expression matrix in perceptually uniform LAB space. Equivalent to
+        get_colors with interpolation='lab'.
+
+        Args:
+            colormap_name: Name of the colormap
+            values: NumPy array, pandas Series or list of numeric values (or
+                category labels for categorical colormaps)
+            output: 'rgba' or 'rgb' for float arrays in [0, 1] with shape
+                values.shape + (4,) or (3,), 'hex' for an array of hex strings
+            default_color: Default color to use for missing values (default: "#CCCCCC")
+            lut_size: Number of rows of the quantized lookup table, or None
+                for exact interpolation (continuous colormaps only)
+
+        Returns:
+            NumPy array of colors in the requested output format
+
+        Raises:
+            KeyError: If colormap doesn't exist
+            ValueError: If values are not numeric, output is not supported
+                or lut_size is invalid
+        """
+        return self.get_colors(
+            colormap_name,
+            values,
+            output=output,
+            default_color=default_color,
+            lut_size=lut_size,
+            interpolation="lab",
+        )
+
     def create_colorblind_safe_colormap(
         self, name: str, n_colors: int, colorblind_type: str = "deuteranopia"
     ) -> None:
@@ -871,8 +2012,7 @@ class BioCrayon:
         }
 
         # Add the colormap
-        self._colormaps[name] = colormap_data
-        self._data["colormaps"] = self._colormaps
+        self._insert_colormap(name, colormap_data)
 
     def validate_bio_requirements(
         self, colormap_name: str, bio_type: str = "expression"
@@ -894,33 +2034,62 @@ class BioCrayon:
         return validate_bio_specific_requirements(colormap, bio_type)
 
     @classmethod
-    def from_community(cls, category: str, name: str) -> "BioCrayon":
+    def from_community(
+        cls,
+        category: str,
+        name: str,
+        offline: Optional[bool] = None,
+        cache: Optional[CommunityCache] = None,
+        use_bundled: bool = True,
+    ) -> "BioCrayon":
         """
         Load colormap from community registry.
 
+        Colormaps bundled with the package are resolved locally through the
+        bundled index manifest. Other colormaps are fetched from the
+        repository and kept in a persistent on-disk cache (see
+        bio_crayon.community.CommunityCache): cached copies are reused while
+        fresh, revalidated with a conditional request once stale, and served
+        as-is if the network is unavailable.
+
         Args:
             category: Category of the colormap (e.g., "neuroscience", "genomics")
             name: Name of the colormap file (without .json extension)
+            offline: If True, never touch the network and only use bundled or
+                cached colormaps (default: ``BIO_CRAYON_OFFLINE`` environment
+                variable)
+            cache: Cache to use (default: CommunityCache in default_cache_dir())
+            use_bundled: Resolve colormaps bundled with the package locally
+                before going to the network
 
         Returns:
             BioCrayon instance loaded with the community colormap
 
         Raises:
-            FileNotFoundError: If colormap doesn't exist in community collection
+            FileNotFoundError: If colormap doesn't exist in community collection,
+                or is not cached in offline mode
             ValueError: If colormap data is invalid
         """
-        # GitHub repository URL for community colormaps
-        base_url = "https://raw.githubusercontent.com/maflot/bio-crayon/main/community_colormaps"
-        colormap_url = f"{base_url}/{category}/{name}.json"
+        if use_bundled:
+            path = bundled_path(category, name)
+            if path is not None:
+                instance = cls()
+                instance.load(path, require_metadata=True)
+                return instance
 
+        import requests
+
+        cache = _community_cache(offline, cache)
         try:
-            # Fetch the colormap from GitHub
-            response = requests.get(colormap_url, timeout=10)
-            response.raise_for_status()
-            colormap_data = response.json()
+            # Fetch the colormap through the cache
+            colormap_data = cache.fetch_json(
+                community_url(category, name), f"colormaps/{category}/{name}"
+            )
         except requests.RequestException as e:
             # If not found, get available categories for better error message
-            available_categories = cls.list_community_colormaps()
+            available_categories = cls.list_community_colormaps(
+                offline=offline, cache=cache
+            )
             if available_categories:
                 category_list = list(available_categories.keys())
                 raise FileNotFoundError(
@@ -939,40 +2108,44 @@ class BioCrayon:
         return instance
 
     @classmethod
-    def list_community_colormaps(cls) -> Dict[str, List[str]]:
+    def list_community_colormaps(
+        cls,
+        offline: Optional[bool] = None,
+        cache: Optional[CommunityCache] = None,
+        use_index: bool = False,
+        use_bundled: bool = True,
+    ) -> Dict[str, List[str]]:
         """
         List all available community colormaps by category.
 
+        The collection bundled with the package is listed from its index
+        manifest without network access. Otherwise category directories are
+        listed concurrently over one pooled HTTP session, and all listings go
+        through the on-disk community cache.
+
+        Args:
+            offline: If True, never touch the network and only use a cached
+                listing (default: ``BIO_CRAYON_OFFLINE`` environment variable)
+            cache: Cache to use (default: CommunityCache in default_cache_dir())
+            use_index: Read the listing from the collection's index manifest
+                (one request) instead of the GitHub contents API
+            use_bundled: List the collection bundled with the package if
+                available instead of going to the network
+
         Returns:
             Dictionary mapping category names to lists of available colormap names
         """
+        if use_bundled:
+            index = load_bundled_index()
+            if index is not None:
+                return listing_from_index(index)
+
+        import requests
+
+        cache = _community_cache(offline, cache)
         try:
-            # GitHub API URL to list contents of community_colormaps directory
-            api_url = "https://api.github.com/repos/maflot/bio-crayon/contents/community_colormaps"
-            response = requests.get(api_url, timeout=10)
-            response.raise_for_status()
-
-            categories = {}
-            for item in response.json():
-                if item["type"] == "dir":
-                    category_name = item["name"]
-                    # Get contents of each category directory
-                    category_url = f"https://api.github.com/repos/maflot/bio-crayon/contents/community_colormaps/{category_name}"
-                    category_response = requests.get(category_url, timeout=10)
-                    category_response.raise_for_status()
-
-                    colormaps = []
-                    for file_item in category_response.json():
-                        if file_item["type"] == "file" and file_item["name"].endswith(
-                            ".json"
-                        ):
-                            colormaps.append(file_item["name"].replace(".json", ""))
-
-                    if colormaps:  # Only add categories that have JSON files
-                        categories[category_name] = sorted(colormaps)
-
-            return categories
-        except requests.RequestException:
+            return list_community(cache, use_index=use_index)
+        except (requests.RequestException, FileNotFoundError, KeyError, ValueError):
             # Fallback: return known categories if API fails
             return {
                 "allen_brain": ["single_cell"],
@@ -1006,7 +2179,7 @@ class BioCrayon:
         if name not in self._colormaps:
             raise ValueError(f"Colormap '{name}' not found in current instance")
 
-        colormap_data = self._colormaps[name].copy()
+        colormap_data = self.get_colormap(name).copy()
 
         # Add contribution metadata
         contribution_info = {
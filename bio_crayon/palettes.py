@@ -0,0 +1,187 @@
+"""
+Generation of maximally distinct categorical palettes.
+
+Colors are chosen by farthest-point sampling in CIELAB over a fixed grid of
+sRGB candidates: each new color is the candidate whose smallest distance to
+the colors chosen so far (and to any seed colors) is largest. Distances can
+also be taken in simulated color vision deficiency spaces, so the palette
+stays distinct for colorblind viewers.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .colorblind import simulate_colorblindness
+from .utils import hex_to_rgb_array, rgb_array_to_hex, rgb_to_lab_array
+
+# Levels per RGB channel of the candidate grid (24**3 = 13824 candidates)
+DEFAULT_GRID_LEVELS = 24
+
+
+@lru_cache(maxsize=4)
+def _candidate_grid(levels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the (rgb, lab) arrays of an RGB candidate grid."""
+    axis = np.rint(np.linspace(0, 255, levels)).astype(np.uint8)
+    rgb = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1)
+    rgb = rgb.reshape(-1, 3)
+    lab = rgb_to_lab_array(rgb)
+    rgb.flags.writeable = False
+    lab.flags.writeable = False
+    return rgb, lab
+
+
+@lru_cache(maxsize=16)
+def _simulated_grid(levels: int, colorblind_type: str) -> np.ndarray:
+    """Return the LAB coordinates of the candidate grid seen with a deficiency."""
+    rgb, _ = _candidate_grid(levels)
+    lab = rgb_to_lab_array(simulate_colorblindness(rgb, colorblind_type))
+    lab.flags.writeable = False
+    return lab
+
+
+class PaletteSampler:
+    """
+    Incremental farthest-point sampler over the candidate grid.
+
+    Colors are produced in order and the sequence does not depend on how many
+    are requested, so take() can be called repeatedly to extend a palette.
+
+    Attributes:
+        colors: Hex colors produced so far
+    """
+
+    def __init__(
+        self,
+        seeds: Optional[Sequence[str]] = None,
+        lightness_range: Tuple[float, float] = (0.0, 100.0),
+        colorblind_types: Sequence[str] = (),
+        grid_levels: int = DEFAULT_GRID_LEVELS,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            seeds: Hex colors that are already in use; new colors keep their
+                distance to them, but they are not produced again
+            lightness_range: Allowed CIELAB lightness (L*) of new colors
+            colorblind_types: Deficiencies ('protanopia', 'deuteranopia',
+                'tritanopia') whose simulated view must stay distinct too;
+                the distance of two colors is the smallest over normal vision
+                and these simulations
+            grid_levels: Levels per RGB channel of the candidate grid
+
+        Raises:
+            ValueError: If the lightness range is invalid or leaves no
+                candidates, or a colorblind type is not supported
+        """
+        low, high = lightness_range
+        if low > high:
+            raise ValueError(f"Invalid lightness range: {lightness_range}")
+
+        rgb, lab = _candidate_grid(grid_levels)
+        keep = (lab[:, 0] >= low) & (lab[:, 0] <= high)
+        if not keep.any():
+            raise ValueError(
+                f"No candidate colors in lightness range {lightness_range}"
+            )
+
+        self._rgb = rgb[keep]
+        self._spaces = [lab[keep]] + [
+            _simulated_grid(grid_levels, colorblind_type)[keep]
+            for colorblind_type in colorblind_types
+        ]
+        self._colorblind_types = tuple(colorblind_types)
+        # Squared distance of each candidate to the nearest chosen color
+        self._distance = np.full(len(self._rgb), np.inf)
+        self.colors: List[str] = []
+
+        if seeds:
+            seed_rgb = hex_to_rgb_array(list(seeds))
+            seed_spaces = [rgb_to_lab_array(seed_rgb)] + [
+                rgb_to_lab_array(simulate_colorblindness(seed_rgb, kind))
+                for kind in self._colorblind_types
+            ]
+            for space, seed_space in zip(self._spaces, seed_spaces):
+                for point in seed_space:
+                    self._update(space, point)
+
+    def _update(self, space: np.ndarray, point: np.ndarray) -> None:
+        """Lower candidate distances with a newly chosen point."""
+        delta = space - point
+        np.minimum(
+            self._distance, np.einsum("ij,ij->i", delta, delta), out=self._distance
+        )
+
+    def take(self, n_colors: int) -> List[str]:
+        """
+        Produce the next colors of the palette.
+
+        Args:
+            n_colors: Number of colors to produce
+
+        Returns:
+            List of hex colors, shorter than n_colors only when the candidates
+            are exhausted (every candidate coincides with a chosen color)
+        """
+        chosen = []
+        for _ in range(n_colors):
+            if not self.colors and not np.isfinite(self._distance).any():
+                # No seeds: start from the color farthest from the mean
+                center = self._spaces[0].mean(axis=0)
+                delta = self._spaces[0] - center
+                index = int(np.argmax(np.einsum("ij,ij->i", delta, delta)))
+            else:
+                index = int(np.argmax(self._distance))
+                if self._distance[index] <= 0:
+                    break
+            for space in self._spaces:
+                self._update(space, space[index])
+            chosen.append(index)
+
+        colors = rgb_array_to_hex(self._rgb[chosen]).tolist()
+        self.colors.extend(colors)
+        return colors
+
+
+def generate_palette(
+    n_colors: int,
+    seeds: Optional[Sequence[str]] = None,
+    lightness_range: Tuple[float, float] = (0.0, 100.0),
+    colorblind_types: Sequence[str] = (),
+    grid_levels: int = DEFAULT_GRID_LEVELS,
+) -> List[str]:
+    """
+    Generate a palette of maximally distinct colors.
+
+    Colors are picked one at a time by farthest-point sampling in CIELAB over
+    a grid of sRGB candidates (see PaletteSampler), so the first k colors of
+    a palette do not depend on n_colors.
+
+    Args:
+        n_colors: Number of colors to generate
+        seeds: Hex colors already in use (e.g. existing categories); the new
+            colors are chosen to be distinct from them and do not include them
+        lightness_range: Allowed CIELAB lightness (L*) of the new colors
+        colorblind_types: Deficiencies whose simulated view must stay distinct
+            too, e.g. ('deuteranopia',) or bio_crayon.colorblind.COLORBLIND_TYPES
+        grid_levels: Levels per RGB channel of the candidate grid
+
+    Returns:
+        List of n_colors hex colors
+
+    Raises:
+        ValueError: If n_colors is negative or more colors are requested
+            than there are distinct candidates
+    """
+    if n_colors < 0:
+        raise ValueError(f"n_colors must not be negative: {n_colors}")
+
+    sampler = PaletteSampler(seeds, lightness_range, colorblind_types, grid_levels)
+    colors = sampler.take(n_colors)
+    if len(colors) < n_colors:
+        raise ValueError(
+            f"Only {len(colors)} distinct colors are available with these constraints"
+        )
+    return colors
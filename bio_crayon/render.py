@@ -0,0 +1,370 @@
+"""
+Swatch sheets of whole colormap collections.
+
+Every colormap of one or more collections becomes one row of a single RGB
+image, built with NumPy in one pass (optionally spread over a process pool
+for very large catalogues). render_swatch_sheet draws that image as one
+labeled figure and saves it to PNG or SVG without touching pyplot state.
+
+encode_png and write_png store uint8 images (e.g. from
+BioCrayon.render_array) as PNG with zlib only, so headless services can
+write colored images without importing matplotlib or Pillow.
+"""
+
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .compiled import compile_colormap
+from .core import BioCrayon
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Number of samples across a swatch row
+DEFAULT_SWATCH_WIDTH = 512
+
+# Colormaps sent to a worker process at once
+DEFAULT_CHUNK_SIZE = 64
+
+# Background of the gaps between rows
+_BACKGROUND = 255
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type by number of channels (gray, RGB, RGBA)
+_PNG_COLOR_TYPES = {1: 0, 3: 2, 4: 6}
+
+# Image rows filtered and compressed at once when writing PNG files
+_PNG_BLOCK_ROWS = 256
+
+Sources = Union[BioCrayon, Sequence[BioCrayon], Mapping[str, BioCrayon]]
+
+
+def colormap_strip(
+    colormap: Dict[str, Any], width: int = DEFAULT_SWATCH_WIDTH
+) -> np.ndarray:
+    """
+    Sample a colormap across a row of pixels.
+
+    Continuous colormaps are interpolated like get_colors; categorical
+    colormaps are split into equally wide blocks, one per category.
+
+    Args:
+        colormap: Dictionary containing categorical or continuous colormap data
+        width: Number of pixels of the row
+
+    Returns:
+        uint8 array of shape (width, 3)
+
+    Raises:
+        ValueError: If the colormap type is unknown or a color is invalid
+    """
+    compiled = compile_colormap(colormap)
+    if compiled.type == "continuous":
+        rgb = compiled.interpolate(np.linspace(0.0, 1.0, width))
+        return np.rint(rgb).astype(np.uint8)
+    if len(compiled) == 0:
+        return np.full((width, 3), _BACKGROUND, dtype=np.uint8)
+    return compiled.rgb[np.arange(width) * len(compiled) // width]
+
+
+def _colormap_strips(colormaps: List[Dict[str, Any]], width: int) -> np.ndarray:
+    """Sample a chunk of colormaps; runs in worker processes."""
+    return np.stack([colormap_strip(colormap, width) for colormap in colormaps])
+
+
+def collect_colormaps(sources: Sources) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    List the colormaps of one or more collections.
+
+    Args:
+        sources: A BioCrayon instance, a sequence of them, or a mapping of
+            labels to instances; labels prefix the colormap names as
+            ``"label/name"``
+
+    Returns:
+        List of (label, colormap dictionary) in collection order
+    """
+    if isinstance(sources, BioCrayon):
+        sources = [sources]
+    if isinstance(sources, Mapping):
+        labeled = [(f"{label}/", bc) for label, bc in sources.items()]
+    else:
+        labeled = [("", bc) for bc in sources]
+
+    colormaps = []
+    for prefix, bc in labeled:
+        for name in bc.list_colormaps(include_mounted=True):
+            colormaps.append((f"{prefix}{name}", bc.get_colormap(name)))
+    return colormaps
+
+
+def render_swatch_image(
+    sources: Sources,
+    width: int = DEFAULT_SWATCH_WIDTH,
+    row_height: int = 16,
+    gap: int = 4,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> np.ndarray:
+    """
+    Render every colormap of one or more collections into one RGB image.
+
+    Args:
+        sources: A BioCrayon instance, a sequence of them, or a mapping of
+            labels to instances
+        width: Width of the image in pixels
+        row_height: Height of each colormap row in pixels
+        gap: White pixels between rows
+        processes: Number of worker processes; None or 1 samples the
+            colormaps in this process
+        chunk_size: Colormaps sent to a worker at once
+
+    Returns:
+        uint8 array of shape (n * row_height + (n - 1) * gap, width, 3) with
+        the colormaps in the order of collect_colormaps
+
+    Raises:
+        ValueError: If width, row_height, gap or chunk_size is invalid
+    """
+    return _render_rows(
+        [colormap for _, colormap in collect_colormaps(sources)],
+        width,
+        row_height,
+        gap,
+        processes,
+        chunk_size,
+    )
+
+
+def _render_rows(
+    colormaps: List[Dict[str, Any]],
+    width: int,
+    row_height: int,
+    gap: int,
+    processes: Optional[int],
+    chunk_size: int,
+) -> np.ndarray:
+    """Render colormaps as the rows of one RGB image."""
+    if width < 1 or row_height < 1 or gap < 0 or chunk_size < 1:
+        raise ValueError(
+            f"Invalid swatch layout: width={width}, row_height={row_height}, "
+            f"gap={gap}, chunk_size={chunk_size}"
+        )
+
+    n_rows = len(colormaps)
+    if n_rows == 0:
+        return np.full((0, width, 3), _BACKGROUND, dtype=np.uint8)
+
+    chunks = [
+        colormaps[start : start + chunk_size] for start in range(0, n_rows, chunk_size)
+    ]
+    if processes is None or processes == 1 or len(chunks) == 1:
+        strips = [_colormap_strips(chunk, width) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            strips = list(executor.map(_colormap_strips, chunks, [width] * len(chunks)))
+    strips = np.concatenate(strips)
+
+    # Each row is row_height copies of its strip followed by gap white lines
+    pitch = row_height + gap
+    image = np.full((n_rows, pitch, width, 3), _BACKGROUND, dtype=np.uint8)
+    image[:, :row_height] = strips[:, np.newaxis]
+    return image.reshape(n_rows * pitch, width, 3)[: n_rows * pitch - gap]
+
+
+def render_swatch_sheet(
+    sources: Sources,
+    path: Optional[Union[str, Path]] = None,
+    format: Optional[str] = None,
+    width: int = DEFAULT_SWATCH_WIDTH,
+    row_height: int = 16,
+    gap: int = 4,
+    label_width: Optional[float] = None,
+    dpi: int = 100,
+    processes: Optional[int] = None,
+) -> "Figure":
+    """
+    Draw every colormap of one or more collections as one labeled figure.
+
+    The swatches are a single image (see render_swatch_image) with the
+    colormap names as tick labels. The figure is created without pyplot, so
+    no GUI backend or global figure state is involved.
+
+    Args:
+        sources: A BioCrayon instance, a sequence of them, or a mapping of
+            labels to instances
+        path: If given, the figure is saved to this file
+        format: File format ('png', 'svg', ...); inferred from the path
+            suffix if None
+        width: Width of the swatches in pixels
+        row_height: Height of each colormap row in pixels
+        gap: White pixels between rows
+        label_width: Width of the label column in inches; sized to the
+            longest label if None
+        dpi: Resolution of the figure
+        processes: Number of worker processes for sampling the colormaps
+
+    Returns:
+        matplotlib Figure with the swatch sheet
+
+    Raises:
+        ValueError: If the layout is invalid or there are no colormaps
+    """
+    from matplotlib.figure import Figure
+
+    colormaps = collect_colormaps(sources)
+    if not colormaps:
+        raise ValueError("No colormaps to render")
+
+    image = _render_rows(
+        [colormap for _, colormap in colormaps],
+        width,
+        row_height,
+        gap,
+        processes,
+        DEFAULT_CHUNK_SIZE,
+    )
+    height, swatch_width = image.shape[:2]
+    labels = [label for label, _ in colormaps]
+    if label_width is None:
+        # Roughly 0.07 inches per character at the 8 point label size
+        label_width = 0.2 + 0.07 * max(len(label) for label in labels)
+
+    fig_width = label_width + swatch_width / dpi
+    fig = Figure(figsize=(fig_width, height / dpi), dpi=dpi)
+    left = label_width / fig_width
+    ax = fig.add_axes((left, 0.0, 1.0 - left, 1.0))
+    ax.imshow(image, aspect="auto", interpolation="nearest")
+
+    pitch = row_height + gap
+    ax.set_yticks(np.arange(len(colormaps)) * pitch + (row_height - 1) / 2)
+    ax.set_yticklabels(labels, fontsize=8)
+    ax.set_xticks([])
+    ax.tick_params(axis="y", length=0)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+    if path is not None:
+        fig.savefig(path, format=format, dpi=dpi)
+    return fig
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    """Frame PNG chunk data with its length and CRC."""
+    crc = zlib.crc32(data, zlib.crc32(kind))
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+
+def _png_image(image: np.ndarray, compression: int) -> np.ndarray:
+    """Check an image and compression level for PNG; return it as (H, W, C)."""
+    if image.dtype != np.uint8:
+        raise ValueError(f"PNG images must be uint8, got {image.dtype}")
+    if image.ndim == 2:
+        image = image[:, :, np.newaxis]
+    if image.ndim != 3 or image.shape[2] not in _PNG_COLOR_TYPES:
+        raise ValueError(
+            "PNG images must have shape (H, W), (H, W, 3) or (H, W, 4), "
+            f"got {image.shape}"
+        )
+    if image.shape[0] == 0 or image.shape[1] == 0:
+        raise ValueError(f"PNG images must not be empty, got {image.shape}")
+    if not -1 <= compression <= 9:
+        raise ValueError(
+            f"compression must be a zlib level from -1 to 9: {compression}"
+        )
+    return image
+
+
+def _iter_png(image: np.ndarray, compression: int) -> Iterator[bytes]:
+    """Yield the bytes of a PNG file, compressing a block of rows at a time."""
+    height, width, channels = image.shape
+    yield _PNG_SIGNATURE
+    yield _png_chunk(
+        b"IHDR",
+        struct.pack(">IIBBBBB", width, height, 8, _PNG_COLOR_TYPES[channels], 0, 0, 0),
+    )
+
+    compressor = zlib.compressobj(compression)
+    for start in range(0, height, _PNG_BLOCK_ROWS):
+        block = np.asarray(image[start : start + _PNG_BLOCK_ROWS]).reshape(
+            -1, width * channels
+        )
+        # Sub filter: each byte minus the same channel of the pixel to its left
+        filtered = np.empty((len(block), width * channels + 1), dtype=np.uint8)
+        filtered[:, 0] = 1
+        filtered[:, 1 : channels + 1] = block[:, :channels]
+        np.subtract(
+            block[:, channels:], block[:, :-channels], out=filtered[:, channels + 1 :]
+        )
+        data = compressor.compress(filtered.tobytes())
+        if data:
+            yield _png_chunk(b"IDAT", data)
+    yield _png_chunk(b"IDAT", compressor.flush())
+    yield _png_chunk(b"IEND", b"")
+
+
+def encode_png(image: np.ndarray, compression: int = 6) -> bytes:
+    """
+    Encode an image as PNG.
+
+    Args:
+        image: uint8 array of shape (H, W) (gray), (H, W, 3) (RGB) or
+            (H, W, 4) (RGBA)
+        compression: zlib compression level, 0-9
+
+    Returns:
+        PNG file contents
+
+    Raises:
+        ValueError: If the image is empty or has an unsupported type or
+            shape, or the compression level is invalid
+    """
+    return b"".join(_iter_png(_png_image(image, compression), compression))
+
+
+def write_png(
+    path: Union[str, Path, BinaryIO], image: np.ndarray, compression: int = 6
+) -> None:
+    """
+    Write an image to a PNG file.
+
+    The image is filtered and compressed in blocks of rows, so memory-mapped
+    images are written without loading them whole.
+
+    Args:
+        path: File path or binary file object
+        image: uint8 array of shape (H, W), (H, W, 3) or (H, W, 4)
+        compression: zlib compression level, 0-9
+
+    Raises:
+        ValueError: If the image is empty or has an unsupported type or
+            shape, or the compression level is invalid; an existing file is
+            left untouched
+    """
+    # Check before opening, so an invalid image doesn't truncate the file
+    chunks = _iter_png(_png_image(image, compression), compression)
+    if hasattr(path, "write"):
+        for chunk in chunks:
+            path.write(chunk)
+        return
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
@@ -0,0 +1,231 @@
+"""
+Incremental loading of large JSON colormap collections.
+
+open_json_collection memory-maps a JSON file and indexes the byte range of
+every entry of its ``colormaps`` object without building Python objects for
+them. Only ``metadata`` is parsed up front; a colormap is parsed from its byte
+range the first time it is looked up, so memory use follows the colormaps
+that are used rather than the size of the file.
+"""
+
+import json
+import mmap
+import re
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Brackets and the quotes opening strings; strings are skipped whole with
+# _STRING so that brackets inside them are not counted
+_STRUCTURAL = re.compile(rb'[{}\[\]"]')
+_LITERAL = re.compile(rb"[^,}\]\s]+")
+
+_OPENING = frozenset(b"{[")
+
+
+class _Scanner:
+    """Locate JSON values in a buffer without decoding them."""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], source: str):
+        self.buffer = buffer
+        self.source = source
+
+    def error(self, message: str, position: int) -> ValueError:
+        return ValueError(
+            f"Invalid JSON in {self.source} at byte {position}: {message}"
+        )
+
+    def skip_whitespace(self, position: int) -> int:
+        return _WHITESPACE.match(self.buffer, position).end()
+
+    def expect(self, char: bytes, position: int) -> int:
+        position = self.skip_whitespace(position)
+        if self.buffer[position : position + 1] != char:
+            raise self.error(f"expected {char.decode()!r}", position)
+        return position + 1
+
+    def string(self, position: int) -> Tuple[str, int]:
+        match = _STRING.match(self.buffer, position)
+        if match is None:
+            raise self.error("expected a string", position)
+        raw = match.group()
+        if b"\\" in raw:
+            return json.loads(raw), match.end()
+        return raw[1:-1].decode("utf-8"), match.end()
+
+    def value_end(self, position: int) -> int:
+        """Return the end offset of the JSON value starting at position."""
+        first = self.buffer[position : position + 1]
+        if first == b'"':
+            match = _STRING.match(self.buffer, position)
+            if match is None:
+                raise self.error("unterminated string", position)
+            return match.end()
+
+        if first and first[0] in _OPENING:
+            depth = 0
+            scan = position
+            while True:
+                match = _STRUCTURAL.search(self.buffer, scan)
+                if match is None:
+                    raise self.error("unterminated object or array", position)
+                char = self.buffer[match.start()]
+                if char == ord('"'):
+                    string = _STRING.match(self.buffer, match.start())
+                    if string is None:
+                        raise self.error("unterminated string", match.start())
+                    scan = string.end()
+                    continue
+                scan = match.end()
+                if char in _OPENING:
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return scan
+
+        match = _LITERAL.match(self.buffer, position)
+        if match is None:
+            raise self.error("expected a value", position)
+        return match.end()
+
+    def index_object(
+        self, position: int, nested: Optional[str] = None
+    ) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, Tuple[int, int]], int]:
+        """
+        Index the members of the object starting at position.
+
+        Args:
+            position: Offset of the opening brace
+            nested: Key whose object value is indexed as well, in the same pass
+
+        Returns:
+            Tuple of ({key: (value start, value end)}, index of the nested
+            object, offset just past the closing brace)
+        """
+        spans: Dict[str, Tuple[int, int]] = {}
+        inner: Dict[str, Tuple[int, int]] = {}
+        position = self.expect(b"{", position)
+        position = self.skip_whitespace(position)
+        if self.buffer[position : position + 1] == b"}":
+            return spans, inner, position + 1
+
+        while True:
+            position = self.skip_whitespace(position)
+            key, position = self.string(position)
+            position = self.expect(b":", position)
+            start = self.skip_whitespace(position)
+            if key == nested and self.buffer[start : start + 1] == b"{":
+                inner, _, end = self.index_object(start)
+            else:
+                end = self.value_end(start)
+            spans[key] = (start, end)
+
+            position = self.skip_whitespace(end)
+            separator = self.buffer[position : position + 1]
+            if separator == b"}":
+                return spans, inner, position + 1
+            if separator != b",":
+                raise self.error("expected ',' or '}'", position)
+            position += 1
+
+
+class LazyColormaps(MutableMapping):
+    """
+    Mapping of colormap names to colormaps, parsed from a buffer on access.
+
+    Parsed colormaps are kept, so in-place changes (such as categories added
+    by fill_missing) persist. Assigned colormaps are stored as given.
+    Iteration follows the order of the file, followed by added colormaps.
+    """
+
+    def __init__(
+        self,
+        buffer: Union[bytes, mmap.mmap],
+        spans: Dict[str, Tuple[int, int]],
+    ):
+        self._buffer = buffer
+        # None marks colormaps that were assigned rather than indexed
+        self._spans: Dict[str, Optional[Tuple[int, int]]] = dict(spans)
+        self._loaded: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        start, end = self._spans[name]
+        # setdefault keeps the first result if two threads parse the entry
+        return self._loaded.setdefault(name, json.loads(self._buffer[start:end]))
+
+    def __setitem__(self, name: str, colormap: Any) -> None:
+        if name not in self._spans:
+            self._spans[name] = None
+        self._loaded[name] = colormap
+
+    def __delitem__(self, name: str) -> None:
+        del self._spans[name]
+        self._loaded.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._spans
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    @property
+    def loaded(self) -> Dict[str, Any]:
+        """Colormaps parsed or assigned so far."""
+        return self._loaded
+
+    def __repr__(self):
+        return f"LazyColormaps({len(self._loaded)}/{len(self._spans)} loaded)"
+
+
+def open_json_collection(filepath: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Open a JSON colormap collection for incremental loading.
+
+    The file is memory-mapped and indexed in one pass. Top-level fields other
+    than ``colormaps`` (i.e. ``metadata``) are parsed immediately; the
+    ``colormaps`` object becomes a LazyColormaps.
+
+    Args:
+        filepath: Path to JSON file
+
+    Returns:
+        Dictionary containing colormap data, with a LazyColormaps as
+        'colormaps' when the file has that field
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If the file is not a JSON object
+    """
+    filepath = Path(filepath)
+    if not filepath.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    with open(filepath, "rb") as f:
+        if filepath.stat().st_size == 0:
+            raise ValueError(f"Invalid JSON in {filepath}: file is empty")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    scanner = _Scanner(buffer, str(filepath))
+    spans, colormap_spans, end = scanner.index_object(
+        scanner.skip_whitespace(0), nested="colormaps"
+    )
+    if scanner.skip_whitespace(end) != len(buffer):
+        raise scanner.error("extra data after the top-level object", end)
+
+    data: Dict[str, Any] = {}
+    for key, (start, end) in spans.items():
+        if key == "colormaps" and buffer[start : start + 1] == b"{":
+            data[key] = LazyColormaps(buffer, colormap_spans)
+        else:
+            data[key] = json.loads(buffer[start:end])
+    return data
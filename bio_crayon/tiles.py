@@ -0,0 +1,550 @@
+"""
+Tile pyramids of large arrays colored by a continuous colormap.
+
+render_tiles turns a 2-D array that does not fit in memory (a memory-mapped
+``.npy`` file, a zarr array or any array supporting 2-D slicing) into PNG
+tiles for web viewers, in XYZ (``{z}/{x}/{y}.png``) or Deep Zoom
+(``.dzi`` + ``{name}_files/{level}/{col}_{row}.png``) layout.
+
+Coarser levels are block means of the level below them, computed block by
+block into float32 ``.npy`` files, so memory use is bounded by the block and
+tile sizes rather than the array. Tiles are colored with
+BioCrayon.render_array and encoded with bio_crayon.render.write_png, in
+worker processes if requested. Progress is recorded in a manifest and an
+append-only log in the output directory, so an interrupted run resumes
+where it stopped.
+"""
+
+import json
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from .core import BioCrayon
+from .render import write_png
+
+# Edge length of tiles in pixels
+DEFAULT_TILE_SIZE = 256
+
+# Rows and columns of a level read at once while downsampling
+DEFAULT_BLOCK_SIZE = 2048
+
+# Tiles rendered by one task of the worker pool
+DEFAULT_TILES_PER_TASK = 16
+
+# Supported tile layouts
+TILE_LAYOUTS = ("xyz", "dzi")
+
+# Files of the output directory
+MANIFEST_FILENAME = "manifest.json"
+LOG_FILENAME = "tiles.log"
+LEVELS_DIRNAME = ".levels"
+
+# Version of the manifest format
+MANIFEST_VERSION = 1
+
+_DZI_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" '
+    'Format="png" Overlap="0" TileSize="{tile_size}">\n'
+    '  <Size Width="{width}" Height="{height}"/>\n'
+    "</Image>\n"
+)
+
+
+def open_array(source: Union[str, Path, Any]) -> Any:
+    """
+    Open a 2-D array for tiling without loading it.
+
+    Args:
+        source: Path of a ``.npy`` file (memory-mapped), path of a zarr
+            array (requires the zarr package), or an array-like object with
+            ``shape`` and 2-D slicing (NumPy array, memmap, zarr array, ...)
+
+    Returns:
+        Array-like object supporting ``array[rows, cols]``
+
+    Raises:
+        FileNotFoundError: If a path doesn't exist
+        ImportError: If a zarr path is given and zarr is not installed
+        ValueError: If the array is not 2-D or the file type is not supported
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        if path.suffix == ".npy":
+            array = np.load(path, mmap_mode="r")
+        elif path.suffix == ".zarr" or (path / ".zarray").exists():
+            try:
+                import zarr
+            except ImportError:
+                raise ImportError(
+                    "Reading zarr arrays requires the zarr package: pip install zarr"
+                ) from None
+            array = zarr.open(str(path), mode="r")
+        else:
+            raise ValueError(
+                f"Unsupported array file: {path} (use a .npy file or a zarr array)"
+            )
+    else:
+        array = source
+
+    if len(array.shape) != 2:
+        raise ValueError(f"Tiled arrays must be 2-D, got shape {array.shape}")
+    return array
+
+
+def pyramid_shapes(
+    height: int, width: int, tile_size: int = DEFAULT_TILE_SIZE, layout: str = "xyz"
+) -> List[Tuple[int, int]]:
+    """
+    Get the (height, width) of each pyramid level, full resolution first.
+
+    Each level halves the one before it (rounding up). XYZ pyramids stop at
+    the first level that fits in one tile; Deep Zoom pyramids continue down
+    to 1 x 1 as the format requires.
+
+    Args:
+        height: Rows of the full-resolution array
+        width: Columns of the full-resolution array
+        tile_size: Edge length of tiles in pixels
+        layout: 'xyz' or 'dzi'
+
+    Returns:
+        List of (height, width) per level, from full resolution to coarsest
+
+    Raises:
+        ValueError: If the layout is unknown or a size is not positive
+    """
+    if layout not in TILE_LAYOUTS:
+        raise ValueError(
+            f"Unknown tile layout '{layout}'. Use one of {list(TILE_LAYOUTS)}"
+        )
+    if height < 1 or width < 1 or tile_size < 1:
+        raise ValueError(
+            f"Invalid pyramid size: height={height}, width={width}, "
+            f"tile_size={tile_size}"
+        )
+
+    smallest = 1 if layout == "dzi" else tile_size
+    shapes = [(height, width)]
+    while max(shapes[-1]) > smallest:
+        rows, cols = shapes[-1]
+        shapes.append(((rows + 1) // 2, (cols + 1) // 2))
+    return shapes
+
+
+def _downsample(
+    source: Any, target: np.ndarray, block_size: int, track_range: bool
+) -> Tuple[float, float]:
+    """
+    Fill target with the 2 x 2 block means of source, ignoring NaN.
+
+    Returns the finite value range of source if track_range is set.
+    """
+    height, width = source.shape
+    block_size += block_size % 2
+    low, high = np.inf, -np.inf
+    for row in range(0, height, block_size):
+        for col in range(0, width, block_size):
+            block = np.asarray(
+                source[row : row + block_size, col : col + block_size],
+                dtype=np.float64,
+            )
+            if track_range:
+                finite = block[np.isfinite(block)]
+                if finite.size:
+                    low = min(low, float(finite.min()))
+                    high = max(high, float(finite.max()))
+
+            # Pad odd edges with NaN so every output pixel has a 2 x 2 block
+            rows, cols = block.shape
+            padded = np.full((rows + rows % 2, cols + cols % 2), np.nan)
+            padded[:rows, :cols] = block
+            quads = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2)
+            valid = ~np.isnan(quads)
+            total = np.where(valid, quads, 0.0).sum(axis=(1, 3))
+            count = valid.sum(axis=(1, 3))
+            mean = np.full(total.shape, np.nan)
+            np.divide(total, count, out=mean, where=count > 0)
+            target[
+                row // 2 : row // 2 + mean.shape[0], col // 2 : col // 2 + mean.shape[1]
+            ] = mean
+    return low, high
+
+
+def _finite_range(array: Any, block_size: int) -> Tuple[float, float]:
+    """Get the finite value range of an array by blocks."""
+    low, high = np.inf, -np.inf
+    for row in range(0, array.shape[0], block_size):
+        block = np.asarray(array[row : row + block_size], dtype=np.float64)
+        finite = block[np.isfinite(block)]
+        if finite.size:
+            low = min(low, float(finite.min()))
+            high = max(high, float(finite.max()))
+    return low, high
+
+
+# Name of the colormap in worker instances; the caller's name may be a
+# mounted "namespace:name" that is not a valid colormap name on its own
+_WORKER_COLORMAP = "colormap"
+
+
+@lru_cache(maxsize=8)
+def _worker_biocrayon(colormap_json: str) -> BioCrayon:
+    """Build the colormap once per worker process."""
+    return BioCrayon({"colormaps": {_WORKER_COLORMAP: json.loads(colormap_json)}})
+
+
+@lru_cache(maxsize=32)
+def _open_level(path: str) -> Any:
+    """Open a source or level file once per worker process."""
+    return open_array(path)
+
+
+def _spill(array: Any, path: Path, block_size: int) -> None:
+    """Copy an in-memory array to a .npy file by blocks of rows."""
+    target = np.lib.format.open_memmap(
+        path, mode="w+", dtype=array.dtype, shape=array.shape
+    )
+    for row in range(0, array.shape[0], block_size):
+        target[row : row + block_size] = array[row : row + block_size]
+    target.flush()
+    del target
+
+
+def _render_tile_batch(
+    level_source: Any,
+    tiles: List[Tuple[str, int, int, str]],
+    settings: Dict[str, Any],
+) -> List[str]:
+    """
+    Render a batch of tiles of one level; runs in worker processes.
+
+    Args:
+        level_source: Path of the level's .npy file, or the array itself
+        tiles: (key, row, col, path) of each tile
+        settings: Colormap and rendering settings
+
+    Returns:
+        Keys of the rendered tiles
+    """
+    array = _open_level(level_source) if isinstance(level_source, str) else level_source
+    bc = _worker_biocrayon(settings["colormap_json"])
+    tile_size = settings["tile_size"]
+
+    for _, row, col, path in tiles:
+        values = array[
+            row * tile_size : (row + 1) * tile_size,
+            col * tile_size : (col + 1) * tile_size,
+        ]
+        image = bc.render_array(
+            _WORKER_COLORMAP,
+            values,
+            vmin=settings["vmin"],
+            vmax=settings["vmax"],
+            chunk_rows=tile_size,
+            lut_size=settings["lut_size"],
+            interpolation=settings["interpolation"],
+        )
+        if settings["pad"] and image.shape[:2] != (tile_size, tile_size):
+            # XYZ tiles are always full size; the margin is transparent
+            padded = np.zeros((tile_size, tile_size, 4), dtype=np.uint8)
+            padded[: image.shape[0], : image.shape[1]] = image
+            image = padded
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        write_png(path, image)
+    return [key for key, _, _, _ in tiles]
+
+
+def _write_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    """Write the manifest atomically."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(path.parent), prefix=path.name, suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_log(path: Path) -> Set[str]:
+    """Read the completed entries of the log, ignoring a torn last line."""
+    if not path.exists():
+        return set()
+    with open(path, "r") as f:
+        return {line[:-1] for line in f if line.endswith("\n")}
+
+
+def render_tiles(
+    bc: BioCrayon,
+    colormap_name: str,
+    source: Union[str, Path, Any],
+    output_dir: Union[str, Path],
+    layout: str = "xyz",
+    tile_size: int = DEFAULT_TILE_SIZE,
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+    name: str = "image",
+    processes: Optional[int] = None,
+    resume: bool = True,
+    lut_size: int = 4096,
+    interpolation: str = "linear",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    keep_levels: bool = False,
+) -> Dict[str, Any]:
+    """
+    Render a tile pyramid of a 2-D array colored by a continuous colormap.
+
+    XYZ tiles are written as ``{z}/{x}/{y}.png`` with z = 0 the coarsest
+    level; edge tiles are padded to full size with transparent pixels. Deep
+    Zoom tiles are written as ``{name}_files/{level}/{col}_{row}.png`` next
+    to ``{name}.dzi``, without overlap; edge tiles keep their size. NaN
+    values are transparent.
+
+    Args:
+        bc: BioCrayon instance holding the colormap
+        colormap_name: Name of a continuous colormap
+        source: Array to tile, see open_array
+        output_dir: Directory of the tiles, manifest and log
+        layout: 'xyz' or 'dzi'
+        tile_size: Edge length of tiles in pixels
+        vmin: Value mapped to the start of the colormap (default: smallest
+            finite value of the array)
+        vmax: Value mapped to the end of the colormap (default: largest
+            finite value of the array)
+        name: Base name of the Deep Zoom descriptor and tile directory
+        processes: Number of worker processes rendering tiles; None or 1
+            renders in this process
+        resume: Skip levels and tiles recorded as done by an earlier run
+            with the same settings. If False, everything is rendered again
+        lut_size: Number of rows of the color lookup table
+        interpolation: 'linear' or 'lab'
+        block_size: Rows and columns read at once while downsampling
+        keep_levels: Keep the downsampled levels (float32 ``.npy`` files in
+            ``output_dir/.levels``) after the pyramid is complete
+
+    Returns:
+        Manifest dictionary with the pyramid geometry ('levels': zoom level,
+        width, height, columns and rows of each level), the settings and
+        'tile_count'
+
+    Raises:
+        KeyError: If colormap doesn't exist
+        ValueError: If the colormap is not continuous, the array is not 2-D,
+            an argument is invalid, or the output directory holds a pyramid
+            rendered with different settings (with resume=True)
+    """
+    colormap = bc.get_colormap(colormap_name)
+    if colormap["type"] != "continuous":
+        raise ValueError(
+            f"Tiles can only be colored by continuous colormaps, got {colormap['type']}"
+        )
+    if block_size < 2:
+        raise ValueError(f"block_size must be at least 2: {block_size}")
+
+    array = open_array(source)
+    height, width = (int(size) for size in array.shape)
+    shapes = pyramid_shapes(height, width, tile_size, layout)
+    n_levels = len(shapes)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_FILENAME
+    log_path = output_dir / LOG_FILENAME
+    levels_dir = output_dir / LEVELS_DIRNAME
+
+    settings = {
+        "version": MANIFEST_VERSION,
+        "layout": layout,
+        "tile_size": tile_size,
+        "width": width,
+        "height": height,
+        "name": name,
+        "colormap_name": colormap_name,
+        "colormap": colormap,
+        "lut_size": lut_size,
+        "interpolation": interpolation,
+        "source": str(source) if isinstance(source, (str, Path)) else None,
+    }
+    done: Set[str] = set()
+    previous = None
+    if resume and manifest_path.exists():
+        with open(manifest_path, "r") as f:
+            previous = json.load(f)
+        changed = [key for key, value in settings.items() if previous.get(key) != value]
+        changed += [
+            key
+            for key, value in (("vmin", vmin), ("vmax", vmax))
+            if value is not None and previous.get(key) != value
+        ]
+        if changed:
+            raise ValueError(
+                f"{output_dir} holds a pyramid with different settings ({changed}); "
+                "use resume=False to render it again"
+            )
+        if previous.get("complete"):
+            return previous
+        done = _read_log(log_path)
+        vmin = previous["vmin"] if vmin is None else vmin
+        vmax = previous["vmax"] if vmax is None else vmax
+    elif log_path.exists():
+        log_path.unlink()
+
+    # Zoom level of each pyramid level (shapes[0] is full resolution)
+    if layout == "xyz":
+        zooms = [n_levels - 1 - index for index in range(n_levels)]
+    else:
+        max_zoom = math.ceil(math.log2(max(height, width)))
+        zooms = [max_zoom - index for index in range(n_levels)]
+
+    log = open(log_path, "a")
+    try:
+        # Downsampled levels, each from the one before it
+        level_sources: List[Any] = [array]
+        levels_dir.mkdir(exist_ok=True)
+        for index in range(1, n_levels):
+            path = levels_dir / f"level_{index}.npy"
+            key = f"level {index}"
+            if key not in done or not path.exists():
+                target = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=np.float32, shape=shapes[index]
+                )
+                track_range = index == 1 and (vmin is None or vmax is None)
+                low, high = _downsample(
+                    (
+                        _open_level(str(levels_dir / f"level_{index - 1}.npy"))
+                        if index > 1
+                        else array
+                    ),
+                    target,
+                    block_size,
+                    track_range,
+                )
+                target.flush()
+                del target
+                _open_level.cache_clear()
+                if track_range:
+                    vmin = low if vmin is None else vmin
+                    vmax = high if vmax is None else vmax
+                log.write(key + "\n")
+                log.flush()
+            level_sources.append(str(path))
+
+        if vmin is None or vmax is None:
+            low, high = _finite_range(array, block_size)
+            vmin = low if vmin is None else vmin
+            vmax = high if vmax is None else vmax
+        if not (math.isfinite(vmin) and math.isfinite(vmax)):
+            # No finite values: every tile is transparent
+            vmin, vmax = 0.0, 1.0
+
+        levels = []
+        for zoom, (rows, cols) in zip(zooms, shapes):
+            levels.append(
+                {
+                    "zoom": zoom,
+                    "width": cols,
+                    "height": rows,
+                    "columns": math.ceil(cols / tile_size),
+                    "rows": math.ceil(rows / tile_size),
+                }
+            )
+        manifest = dict(
+            settings,
+            vmin=vmin,
+            vmax=vmax,
+            levels=levels,
+            tile_count=sum(level["columns"] * level["rows"] for level in levels),
+            complete=False,
+        )
+        _write_manifest(manifest_path, manifest)
+
+        if layout == "dzi":
+            tiles_dir = output_dir / f"{name}_files"
+            (output_dir / f"{name}.dzi").write_text(
+                _DZI_TEMPLATE.format(tile_size=tile_size, width=width, height=height)
+            )
+
+        # Workers open files by path; in-memory arrays are written out once
+        if isinstance(source, (str, Path)):
+            level_sources[0] = str(source)
+        elif processes not in (None, 1):
+            path = levels_dir / "level_0.npy"
+            if "level 0" not in done or not path.exists():
+                _spill(array, path, block_size)
+                log.write("level 0\n")
+                log.flush()
+            level_sources[0] = str(path)
+
+        tasks = []
+        for level, level_source in zip(levels, level_sources):
+            batch = []
+            for row in range(level["rows"]):
+                for col in range(level["columns"]):
+                    if layout == "xyz":
+                        key = f"{level['zoom']}/{col}/{row}"
+                        path = output_dir / f"{key}.png"
+                    else:
+                        key = f"{level['zoom']}/{col}_{row}"
+                        path = tiles_dir / f"{key}.png"
+                    if key in done:
+                        continue
+                    batch.append((key, row, col, str(path)))
+                    if len(batch) == DEFAULT_TILES_PER_TASK:
+                        tasks.append((level_source, batch))
+                        batch = []
+            if batch:
+                tasks.append((level_source, batch))
+
+        render_settings = {
+            "colormap_json": json.dumps(colormap, sort_keys=True),
+            "tile_size": tile_size,
+            "vmin": vmin,
+            "vmax": vmax,
+            "lut_size": lut_size,
+            "interpolation": interpolation,
+            "pad": layout == "xyz",
+        }
+
+        def record(keys: List[str]) -> None:
+            log.write("".join(key + "\n" for key in keys))
+            log.flush()
+
+        if processes in (None, 1):
+            for level_source, batch in tasks:
+                record(_render_tile_batch(level_source, batch, render_settings))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [
+                    executor.submit(
+                        _render_tile_batch, level_source, batch, render_settings
+                    )
+                    for level_source, batch in tasks
+                ]
+                for future in as_completed(futures):
+                    record(future.result())
+    finally:
+        log.close()
+        _open_level.cache_clear()
+
+    manifest["complete"] = True
+    _write_manifest(manifest_path, manifest)
+    if not keep_levels:
+        for path in levels_dir.glob("level_*.npy"):
+            path.unlink()
+        levels_dir.rmdir()
+    return manifest
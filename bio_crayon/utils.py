@@ -3,13 +3,12 @@ Utility functions for BioCrayon color operations and file handling.
 """
 
 import json
-import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Union, Optional
 from urllib.parse import urlparse
 
 import numpy as np
-import requests
 
 # Add colorblind-safe color sets
 COLORBLIND_SAFE_COLORS = [
@@ -25,7 +24,9 @@ COLORBLIND_SAFE_COLORS = [
     "#FFFFFF",
 ]
 
-# Deuteranopia (red-green colorblind) safe colors
+# Deuteranopia (red-green colorblind) safe colors: the Okabe-Ito colors that
+# stay distinct when simulated, completed with wine, indigo and pink from
+# Paul Tol's palettes
 DEUTERANOPIA_SAFE_COLORS = [
     "#000000",
     "#E69F00",
@@ -33,9 +34,9 @@ DEUTERANOPIA_SAFE_COLORS = [
     "#009E73",
     "#F0E442",
     "#0072B2",
-    "#D55E00",
-    "#CC79A7",
-    "#999999",
+    "#882255",
+    "#332288",
+    "#EE99AA",
     "#FFFFFF",
 ]
 
@@ -95,6 +96,57 @@ def rgb_to_hex(r: int, g: int, b: int) -> str:
     return f"#{r:02X}{g:02X}{b:02X}"
 
 
+def hex_to_rgb_array(hex_colors: List[str]) -> np.ndarray:
+    """
+    Convert a sequence of hex colors to an RGB array.
+
+    Args:
+        hex_colors: Sequence of hex color strings (e.g., ['#FF0000', '#0F0'])
+
+    Returns:
+        Array of shape (N, 3) with dtype uint8 and values 0-255
+
+    Raises:
+        ValueError: If any entry is not a valid hex color
+    """
+    rgb = np.empty((len(hex_colors), 3), dtype=np.uint8)
+    for i, color in enumerate(hex_colors):
+        rgb[i] = hex_to_rgb(color)
+    return rgb
+
+
+_HEX_DIGITS = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+
+def rgb_array_to_hex(rgb: np.ndarray) -> np.ndarray:
+    """
+    Convert an RGB array to hex color strings in one pass.
+
+    Args:
+        rgb: Integer array of shape (..., 3) with values 0-255
+
+    Returns:
+        Array of shape (...) with '<U7' hex color strings (e.g., '#FF0000')
+
+    Raises:
+        ValueError: If the last dimension is not 3 or values are out of range
+    """
+    rgb = np.asarray(rgb)
+    if rgb.shape[-1:] != (3,):
+        raise ValueError(f"RGB array must have shape (..., 3), got {rgb.shape}")
+    if rgb.size and (rgb.min() < 0 or rgb.max() > 255):
+        raise ValueError("RGB components must be in the range 0-255")
+
+    flat = rgb.reshape(-1, 3).astype(np.uint8)
+    chars = np.empty((flat.shape[0], 7), dtype=np.uint8)
+    chars[:, 0] = ord("#")
+    chars[:, 1::2] = _HEX_DIGITS[flat >> 4]
+    chars[:, 2::2] = _HEX_DIGITS[flat & 0x0F]
+
+    hex_colors = chars.view("S7").reshape(-1).astype("U7")
+    return hex_colors.reshape(rgb.shape[:-1])
+
+
 def rgb_to_hsv(r: int, g: int, b: int) -> Tuple[float, float, float]:
     """
     Convert RGB to HSV color space.
@@ -170,47 +222,171 @@ def hsv_to_rgb(h: float, s: float, v: float) -> Tuple[int, int, int]:
     return (int(r * 255), int(g * 255), int(b * 255))
 
 
-def rgb_to_lab(r: int, g: int, b: int) -> Tuple[float, float, float]:
+# sRGB <-> LAB constants shared by the scalar and array conversions
+_SRGB_THRESHOLD = 0.04045
+_LINEAR_THRESHOLD = 0.0031308
+_SRGB_GAMMA = 2.4
+_SRGB_SLOPE = 12.92
+_SRGB_OFFSET = 0.055
+_LAB_EPSILON = 0.008856
+_LAB_F_THRESHOLD = 0.206897
+_LAB_SLOPE = 7.787
+_LAB_OFFSET = 16 / 116
+_WHITE_POINT = (0.9505, 1.0000, 1.0890)
+_RGB_TO_XYZ = (
+    (0.4124, 0.3576, 0.1805),
+    (0.2126, 0.7152, 0.0722),
+    (0.0193, 0.1192, 0.9505),
+)
+_XYZ_TO_RGB = (
+    (3.2406, -1.5372, -0.4986),
+    (-0.9689, 1.8758, 0.0415),
+    (0.0557, -0.2040, 1.0570),
+)
+
+_Channel = Union[float, np.ndarray]
+
+
+def _srgb_to_linear(c: _Channel) -> _Channel:
+    """Undo the sRGB transfer curve of a channel in [0, 1] (float or array)."""
+    if isinstance(c, np.ndarray):
+        return np.where(
+            c > _SRGB_THRESHOLD,
+            ((np.maximum(c, _SRGB_THRESHOLD) + _SRGB_OFFSET) / (1 + _SRGB_OFFSET))
+            ** _SRGB_GAMMA,
+            c / _SRGB_SLOPE,
+        )
+    if c > _SRGB_THRESHOLD:
+        return ((c + _SRGB_OFFSET) / (1 + _SRGB_OFFSET)) ** _SRGB_GAMMA
+    return c / _SRGB_SLOPE
+
+
+def _linear_to_srgb(c: _Channel) -> _Channel:
+    """Apply the sRGB transfer curve to a linear channel (float or array)."""
+    if isinstance(c, np.ndarray):
+        return np.where(
+            c > _LINEAR_THRESHOLD,
+            (1 + _SRGB_OFFSET) * np.maximum(c, _LINEAR_THRESHOLD) ** (1 / _SRGB_GAMMA)
+            - _SRGB_OFFSET,
+            _SRGB_SLOPE * c,
+        )
+    if c > _LINEAR_THRESHOLD:
+        return (1 + _SRGB_OFFSET) * c ** (1 / _SRGB_GAMMA) - _SRGB_OFFSET
+    return _SRGB_SLOPE * c
+
+
+def _lab_f(t: _Channel) -> _Channel:
+    """The f(t) step of XYZ -> LAB (float or array)."""
+    if isinstance(t, np.ndarray):
+        return np.where(
+            t > _LAB_EPSILON,
+            np.maximum(t, _LAB_EPSILON) ** (1 / 3),
+            _LAB_SLOPE * t + _LAB_OFFSET,
+        )
+    return t ** (1 / 3) if t > _LAB_EPSILON else _LAB_SLOPE * t + _LAB_OFFSET
+
+
+def _lab_f_inverse(f: _Channel) -> _Channel:
+    """Inverse of _lab_f (float or array)."""
+    if isinstance(f, np.ndarray):
+        return np.where(f > _LAB_F_THRESHOLD, f**3, (f - _LAB_OFFSET) / _LAB_SLOPE)
+    return f**3 if f > _LAB_F_THRESHOLD else (f - _LAB_OFFSET) / _LAB_SLOPE
+
+
+def _mix(
+    matrix: Tuple[Tuple[float, float, float], ...],
+    c0: _Channel,
+    c1: _Channel,
+    c2: _Channel,
+) -> Tuple[_Channel, _Channel, _Channel]:
+    """Multiply three channels (floats or arrays) by a 3 x 3 matrix."""
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+    return (
+        m00 * c0 + m01 * c1 + m02 * c2,
+        m10 * c0 + m11 * c1 + m12 * c2,
+        m20 * c0 + m21 * c1 + m22 * c2,
+    )
+
+
+def _rgb_to_lab_channels(
+    r: _Channel, g: _Channel, b: _Channel
+) -> Tuple[_Channel, _Channel, _Channel]:
+    """Convert RGB channels in [0, 1] to LAB channels."""
+    x, y, z = _mix(
+        _RGB_TO_XYZ, _srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)
+    )
+    fx = _lab_f(x / _WHITE_POINT[0])
+    fy = _lab_f(y / _WHITE_POINT[1])
+    fz = _lab_f(z / _WHITE_POINT[2])
+    return (116 * fy) - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def _lab_to_rgb_channels(
+    l: _Channel, a: _Channel, b: _Channel
+) -> Tuple[_Channel, _Channel, _Channel]:
+    """Convert LAB channels to unclamped RGB channels in [0, 1]."""
+    fy = (l + 16) / 116
+    fx = a / 500 + fy
+    fz = fy - b / 200
+    x = _WHITE_POINT[0] * _lab_f_inverse(fx)
+    y = _WHITE_POINT[1] * _lab_f_inverse(fy)
+    z = _WHITE_POINT[2] * _lab_f_inverse(fz)
+    r, g, b = _mix(_XYZ_TO_RGB, x, y, z)
+    return _linear_to_srgb(r), _linear_to_srgb(g), _linear_to_srgb(b)
+
+
+def rgb_to_lab_array(rgb: np.ndarray) -> np.ndarray:
+    """
+    Convert an array of RGB colors to LAB color space in one pass.
+
+    Args:
+        rgb: Array of shape (..., 3) with RGB values 0-255
+
+    Returns:
+        Float array of shape (..., 3) with L in [0, 100], a and b in [-128, 127]
     """
-    Convert RGB to LAB color space for perceptually uniform interpolation.
+    rgb = np.asarray(rgb, dtype=np.float64) / 255.0
+    return np.stack(
+        _rgb_to_lab_channels(rgb[..., 0], rgb[..., 1], rgb[..., 2]), axis=-1
+    )
+
+
+def lab_to_rgb_array(lab: np.ndarray) -> np.ndarray:
+    """
+    Convert an array of LAB colors to RGB color space in one pass.
 
     Args:
-        r: Red component (0-255)
-        g: Green component (0-255)
-        b: Blue component (0-255)
+        lab: Array of shape (..., 3) with L in [0, 100], a and b in [-128, 127]
 
     Returns:
-        LAB tuple (l, a, b) with L in [0, 100], a and b in [-128, 127]
+        uint8 array of shape (..., 3) with RGB values 0-255 (clamped and
+        truncated like lab_to_rgb)
     """
-    # First convert to XYZ
-    r_norm = r / 255.0
-    g_norm = g / 255.0
-    b_norm = b / 255.0
+    lab = np.asarray(lab, dtype=np.float64)
+    srgb = np.stack(
+        _lab_to_rgb_channels(lab[..., 0], lab[..., 1], lab[..., 2]), axis=-1
+    )
 
-    # Apply gamma correction
-    r_norm = r_norm**2.2 if r_norm > 0.04045 else r_norm / 12.92
-    g_norm = g_norm**2.2 if g_norm > 0.04045 else g_norm / 12.92
-    b_norm = b_norm**2.2 if b_norm > 0.04045 else b_norm / 12.92
+    # Clamp to [0, 1] and convert to 0-255
+    return np.clip(srgb * 255, 0, 255).astype(np.uint8)
 
-    # Convert to XYZ
-    x = r_norm * 0.4124 + g_norm * 0.3576 + b_norm * 0.1805
-    y = r_norm * 0.2126 + g_norm * 0.7152 + b_norm * 0.0722
-    z = r_norm * 0.0193 + g_norm * 0.1192 + b_norm * 0.9505
 
-    # Convert to LAB
-    x_norm = x / 0.9505
-    y_norm = y / 1.0000
-    z_norm = z / 1.0890
+def rgb_to_lab(r: int, g: int, b: int) -> Tuple[float, float, float]:
+    """
+    Convert RGB to LAB color space for perceptually uniform interpolation.
 
-    x_norm = x_norm ** (1 / 3) if x_norm > 0.008856 else (7.787 * x_norm) + (16 / 116)
-    y_norm = y_norm ** (1 / 3) if y_norm > 0.008856 else (7.787 * y_norm) + (16 / 116)
-    z_norm = z_norm ** (1 / 3) if z_norm > 0.008856 else (7.787 * z_norm) + (16 / 116)
+    Pure Python, which is faster than the array version for single colors;
+    both share the conversion steps above.
 
-    l = (116 * y_norm) - 16
-    a = 500 * (x_norm - y_norm)
-    b = 200 * (y_norm - z_norm)
+    Args:
+        r: Red component (0-255)
+        g: Green component (0-255)
+        b: Blue component (0-255)
 
-    return (l, a, b)
+    Returns:
+        LAB tuple (l, a, b) with L in [0, 100], a and b in [-128, 127]
+    """
+    return _rgb_to_lab_channels(r / 255.0, g / 255.0, b / 255.0)
 
 
 def lab_to_rgb(l: float, a: float, b: float) -> Tuple[int, int, int]:
@@ -225,32 +401,57 @@ def lab_to_rgb(l: float, a: float, b: float) -> Tuple[int, int, int]:
     Returns:
         RGB tuple (r, g, b) with values 0-255
     """
-    # Convert LAB to XYZ
-    y_norm = (l + 16) / 116
-    x_norm = a / 500 + y_norm
-    z_norm = y_norm - b / 200
+    r, g, b = _lab_to_rgb_channels(l, a, b)
 
-    # Convert to XYZ
-    x = 0.9505 * (x_norm**3 if x_norm > 0.206897 else (x_norm - 16 / 116) / 7.787)
-    y = 1.0000 * (y_norm**3 if y_norm > 0.206897 else (y_norm - 16 / 116) / 7.787)
-    z = 1.0890 * (z_norm**3 if z_norm > 0.206897 else (z_norm - 16 / 116) / 7.787)
+    # Clamp to [0, 1] and convert to 0-255
+    return (
+        max(0, min(255, int(r * 255))),
+        max(0, min(255, int(g * 255))),
+        max(0, min(255, int(b * 255))),
+    )
 
-    # Convert to RGB
-    r_norm = x * 3.2406 + y * -1.5372 + z * -0.4986
-    g_norm = x * -0.9689 + y * 1.8758 + z * 0.0415
-    b_norm = x * 0.0557 + y * -0.2040 + z * 1.0570
 
-    # Apply gamma correction
-    r_norm = r_norm ** (1 / 2.2) if r_norm > 0.0031308 else 12.92 * r_norm
-    g_norm = g_norm ** (1 / 2.2) if g_norm > 0.0031308 else 12.92 * g_norm
-    b_norm = b_norm ** (1 / 2.2) if b_norm > 0.0031308 else 12.92 * b_norm
+def interpolate_lab_array(
+    rgb1: np.ndarray, rgb2: np.ndarray, t: Union[float, np.ndarray]
+) -> np.ndarray:
+    """
+    Interpolate arrays of RGB colors in LAB color space in one pass.
 
-    # Clamp to [0, 1] and convert to 0-255
-    r = max(0, min(255, int(r_norm * 255)))
-    g = max(0, min(255, int(g_norm * 255)))
-    b = max(0, min(255, int(b_norm * 255)))
+    Args:
+        rgb1: Array of shape (..., 3) with starting RGB values 0-255
+        rgb2: Array of shape (..., 3) with ending RGB values 0-255
+        t: Interpolation factor(s) (0-1), broadcast against rgb1[..., 0]
+
+    Returns:
+        uint8 array of shape (..., 3) with interpolated RGB values 0-255
+    """
+    lab1 = rgb_to_lab_array(rgb1)
+    lab2 = rgb_to_lab_array(rgb2)
+    t = np.asarray(t, dtype=np.float64)[..., None]
+
+    # Interpolate in LAB space and convert back to RGB
+    return lab_to_rgb_array(lab1 + t * (lab2 - lab1))
+
+
+def interpolate_rgb_lab(
+    rgb1: Tuple[int, int, int], rgb2: Tuple[int, int, int], t: float
+) -> Tuple[int, int, int]:
+    """
+    Interpolate two RGB colors in LAB color space.
 
-    return (r, g, b)
+    Args:
+        rgb1: Starting RGB tuple (values 0-255)
+        rgb2: Ending RGB tuple (values 0-255)
+        t: Interpolation factor (0-1)
+
+    Returns:
+        Interpolated RGB tuple (r, g, b) with values 0-255
+    """
+    lab1 = rgb_to_lab(*rgb1)
+    lab2 = rgb_to_lab(*rgb2)
+
+    # Interpolate in LAB space and convert back to RGB
+    return lab_to_rgb(*(c1 + t * (c2 - c1) for c1, c2 in zip(lab1, lab2)))
 
 
 def interpolate_color_lab(color1: str, color2: str, t: float) -> str:
@@ -268,50 +469,167 @@ def interpolate_color_lab(color1: str, color2: str, t: float) -> str:
     This method is particularly useful for biological data visualization
     where perceptual uniformity is important for accurate data interpretation.
     """
-    # Convert to LAB
-    rgb1 = hex_to_rgb(color1)
-    rgb2 = hex_to_rgb(color2)
+    rgb_interp = interpolate_rgb_lab(hex_to_rgb(color1), hex_to_rgb(color2), t)
+    return rgb_to_hex(*rgb_interp)
 
-    lab1 = rgb_to_lab(*rgb1)
-    lab2 = rgb_to_lab(*rgb2)
 
-    # Interpolate in LAB space
-    l = lab1[0] + t * (lab2[0] - lab1[0])
-    a = lab1[1] + t * (lab2[1] - lab1[1])
-    b = lab1[2] + t * (lab2[2] - lab1[2])
+# Smallest RGB distance between colors considered distinguishable
+COLORBLIND_MIN_DISTANCE = 80.0
 
-    # Convert back to RGB
-    rgb_interp = lab_to_rgb(l, a, b)
+# Palettes from this size on use a KD-tree (if scipy is installed)
+_KDTREE_MIN_COLORS = 2048
 
-    return rgb_to_hex(*rgb_interp)
+# Entries of the distance matrix computed at once without a KD-tree
+_DISTANCE_BLOCK_SIZE = 1 << 22
+
+
+def _close_pairs(
+    points: np.ndarray, threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    Find all pairs of points closer than a threshold.
+
+    Small inputs use a NumPy distance matrix, computed in row blocks to bound
+    memory (|a - b|^2 = |a|^2 + |b|^2 - 2 a.b, exact for integer RGB); large
+    inputs use scipy's cKDTree when it is installed.
+
+    Args:
+        points: Array of shape (N, D) with N >= 2
+        threshold: Pairs with a distance below this are returned
+
+    Returns:
+        Tuple of (first indices, second indices, distances) of the close
+        pairs with first < second, and the smallest pairwise distance
+    """
+    n_points = len(points)
+    if n_points >= _KDTREE_MIN_COLORS:
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            cKDTree = None
+        if cKDTree is not None:
+            tree = cKDTree(points)
+            nearest, _ = tree.query(points, k=2)
+            pairs = tree.query_pairs(threshold, output_type="ndarray")
+            first, second = pairs[:, 0], pairs[:, 1]
+            distances = np.linalg.norm(points[first] - points[second], axis=1)
+            keep = distances < threshold
+            smallest = float(nearest[:, 1].min())
+            return first[keep], second[keep], distances[keep], smallest
+
+    firsts, seconds, close = [], [], []
+    smallest = np.inf
+    norms = np.einsum("ij,ij->i", points, points)
+    block_rows = max(1, _DISTANCE_BLOCK_SIZE // n_points)
+    for start in range(0, n_points - 1, block_rows):
+        stop = min(start + block_rows, n_points - 1)
+        squared = (
+            norms[start:stop, None]
+            + norms[None, :]
+            - 2 * (points[start:stop] @ points.T)
+        )
+        # Only pairs (i, j) with i < j
+        upper = np.arange(n_points)[None, :] > np.arange(start, stop)[:, None]
+        rows, cols = np.nonzero(upper)
+        pair_distances = np.sqrt(np.maximum(squared[rows, cols], 0.0))
+        smallest = min(smallest, float(pair_distances.min()))
+        keep = pair_distances < threshold
+        firsts.append(rows[keep] + start)
+        seconds.append(cols[keep])
+        close.append(pair_distances[keep])
+
+    return (
+        np.concatenate(firsts),
+        np.concatenate(seconds),
+        np.concatenate(close),
+        smallest,
+    )
+
+
+def _points_safety_report(points: np.ndarray, min_distance: float) -> Dict[str, Any]:
+    """Build a colorblind safety report for an (N, 3) array of RGB points."""
+    report = {
+        "safe": True,
+        "min_distance": float("inf"),
+        "threshold": min_distance,
+        "offending_pairs": [],
+    }
+    if len(points) <= 1:
+        return report
+
+    first, second, distances, smallest = _close_pairs(points, min_distance)
+    order = np.lexsort((second, first, distances))
+    report["safe"] = len(order) == 0
+    report["min_distance"] = smallest
+    report["offending_pairs"] = list(
+        zip(first[order].tolist(), second[order].tolist(), distances[order].tolist())
+    )
+    return report
+
+
+def colorblind_safety_report(
+    colors: List[str],
+    colorblind_type: Optional[str] = "deuteranopia",
+    min_distance: float = COLORBLIND_MIN_DISTANCE,
+    severity: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Check which colors of a palette are too similar to tell apart.
+
+    The colors are simulated as seen with the color vision deficiency (see
+    bio_crayon.colorblind) and all pairwise RGB distances of the simulated
+    colors are computed in one vectorized pass.
+
+    Args:
+        colors: List of hex color strings
+        colorblind_type: Type of colorblindness to check for ("deuteranopia",
+            "protanopia", "tritanopia"), or None for normal vision
+        min_distance: Smallest RGB distance between distinguishable colors
+        severity: Degree of the deficiency, from 0 (normal vision) to 1
+            (dichromacy)
+
+    Returns:
+        Dictionary with 'safe' (True if no pair is too close),
+        'min_distance' (smallest pairwise distance, inf for fewer than two
+        colors), 'threshold' and 'offending_pairs': (index1, index2,
+        distance) tuples of the pairs closer than the threshold, closest first
+
+    Raises:
+        ValueError: If a color is invalid or the colorblind type is not
+            supported
+    """
+    # Import here to avoid circular imports
+    from .colorblind import simulate_colorblindness
+
+    points = hex_to_rgb_array(colors).astype(np.float64)
+    if colorblind_type is not None:
+        points = simulate_colorblindness(points, colorblind_type, severity)
+    return _points_safety_report(points, min_distance)
 
 
 def is_colorblind_safe(
-    colors: List[str], colorblind_type: str = "deuteranopia"
+    colors: List[str],
+    colorblind_type: Optional[str] = "deuteranopia",
+    severity: float = 1.0,
 ) -> bool:
     """
     Check if a set of colors is distinguishable for colorblind users.
 
     Args:
         colors: List of hex color strings
-        colorblind_type: Type of colorblindness to check for ("deuteranopia", "protanopia", "tritanopia")
+        colorblind_type: Type of colorblindness to check for ("deuteranopia",
+            "protanopia", "tritanopia"), or None for normal vision
+        severity: Degree of the deficiency, from 0 (normal vision) to 1
+            (dichromacy)
 
     Returns:
         True if colors are distinguishable for the specified colorblind type
-    """
-    if len(colors) <= 1:
-        return True
-
-    # For now, implement a simple check using color distance
-    # In a full implementation, you would use specialized colorblind simulation
-    min_required_distance = 80  # Stricter threshold for colorblind safety
 
-    for i in range(len(colors)):
-        for j in range(i + 1, len(colors)):
-            distance = calculate_color_distance(colors[i], colors[j])
-            if distance < min_required_distance:
-                return False
-    return True
+    Raises:
+        ValueError: If a color is invalid or the colorblind type is not
+            supported
+    """
+    return colorblind_safety_report(colors, colorblind_type, severity=severity)["safe"]
 
 
 def get_colorblind_safe_colors(
@@ -320,6 +638,13 @@ def get_colorblind_safe_colors(
     """
     Get a set of colorblind-safe colors.
 
+    The safe palette is used first, without the colors that are not
+    distinguishable when simulated for the colorblind type. Further colors are generated by
+    bio_crayon.palettes.generate_palette to be maximally distinct from the
+    palette and each other, both with normal vision and as simulated for the
+    colorblind type (all types if it is not a known one). The first k colors
+    do not depend on n_colors.
+
     Args:
         n_colors: Number of colors needed
         colorblind_type: Type of colorblindness to optimize for
@@ -327,26 +652,65 @@ def get_colorblind_safe_colors(
     Returns:
         List of hex color strings that are colorblind-safe
     """
-    if colorblind_type == "deuteranopia":
-        base_colors = DEUTERANOPIA_SAFE_COLORS
-    else:
-        base_colors = COLORBLIND_SAFE_COLORS
-
+    options = safe_palette_options(colorblind_type)
+    base_colors = options["seeds"]
     if n_colors <= len(base_colors):
         return base_colors[:n_colors]
 
-    # If more colors needed, interpolate between safe colors
-    colors = []
-    for i in range(n_colors):
-        t = i / (n_colors - 1)
-        idx1 = int(t * (len(base_colors) - 1))
-        idx2 = min(idx1 + 1, len(base_colors) - 1)
-        t_local = (t * (len(base_colors) - 1)) - idx1
+    # Import here to avoid circular imports
+    from .palettes import generate_palette
+
+    return base_colors + generate_palette(n_colors - len(base_colors), **options)
 
-        color = interpolate_color_lab(base_colors[idx1], base_colors[idx2], t_local)
-        colors.append(color)
 
-    return colors
+def safe_palette_options(colorblind_type: str = "deuteranopia") -> Dict[str, Any]:
+    """
+    Get the generate_palette options that extend the colorblind-safe palette.
+
+    The seeds are the safe palette for the colorblind type, without the
+    colors that are not distinguishable from an earlier one when simulated.
+
+    Args:
+        colorblind_type: Type of colorblindness to optimize for
+
+    Returns:
+        Keyword arguments for bio_crayon.palettes.generate_palette
+    """
+    from .colorblind import COLORBLIND_TYPES
+
+    if colorblind_type in COLORBLIND_TYPES:
+        colorblind_types = (colorblind_type,)
+    else:
+        colorblind_types = COLORBLIND_TYPES
+
+    return {
+        "seeds": list(_distinct_safe_colors(colorblind_types)),
+        # Keep generated colors visible on white and black backgrounds
+        "lightness_range": (20.0, 90.0),
+        "colorblind_types": colorblind_types,
+    }
+
+
+@lru_cache(maxsize=8)
+def _distinct_safe_colors(colorblind_types: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Get the safe palette colors that stay distinct for all the types."""
+    from .colorblind import simulate_all
+
+    if colorblind_types == ("deuteranopia",):
+        base_colors = DEUTERANOPIA_SAFE_COLORS
+    else:
+        base_colors = COLORBLIND_SAFE_COLORS
+
+    # (types, colors, 3) simulated palette; keep colors greedily in order
+    simulated = simulate_all(hex_to_rgb_array(base_colors), colorblind_types)
+    kept = []
+    for index in range(len(base_colors)):
+        if kept:
+            delta = simulated[:, kept] - simulated[:, index : index + 1]
+            if np.sqrt((delta**2).sum(axis=-1)).min() < COLORBLIND_MIN_DISTANCE:
+                continue
+        kept.append(index)
+    return tuple(base_colors[index] for index in kept)
 
 
 def interpolate_colors(
@@ -465,6 +829,8 @@ def load_from_url(url: str) -> Dict[str, Any]:
         requests.RequestException: If request fails
         json.JSONDecodeError: If response is not valid JSON
     """
+    import requests
+
     response = requests.get(url, timeout=30)
     response.raise_for_status()
     return response.json()
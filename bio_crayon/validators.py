@@ -4,20 +4,26 @@ Validation utilities for BioCrayon colormaps.
 
 import json
 import re
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, Any, Union, List
+from typing import TYPE_CHECKING, Dict, Any, Union, List, Optional
 
-import jsonschema
-from jsonschema import ValidationError
+if TYPE_CHECKING:
+    import jsonschema
+
+# Compiled schema validator, built on first use by get_schema_validator
+_schema_validator: Optional["jsonschema.Draft7Validator"] = None
 
 
 def load_schema() -> Dict[str, Any]:
     """Load the colormap JSON schema."""
     import importlib.resources
-    
+
     try:
         # Try to load from package data (installed package)
-        with importlib.resources.files("bio_crayon").joinpath("schemas/colormap_schema.json").open("r") as f:
+        with importlib.resources.files("bio_crayon").joinpath(
+            "schemas/colormap_schema.json"
+        ).open("r") as f:
             return json.load(f)
     except (FileNotFoundError, ModuleNotFoundError):
         # Fallback to relative path for development
@@ -26,6 +32,30 @@ def load_schema() -> Dict[str, Any]:
             return json.load(f)
 
 
+def get_schema_validator() -> "jsonschema.Draft7Validator":
+    """
+    Get the compiled validator for the colormap JSON schema.
+
+    The schema is read and the validator built once per process; later calls
+    return the same validator.
+
+    Returns:
+        Draft7Validator for the colormap schema
+    """
+    global _schema_validator
+    if _schema_validator is None:
+        import jsonschema
+
+        _schema_validator = jsonschema.Draft7Validator(load_schema())
+    return _schema_validator
+
+
+def reset_schema_cache() -> None:
+    """Drop the cached schema validator so the schema is re-read on next use."""
+    global _schema_validator
+    _schema_validator = None
+
+
 def validate_colormap_data(
     data: Dict[str, Any], require_metadata: bool = False
 ) -> List[str]:
@@ -39,8 +69,7 @@ def validate_colormap_data(
     Returns:
         List of validation error messages (empty if valid)
     """
-    schema = load_schema()
-    validator = jsonschema.Draft7Validator(schema)
+    validator = get_schema_validator()
 
     errors = []
     for error in validator.iter_errors(data):
@@ -54,6 +83,98 @@ def validate_colormap_data(
     return errors
 
 
+def validate_colormap_structure(
+    data: Dict[str, Any], require_metadata: bool = False
+) -> List[str]:
+    """
+    Check the top-level structure of colormap data without schema validation.
+
+    This is the cheap check used by lazy loading: it looks at the document
+    layout, colormap names and types only. Colors, positions and the other
+    fields of each colormap are checked later by validate_colormap_entry.
+
+    Args:
+        data: Dictionary containing colormap data
+        require_metadata: Whether metadata is required (True for community colormaps)
+
+    Returns:
+        List of validation error messages (empty if valid)
+    """
+    errors = []
+
+    if not isinstance(data, dict):
+        return ["Colormap data must be a dictionary"]
+
+    for key in data:
+        if key not in ("metadata", "colormaps"):
+            errors.append(f"Unexpected top-level field '{key}'")
+
+    metadata = data.get("metadata", {})
+    if not isinstance(metadata, dict):
+        errors.append("Metadata must be a dictionary")
+    elif require_metadata:
+        errors.extend(validate_metadata_required(metadata))
+
+    if "colormaps" not in data:
+        errors.append("Colormap data must have 'colormaps' field")
+        return errors
+
+    colormaps = data["colormaps"]
+    if not isinstance(colormaps, Mapping):
+        errors.append("'colormaps' must be a dictionary")
+        return errors
+
+    if not isinstance(colormaps, dict):
+        # Lazily parsed collections (bio_crayon.streaming) only have their
+        # names checked here, so that no colormap is parsed
+        return errors + [
+            f"Invalid colormap name: {name}"
+            for name in colormaps
+            if not validate_colormap_name(name)
+        ]
+
+    for name, colormap in colormaps.items():
+        if not validate_colormap_name(name):
+            errors.append(f"Invalid colormap name: {name}")
+        if not isinstance(colormap, dict):
+            errors.append(f"Colormap '{name}' must be a dictionary")
+        elif colormap.get("type") not in ("categorical", "continuous"):
+            errors.append(f"Colormap '{name}' has unknown type: {colormap.get('type')}")
+
+    return errors
+
+
+def validate_colormap_entry(name: str, colormap: Dict[str, Any]) -> List[str]:
+    """
+    Fully validate a single colormap of a collection.
+
+    Runs the JSON schema on the colormap alone, followed by the per-type
+    checks of validate_categorical_colormap or validate_continuous_colormap.
+
+    Args:
+        name: Name of the colormap
+        colormap: Dictionary containing colormap data
+
+    Returns:
+        List of validation error messages (empty if valid)
+    """
+    validator = get_schema_validator()
+
+    errors = []
+    for error in validator.iter_errors({"colormaps": {name: colormap}}):
+        errors.append(f"{error.path}: {error.message}")
+    if errors:
+        # The per-type checks assume the structure the schema guarantees
+        return errors
+
+    if colormap.get("type") == "categorical":
+        errors.extend(validate_categorical_colormap(colormap))
+    elif colormap.get("type") == "continuous":
+        errors.extend(validate_continuous_colormap(colormap))
+
+    return errors
+
+
 def validate_metadata_required(metadata: Dict[str, Any]) -> List[str]:
     """
     Validate that metadata contains all required fields for community colormaps.
@@ -314,15 +435,22 @@ def validate_colorblind_safety(
         errors.append("Categorical colormap must have 'colors' field")
         return errors
 
+    categories = list(colormap["colors"])
     colors = list(colormap["colors"].values())
 
     # Import here to avoid circular imports
-    from .utils import is_colorblind_safe
+    from .utils import colorblind_safety_report
 
-    if not is_colorblind_safe(colors, colorblind_type):
+    report = colorblind_safety_report(colors, colorblind_type)
+    if not report["safe"]:
         errors.append(
             f"Colormap colors are not distinguishable for {colorblind_type} colorblind users"
         )
+        for first, second, distance in report["offending_pairs"]:
+            errors.append(
+                f"Categories '{categories[first]}' and '{categories[second]}' "
+                f"are too similar (distance {distance:.1f} < {report['threshold']:g})"
+            )
 
     return errors
 
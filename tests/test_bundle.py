@@ -0,0 +1,171 @@
+"""
+Tests for the binary colormap bundle format.
+"""
+
+import pytest
+import numpy as np
+
+from bio_crayon import BioCrayon
+from bio_crayon.bundle import BUNDLE_MAGIC, is_bundle, read_bundle, write_bundle
+
+
+class TestBundle:
+    """Test writing and reading binary bundles."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.test_data = {
+            "metadata": {
+                "name": "Bundle Test",
+                "version": "1.0",
+                "description": "Colormaps for bundle tests",
+            },
+            "colormaps": {
+                "cell_types": {
+                    "type": "categorical",
+                    "description": "Cell types",
+                    "colors": {
+                        "T_cells": "#FF6B6B",
+                        "B cells (naïve)": "#4ecdc4",
+                        "NK": "#F00",
+                    },
+                },
+                "expression": {
+                    "type": "continuous",
+                    "colors": ["#000000", "#FF0000", "#FFFFFF"],
+                    "positions": [0.0, 0.25, 1.0],
+                    "interpolation": "linear",
+                },
+            },
+        }
+        self.biocrayon = BioCrayon(self.test_data)
+
+    def test_round_trip(self, tmp_path):
+        """Test that a saved bundle loads back with normalized colors."""
+        path = tmp_path / "collection.bcb"
+        self.biocrayon.save(path)
+        assert is_bundle(path)
+
+        loaded = BioCrayon(path, require_metadata=True)
+        assert loaded.get_metadata() == self.test_data["metadata"]
+        assert loaded.list_colormaps() == ["cell_types", "expression"]
+        assert loaded["cell_types"] == {
+            "T_cells": "#FF6B6B",
+            "B cells (naïve)": "#4ECDC4",
+            "NK": "#FF0000",
+        }
+        assert loaded.get_colormap("cell_types")["description"] == "Cell types"
+        expression = loaded.get_colormap("expression")
+        assert expression["positions"] == [0.0, 0.25, 1.0]
+        assert expression["interpolation"] == "linear"
+
+        values = np.linspace(-0.5, 1.5, 101)
+        np.testing.assert_array_equal(
+            loaded.get_colors("expression", values),
+            self.biocrayon.get_colors("expression", values),
+        )
+
+    def test_compiled_cache_seeded_with_views(self, tmp_path):
+        """Test that compiled colormaps are zero-copy views of the file."""
+        path = tmp_path / "collection.bcb"
+        write_bundle(path, self.test_data)
+
+        bundle = read_bundle(path)
+        compiled = bundle.compiled["expression"]
+        assert not compiled.rgb.flags["OWNDATA"]
+        assert not compiled.positions.flags["OWNDATA"]
+        assert not compiled.rgb.flags["WRITEABLE"]
+        assert compiled.rgb.tolist() == [[0, 0, 0], [255, 0, 0], [255, 255, 255]]
+
+        loaded = BioCrayon(path)
+        assert loaded._get_compiled("cell_types") is loaded._compiled["cell_types"]
+
+    def test_lazy_decoding(self, tmp_path):
+        """Test that colormaps are built from the file on first access."""
+        path = tmp_path / "collection.bcb"
+        write_bundle(path, self.test_data)
+
+        bundle = read_bundle(path)
+        assert len(bundle) == 2
+        assert list(bundle.colormaps) == ["cell_types", "expression"]
+        assert bundle._decoded == {}
+
+        assert bundle.compiled["cell_types"].categories == (
+            "T_cells",
+            "B cells (naïve)",
+            "NK",
+        )
+        assert list(bundle._decoded) == ["cell_types"]
+        assert bundle.colormaps["cell_types"]["colors"]["NK"] == "#FF0000"
+        with pytest.raises(KeyError):
+            bundle.colormaps["missing"]
+
+    def test_save_to_loaded_path(self, tmp_path):
+        """Test saving a loaded bundle back over its own file."""
+        path = tmp_path / "collection.bcb"
+        self.biocrayon.save(path)
+        loaded = BioCrayon(path)
+        before = loaded.get_colors("expression", [0.125, 0.5], output="hex")
+        before_rgb = loaded.map_categories("cell_types", ["NK", "T_cells"])
+
+        loaded._colormaps["tissue"] = {
+            "type": "categorical",
+            "colors": {"brain": "#223A22"},
+        }
+        loaded.save(path)
+        np.testing.assert_array_equal(
+            loaded.get_colors("expression", [0.125, 0.5], output="hex"), before
+        )
+        np.testing.assert_array_equal(
+            loaded.map_categories("cell_types", ["NK", "T_cells"]), before_rgb
+        )
+        assert not list(tmp_path.glob("*.tmp"))
+
+        reloaded = BioCrayon(path)
+        assert reloaded.list_colormaps() == ["cell_types", "expression", "tissue"]
+        assert reloaded.get_color("tissue", "brain") == "#223A22"
+
+    def test_format_selection(self, tmp_path):
+        """Test choosing the format by suffix or explicitly."""
+        json_path = tmp_path / "collection.json"
+        self.biocrayon.save(json_path)
+        assert not is_bundle(json_path)
+
+        bundle_path = tmp_path / "collection.bin"
+        self.biocrayon.save(bundle_path, format="bundle")
+        assert is_bundle(bundle_path)
+        assert BioCrayon(bundle_path).get_color("cell_types", "NK") == "#FF0000"
+
+        with pytest.raises(ValueError):
+            self.biocrayon.save(tmp_path / "collection.xml", format="xml")
+
+    def test_invalid_data_not_written(self, tmp_path):
+        """Test that validation happens when the bundle is written."""
+        self.biocrayon._data["colormaps"]["expression"]["positions"] = [0.0, 1.0]
+        path = tmp_path / "invalid.bcb"
+        with pytest.raises(ValueError):
+            self.biocrayon.save(path)
+        assert not path.exists()
+
+    def test_metadata_required(self, tmp_path):
+        """Test the metadata requirement when reading bundles."""
+        path = tmp_path / "no_metadata.bcb"
+        write_bundle(path, {"colormaps": self.test_data["colormaps"]})
+        assert len(BioCrayon(path)) == 2
+        with pytest.raises(ValueError):
+            BioCrayon(path, require_metadata=True)
+
+    def test_unsupported_files(self, tmp_path):
+        """Test rejecting truncated bundles and newer versions."""
+        path = tmp_path / "collection.bcb"
+        write_bundle(path, self.test_data)
+        raw = bytearray(path.read_bytes())
+        raw[8] = 99
+        path.write_bytes(bytes(raw))
+        with pytest.raises(ValueError):
+            read_bundle(path)
+
+        truncated = tmp_path / "truncated.bcb"
+        truncated.write_bytes(BUNDLE_MAGIC)
+        with pytest.raises(ValueError):
+            read_bundle(truncated)
@@ -0,0 +1,363 @@
+"""
+Tests for the community colormap cache.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bio_crayon import BioCrayon
+from bio_crayon import community, core
+from bio_crayon.community import (
+    CommunityCache,
+    audit_colorblind_safety,
+    build_index,
+    bundled_dir,
+    bundled_path,
+    default_cache_dir,
+    list_community,
+    load_bundled_index,
+)
+
+COLORMAP = {
+    "metadata": {
+        "name": "Test Community",
+        "version": "1.0",
+        "description": "Community colormap served by a local test server",
+    },
+    "colormaps": {
+        "cells": {
+            "type": "categorical",
+            "colors": {"T_cells": "#FF6B6B", "B_cells": "#4ECDC4"},
+        }
+    },
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve JSON documents with ETag revalidation and count requests."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path not in server.documents:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body, etag = server.documents[self.path]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Wed, 01 Jan 2025 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run a local HTTP stand-in for the community repository."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.documents = {
+        "/genomics/cells.json": (COLORMAP, '"v1"'),
+        "/api": (
+            [
+                {"name": "genomics", "type": "dir"},
+                {"name": "imaging", "type": "dir"},
+                {"name": "empty", "type": "dir"},
+                {"name": "index.json", "type": "file"},
+            ],
+            '"root"',
+        ),
+        "/api/genomics": (
+            [
+                {"name": "cells.json", "type": "file"},
+                {"name": "atlas.json", "type": "file"},
+                {"name": "README.md", "type": "file"},
+            ],
+            '"genomics"',
+        ),
+        "/api/imaging": ([{"name": "stains.json", "type": "file"}], '"imaging"'),
+        "/api/empty": ([], '"empty"'),
+        "/index.json": (
+            {
+                "categories": {
+                    "genomics": {"colormaps": {"cells": {}, "atlas": {}}},
+                    "empty": {"colormaps": {}},
+                }
+            },
+            '"index"',
+        ),
+    }
+    httpd.requests = []
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestCommunityCache:
+    """Test the on-disk community cache."""
+
+    def test_fresh_entry_served_without_request(self, server, tmp_path):
+        """Test that fresh entries do not touch the network."""
+        cache = CommunityCache(tmp_path, ttl=3600, offline=False)
+        url = f"{server.url}/genomics/cells.json"
+        assert cache.fetch_json(url, "colormaps/genomics/cells") == COLORMAP
+        assert cache.fetch_json(url, "colormaps/genomics/cells") == COLORMAP
+        assert len(server.requests) == 1
+
+    def test_stale_entry_revalidated(self, server, tmp_path):
+        """Test ETag revalidation of stale entries."""
+        cache = CommunityCache(tmp_path, ttl=0, offline=False)
+        url = f"{server.url}/genomics/cells.json"
+        cache.fetch_json(url, "colormaps/genomics/cells")
+        assert cache.fetch_json(url, "colormaps/genomics/cells") == COLORMAP
+        assert server.requests[1] == ("/genomics/cells.json", '"v1"')
+
+        # Changed upstream documents replace the cached copy
+        updated = dict(COLORMAP, colormaps={})
+        server.documents["/genomics/cells.json"] = (updated, '"v2"')
+        assert cache.fetch_json(url, "colormaps/genomics/cells") == updated
+        assert cache.read("colormaps/genomics/cells")["etag"] == '"v2"'
+
+    def test_offline_mode(self, server, tmp_path):
+        """Test that offline mode only serves cached entries."""
+        url = f"{server.url}/genomics/cells.json"
+        offline = CommunityCache(tmp_path, ttl=0, offline=True)
+        with pytest.raises(FileNotFoundError):
+            offline.fetch_json(url, "colormaps/genomics/cells")
+
+        CommunityCache(tmp_path, offline=False).fetch_json(
+            url, "colormaps/genomics/cells"
+        )
+        assert offline.fetch_json(url, "colormaps/genomics/cells") == COLORMAP
+        assert len(server.requests) == 1
+
+    def test_offline_from_environment(self, monkeypatch, tmp_path):
+        """Test the BIO_CRAYON_OFFLINE environment variable."""
+        monkeypatch.setenv("BIO_CRAYON_OFFLINE", "1")
+        assert CommunityCache(tmp_path).offline is True
+        monkeypatch.setenv("BIO_CRAYON_OFFLINE", "0")
+        assert CommunityCache(tmp_path).offline is False
+
+    def test_stale_entry_served_on_network_error(self, server, tmp_path):
+        """Test that a stale entry is served when the server is unreachable."""
+        url = f"{server.url}/genomics/cells.json"
+        cache = CommunityCache(tmp_path, ttl=0, offline=False, timeout=2)
+        cache.fetch_json(url, "colormaps/genomics/cells")
+        server.shutdown()
+        server.server_close()
+        assert cache.fetch_json(url, "colormaps/genomics/cells") == COLORMAP
+
+    def test_atomic_writes(self, tmp_path):
+        """Test that concurrent writers always leave a complete entry."""
+        cache = CommunityCache(tmp_path, offline=True)
+        writers = [
+            threading.Thread(target=cache.write, args=("colormaps/a/b", {"value": i}))
+            for i in range(20)
+        ]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+
+        assert cache.read("colormaps/a/b")["data"]["value"] in range(20)
+        assert [p.name for p in (tmp_path / "colormaps" / "a").iterdir()] == ["b.json"]
+
+    def test_single_session_across_threads(self, tmp_path):
+        """Test that concurrent first requests share one session."""
+        cache = CommunityCache(tmp_path, offline=False)
+        barrier = threading.Barrier(8)
+
+        def get_session():
+            barrier.wait()
+            return cache.session
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sessions = list(executor.map(lambda _: get_session(), range(8)))
+        assert all(session is sessions[0] for session in sessions)
+
+    def test_invalid_key(self, tmp_path):
+        """Test that keys cannot escape the cache directory."""
+        cache = CommunityCache(tmp_path, offline=True)
+        with pytest.raises(ValueError):
+            cache.path_for("colormaps/../../etc/passwd")
+
+    def test_clear_keeps_unrelated_files(self, tmp_path):
+        """Test that clear only removes the cache's own entries."""
+        cache = CommunityCache(tmp_path, offline=True)
+        cache.write("colormaps/genomics/cells", COLORMAP)
+        cache.write("listing/root", [])
+        (tmp_path / "settings.json").write_text("{}")
+        (tmp_path / "project").mkdir()
+        (tmp_path / "project" / "data.json").write_text("[]")
+
+        cache.clear()
+        assert cache.read("colormaps/genomics/cells") is None
+        assert cache.read("listing/root") is None
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "project",
+            "settings.json",
+        ]
+        assert (tmp_path / "project" / "data.json").exists()
+
+        with pytest.raises(ValueError):
+            cache.path_for("project/data")
+
+    def test_default_cache_dir(self, monkeypatch, tmp_path):
+        """Test cache directory resolution from the environment."""
+        monkeypatch.delenv("BIO_CRAYON_CACHE_DIR", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert default_cache_dir() == tmp_path / "bio_crayon"
+        monkeypatch.setenv("BIO_CRAYON_CACHE_DIR", str(tmp_path / "custom"))
+        assert default_cache_dir() == tmp_path / "custom"
+
+
+class TestFromCommunityCache:
+    """Test from_community through the cache."""
+
+    def test_from_community_cached(self, server, monkeypatch, tmp_path):
+        """Test that from_community loads through the cache."""
+        monkeypatch.setattr(community, "COMMUNITY_RAW_URL", server.url)
+        cache = CommunityCache(tmp_path, offline=False)
+
+        bc = BioCrayon.from_community("genomics", "cells", cache=cache)
+        assert bc.get_color("cells", "T_cells") == "#FF6B6B"
+
+        bc = BioCrayon.from_community("genomics", "cells", offline=True, cache=cache)
+        assert bc.get_color("cells", "B_cells") == "#4ECDC4"
+        assert len(server.requests) == 1
+
+    def test_from_community_offline_miss(self, tmp_path):
+        """Test that offline mode fails fast for uncached colormaps."""
+        cache = CommunityCache(tmp_path, offline=True)
+        with pytest.raises(FileNotFoundError):
+            BioCrayon.from_community("genomics", "missing", cache=cache)
+
+    def test_from_community_miss_uses_given_cache(self, server, monkeypatch, tmp_path):
+        """Test that misses never fall back to the default cache or the network."""
+        monkeypatch.setattr(community, "COMMUNITY_RAW_URL", server.url)
+        monkeypatch.setattr(community, "COMMUNITY_API_URL", f"{server.url}/api")
+        monkeypatch.setattr(core, "load_bundled_index", lambda: None)
+        monkeypatch.delenv("BIO_CRAYON_OFFLINE", raising=False)
+        monkeypatch.setenv("BIO_CRAYON_CACHE_DIR", str(tmp_path / "default"))
+        cache = CommunityCache(tmp_path / "custom", offline=False)
+
+        with pytest.raises(FileNotFoundError):
+            BioCrayon.from_community("genomics", "missing", offline=True, cache=cache)
+        assert server.requests == []
+
+        # The listing for the error message goes through the same cache
+        with pytest.raises(FileNotFoundError, match="'genomics', 'imaging'"):
+            BioCrayon.from_community("genomics", "missing", cache=cache)
+        listing = BioCrayon.list_community_colormaps(
+            offline=True, cache=cache, use_bundled=False
+        )
+        assert listing["imaging"] == ["stains"]
+        assert not (tmp_path / "default").exists()
+
+
+class TestCommunityListing:
+    """Test listing the community collection through the cache."""
+
+    def test_listing_concurrent_and_cached(self, server, tmp_path):
+        """Test the category listing and that it is served from the cache."""
+        cache = CommunityCache(tmp_path, offline=False)
+        expected = {"genomics": ["atlas", "cells"], "imaging": ["stains"]}
+
+        listing = list_community(cache, api_url=f"{server.url}/api", max_workers=4)
+        assert listing == expected
+        assert len(server.requests) == 4
+
+        assert list_community(cache, api_url=f"{server.url}/api") == expected
+        assert len(server.requests) == 4
+
+    def test_listing_from_index(self, server, tmp_path):
+        """Test that the index manifest costs a single request."""
+        cache = CommunityCache(tmp_path, offline=False)
+        listing = list_community(cache, use_index=True, base_url=server.url)
+        assert listing == {"genomics": ["atlas", "cells"]}
+        assert server.requests == [("/index.json", None)]
+
+    def test_list_community_colormaps(self, server, monkeypatch, tmp_path):
+        """Test BioCrayon.list_community_colormaps with a cache."""
+        monkeypatch.setattr(community, "COMMUNITY_API_URL", f"{server.url}/api")
+        cache = CommunityCache(tmp_path, offline=False)
+        listing = BioCrayon.list_community_colormaps(cache=cache, use_bundled=False)
+        assert listing["imaging"] == ["stains"]
+
+        offline = BioCrayon.list_community_colormaps(
+            offline=True, cache=cache, use_bundled=False
+        )
+        assert offline == listing
+        assert len(server.requests) == 4
+
+    def test_list_community_colormaps_fallback(self, tmp_path):
+        """Test the fallback listing when nothing is cached offline."""
+        cache = CommunityCache(tmp_path, offline=True)
+        listing = BioCrayon.list_community_colormaps(cache=cache, use_bundled=False)
+        assert "allen_brain" in listing
+
+
+class TestBundledCollection:
+    """Test the community collection bundled with the package."""
+
+    def test_index_is_current(self):
+        """Test that the bundled index manifest matches the collection."""
+        root = bundled_dir()
+        assert root is not None
+        assert load_bundled_index() == build_index(root), (
+            "community_colormaps/index.json is out of date; regenerate it with "
+            "bio_crayon.community.write_index('community_colormaps')"
+        )
+
+    def test_index_contents(self):
+        """Test categories, counts and colormap types in the index."""
+        genomics = load_bundled_index()["categories"]["genomics"]
+        assert genomics["count"] == 2
+        entry = genomics["colormaps"]["quality_scores"]
+        assert entry["path"] == "genomics/quality_scores.json"
+        assert entry["colormaps"] == {"quality_scores": "continuous"}
+        assert entry["keywords"] == sorted(entry["keywords"])
+
+    def test_from_community_bundled(self, tmp_path):
+        """Test that bundled colormaps load without network or cache."""
+        cache = CommunityCache(tmp_path, offline=True)
+        bc = BioCrayon.from_community("allen_brain", "single_cell", cache=cache)
+        assert "class_name" in bc
+        assert not any(tmp_path.iterdir())
+
+    def test_list_bundled(self):
+        """Test listing the bundled collection."""
+        listing = BioCrayon.list_community_colormaps(offline=True)
+        assert listing["genomics"] == ["expression_heatmaps", "quality_scores"]
+        assert bundled_path("genomics", "missing") is None
+        assert bundled_path("missing", "quality_scores") is None
+
+    def test_audit_bundled(self):
+        """Test auditing every bundled colormap for colorblind safety."""
+        results = audit_colorblind_safety(colorblind_types=["deuteranopia"])
+        brain = results["allen_brain/single_cell"]
+        assert brain["class_name"]["deuteranopia"]["safe"]
+        assert not brain["subclass_name"]["deuteranopia"]["safe"]
+        # Continuous-only files have nothing to audit
+        assert results["genomics/quality_scores"] == {}
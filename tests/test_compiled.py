@@ -0,0 +1,247 @@
+"""
+Tests for compiled colormap representations.
+"""
+
+import pytest
+import numpy as np
+
+from bio_crayon import BioCrayon
+from bio_crayon.compiled import (
+    QuantizedLUT,
+    compile_colormap,
+    interpolate_lab,
+    interpolate_linear,
+)
+from bio_crayon.utils import rgb_to_lab
+
+
+class TestCompiledColormap:
+    """Test compiling colormaps into arrays."""
+
+    def test_compile_continuous(self):
+        """Test compiled arrays of a continuous colormap."""
+        compiled = compile_colormap(
+            {
+                "type": "continuous",
+                "colors": ["#000000", "#F00", "#FFFFFF"],
+                "positions": [0.0, 0.5, 1.0],
+            }
+        )
+        assert compiled.positions.dtype == np.float64
+        assert compiled.colors.dtype == np.float32
+        assert compiled.colors.shape == (3, 4)
+        assert compiled.colors.flags["C_CONTIGUOUS"]
+        assert compiled.rgb.tolist() == [[0, 0, 0], [255, 0, 0], [255, 255, 255]]
+        np.testing.assert_allclose(compiled.colors[:, 3], 1.0)
+        assert compiled.categories is None
+
+    def test_compile_categorical(self):
+        """Test compiled arrays of a categorical colormap."""
+        compiled = compile_colormap(
+            {"type": "categorical", "colors": {"a": "#FF0000", "b": "#0000FF"}}
+        )
+        assert compiled.categories == ("a", "b")
+        assert compiled.index == {"a": 0, "b": 1}
+        assert compiled.positions is None
+        np.testing.assert_allclose(compiled.colors[1], [0.0, 0.0, 1.0, 1.0])
+        assert len(compiled) == 2
+
+    def test_compile_invalid_type(self):
+        """Test that unknown colormap types are rejected."""
+        with pytest.raises(ValueError):
+            compile_colormap({"type": "diverging", "colors": []})
+
+    def test_interpolate_linear(self):
+        """Test vectorized interpolation with clamping."""
+        positions = np.array([0.0, 1.0])
+        rgb = np.array([[0, 0, 0], [255, 255, 255]])
+        values = np.array([-1.0, 0.0, 0.5, 1.0, 2.0])
+        out = interpolate_linear(values, positions, rgb)
+        np.testing.assert_allclose(out[:, 0], [0.0, 0.0, 127.5, 255.0, 255.0])
+
+    def test_lab_anchors_cached(self):
+        """Test that LAB anchors are converted once and reused."""
+        compiled = compile_colormap(
+            {
+                "type": "continuous",
+                "colors": ["#000000", "#3355FF", "#FFFFFF"],
+                "positions": [0.0, 0.4, 1.0],
+            }
+        )
+        lab = compiled.lab
+        assert lab.shape == (3, 3)
+        assert compiled.lab is lab
+        np.testing.assert_allclose(lab[1], rgb_to_lab(0x33, 0x55, 0xFF))
+        assert compiled.lab_list == lab.tolist()
+
+        values = np.linspace(-0.5, 1.5, 101)
+        np.testing.assert_array_equal(
+            compiled.interpolate(values, "lab"),
+            interpolate_lab(values, compiled.positions, compiled.rgb),
+        )
+
+    def test_interpolate_invalid(self):
+        """Test unsupported interpolation and colormap types."""
+        compiled = compile_colormap(
+            {
+                "type": "continuous",
+                "colors": ["#000000", "#FFFFFF"],
+                "positions": [0, 1],
+            }
+        )
+        with pytest.raises(ValueError):
+            compiled.interpolate(np.array([0.5]), "hsv")
+        categorical = compile_colormap(
+            {"type": "categorical", "colors": {"a": "#FF0000"}}
+        )
+        with pytest.raises(ValueError):
+            categorical.interpolate(np.array([0.5]))
+
+
+class TestQuantizedLUT:
+    """Test fixed-resolution lookup tables."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.compiled = compile_colormap(
+            {
+                "type": "continuous",
+                "colors": ["#000000", "#FF0000", "#FFFFFF"],
+                "positions": [0.2, 0.3, 0.8],
+            }
+        )
+
+    def test_table_endpoints(self):
+        """Test that the table spans the colormap positions."""
+        lut = QuantizedLUT(self.compiled, 101)
+        assert lut.table.shape == (101, 3)
+        np.testing.assert_allclose(lut.table[0], [0, 0, 0])
+        np.testing.assert_allclose(lut.table[-1], [255, 255, 255])
+        assert lut.indices(np.array([0.0, 0.2, 0.8, 5.0])).tolist() == [
+            0,
+            0,
+            100,
+            100,
+        ]
+
+    def test_max_error_is_tight(self):
+        """Test that the reported error bounds the observed error."""
+        lut = QuantizedLUT(self.compiled, 50)
+        values = np.linspace(0.0, 1.0, 200001)
+        exact = interpolate_linear(values, self.compiled.positions, self.compiled.rgb)
+        observed = np.abs(lut.lookup(values) - exact).max()
+        assert observed <= lut.max_error + 1e-9
+        assert observed >= 0.99 * lut.max_error
+
+    def test_invalid_arguments(self):
+        """Test invalid table sizes and colormap types."""
+        with pytest.raises(ValueError):
+            QuantizedLUT(self.compiled, 1)
+        categorical = compile_colormap(
+            {"type": "categorical", "colors": {"a": "#FF0000"}}
+        )
+        with pytest.raises(ValueError):
+            QuantizedLUT(categorical, 16)
+        with pytest.raises(ValueError):
+            QuantizedLUT(self.compiled, 16, "hsv")
+
+    def test_lab_table(self):
+        """Test that LAB tables sample LAB interpolation."""
+        lut = QuantizedLUT(self.compiled, 64, "lab")
+        samples = np.linspace(0.2, 0.8, 64)
+        np.testing.assert_array_equal(
+            lut.table, self.compiled.interpolate(samples, "lab")
+        )
+
+
+class TestCompiledCache:
+    """Test the compiled colormap cache of BioCrayon."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.biocrayon = BioCrayon(
+            {
+                "colormaps": {
+                    "cats": {
+                        "type": "categorical",
+                        "colors": {"a": "#FF0000", "b": "#00FF00"},
+                    },
+                    "expr": {
+                        "type": "continuous",
+                        "colors": ["#000000", "#FFFFFF"],
+                        "positions": [0.0, 1.0],
+                    },
+                }
+            }
+        )
+
+    def test_compiled_once(self):
+        """Test that lookups reuse the compiled form."""
+        self.biocrayon.get_color("expr", 0.5)
+        compiled = self.biocrayon._get_compiled("expr")
+        self.biocrayon.get_colors("expr", [0.1, 0.2])
+        self.biocrayon.to_matplotlib("expr")
+        assert self.biocrayon._get_compiled("expr") is compiled
+
+    def test_invalidated_by_fill_missing(self):
+        """Test that assigning a missing category recompiles the colormap."""
+        compiled = self.biocrayon._get_compiled("cats")
+        self.biocrayon.get_color("cats", "c", fill_missing=True)
+        recompiled = self.biocrayon._get_compiled("cats")
+        assert recompiled is not compiled
+        assert "c" in recompiled.index
+        assert self.biocrayon.to_matplotlib("cats").N == 3
+
+    def test_lut_rebuilt_after_mutation(self):
+        """Test that lookup tables follow their compiled colormap."""
+        lut = self.biocrayon._get_lut("expr", 32)
+        self.biocrayon._colormaps["expr"]["colors"] = ["#FF0000", "#0000FF"]
+        assert self.biocrayon._get_lut("expr", 32) is not lut
+        colors = self.biocrayon.get_colors("expr", [0.0], output="hex", lut_size=32)
+        assert list(colors) == ["#FF0000"]
+
+    def test_matplotlib_cached(self):
+        """Test that matplotlib colormaps are reused until the colormap changes."""
+        cmap = self.biocrayon.to_matplotlib("expr")
+        assert self.biocrayon.to_matplotlib("expr") is cmap
+        assert self.biocrayon.to_matplotlib("expr", n_colors=16) is not cmap
+        assert self.biocrayon.to_matplotlib("expr", n_colors=16).N == 16
+        assert self.biocrayon.to_matplotlib("cats", 16) is self.biocrayon.to_matplotlib(
+            "cats"
+        )
+
+        self.biocrayon._colormaps["expr"]["colors"] = ["#FF0000", "#0000FF"]
+        recolored = self.biocrayon.to_matplotlib("expr")
+        assert recolored is not cmap
+        assert recolored(0.0) == (1.0, 0.0, 0.0, 1.0)
+
+        cats = self.biocrayon.to_matplotlib("cats")
+        self.biocrayon.get_color("cats", "c", fill_missing=True)
+        assert self.biocrayon.to_matplotlib("cats") is not cats
+        assert self.biocrayon.to_matplotlib("cats").N == 3
+
+    def test_invalidated_by_direct_mutation(self):
+        """Test that in-place edits through bracket access are picked up."""
+        self.biocrayon._get_compiled("cats")
+        self.biocrayon["cats"]["c"] = "#0000FF"
+        colors = self.biocrayon.map_categories("cats", ["c"], output="hex")
+        assert list(colors) == ["#0000FF"]
+
+    def test_invalidated_by_load(self):
+        """Test that loading new data drops compiled forms."""
+        self.biocrayon._get_compiled("expr")
+        self.biocrayon.load(
+            {
+                "colormaps": {
+                    "expr": {
+                        "type": "continuous",
+                        "colors": ["#FF0000", "#0000FF"],
+                        "positions": [0.0, 1.0],
+                    }
+                }
+            }
+        )
+        assert self.biocrayon.get_color("expr", 0.0) == "#FF0000"
+        assert list(self.biocrayon.get_colors("expr", [1.0], output="hex")) == [
+            "#0000FF"
+        ]
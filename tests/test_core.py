@@ -3,11 +3,17 @@ Tests for the core BioCrayon class.
 """
 
 import pytest
+import random
+import sys
 import tempfile
+import threading
 import json
 from pathlib import Path
 
+import numpy as np
+
 from bio_crayon import BioCrayon
+from bio_crayon.validators import validate_colormap_entry
 
 
 class TestBioCrayon:
@@ -279,6 +285,30 @@ class TestBioCrayon:
         is_safe = self.biocrayon.is_colorblind_safe("test_colorblind_unsafe")
         assert is_safe == True  # With current threshold, RGB is considered safe
 
+    def test_colorblind_safety_report(self):
+        """Test the safety report with category names."""
+        self.biocrayon.add_colormap(
+            "similar",
+            {
+                "type": "categorical",
+                "colors": {"a": "#FF0000", "b": "#FF1010", "c": "#0000FF"},
+            },
+        )
+        report = self.biocrayon.colorblind_safety_report("similar", None)
+        assert report["safe"] is False
+        assert report["offending_pairs"] == [("a", "b", pytest.approx(22.63, 0.01))]
+        assert report["min_distance"] == pytest.approx(22.63, 0.01)
+        assert self.biocrayon.is_colorblind_safe("similar") is False
+
+        # The small green and blue offsets vanish for deuteranopes
+        simulated = self.biocrayon.colorblind_safety_report("similar")
+        assert simulated["offending_pairs"][0][:2] == ("a", "b")
+        assert simulated["min_distance"] < report["min_distance"]
+
+        self.biocrayon.load(self.test_data)
+        with pytest.raises(ValueError):
+            self.biocrayon.colorblind_safety_report("test_continuous")
+
     def test_is_colorblind_safe_wrong_type(self):
         """Test colorblind safety check with continuous colormap."""
         self.biocrayon.load(self.test_data)
@@ -376,6 +406,50 @@ class TestBioCrayon:
 
         plt.close(fig)
 
+    def test_plot_colormap_continuous(self):
+        """Test that a gradient is drawn as one image of the lookup table."""
+        import matplotlib.pyplot as plt
+
+        self.biocrayon.load(self.test_data)
+        open_figures = plt.get_fignums()
+        fig = self.biocrayon.plot_colormap("test_continuous", show=False)
+        assert plt.get_fignums() == open_figures
+
+        ax = fig.axes[0]
+        assert len(ax.images) == 1
+        assert len(ax.patches) == 0
+        image = ax.images[0].get_array()
+        assert image.shape == (1, 512, 3)
+        np.testing.assert_allclose(
+            image[0, [0, -1]],
+            self.biocrayon.get_colors("test_continuous", [0.0, 1.0], output="rgb"),
+        )
+
+    def test_plot_colormap_categorical(self):
+        """Test that swatches are drawn as one collection."""
+        self.biocrayon.load(self.test_data)
+        fig = self.biocrayon.plot_colormap("test_categorical", show=False)
+        ax = fig.axes[0]
+        assert len(ax.collections) == 1
+        assert len(ax.patches) == 0
+        np.testing.assert_allclose(ax.collections[0].get_facecolors()[:, :3], np.eye(3))
+        assert [label.get_text() for label in ax.get_xticklabels()] == [
+            "category1",
+            "category2",
+            "category3",
+        ]
+
+    def test_plot_colormap_shown_returns_none(self):
+        """Test that shown figures are not returned for display again."""
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        self.biocrayon.load(self.test_data)
+        assert self.biocrayon.plot_colormap("test_continuous") is None
+        plt.close("all")
+
 
 class TestBioCrayonMatplotlib:
     """Test cases for matplotlib integration."""
@@ -415,6 +489,560 @@ class TestBioCrayonMatplotlib:
         cmap = self.biocrayon.to_matplotlib("test_continuous", n_colors=100)
         assert cmap.N == 100
 
+    def test_register_matplotlib(self):
+        """Test resolving registered colormaps by name in matplotlib."""
+        import matplotlib
+
+        names = self.biocrayon.register_matplotlib("tests")
+        assert names == [
+            "biocrayon.tests.test_continuous",
+            "biocrayon.tests.test_categorical",
+        ]
+        try:
+            cmap = matplotlib.colormaps["biocrayon.tests.test_categorical"]
+            assert cmap.N == 3
+            assert cmap(0) == (1.0, 0.0, 0.0, 1.0)
+
+            # Registering again replaces the snapshot
+            colormap = self.biocrayon.get_colormap("test_categorical")
+            colormap["colors"] = dict(colormap["colors"], cat1="#0000FF")
+            self.biocrayon.register_matplotlib("tests", ["test_categorical"])
+            cmap = matplotlib.colormaps["biocrayon.tests.test_categorical"]
+            assert cmap(0) == (0.0, 0.0, 1.0, 1.0)
+        finally:
+            for name in names:
+                matplotlib.colormaps.unregister(name)
+
+        with pytest.raises(ValueError):
+            self.biocrayon.register_matplotlib("not a namespace")
+
+
+class TestBatchColors:
+    """Test cases for vectorized color lookup."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.test_data = {
+            "colormaps": {
+                "test_expression": {
+                    "type": "continuous",
+                    "colors": ["#0000FF", "#FFFFFF", "#FF0000"],
+                    "positions": [0.1, 0.5, 0.9],
+                },
+                "test_categorical": {
+                    "type": "categorical",
+                    "colors": {"cat1": "#FF0000", "cat2": "#00FF00"},
+                },
+            },
+        }
+        self.biocrayon = BioCrayon(self.test_data)
+
+    def test_get_colors_matches_get_color(self):
+        """Test that batch hex output matches scalar get_color."""
+        values = np.linspace(-0.2, 1.2, 281)
+        colors = self.biocrayon.get_colors("test_expression", values, output="hex")
+        expected = [
+            self.biocrayon.get_color("test_expression", float(v)) for v in values
+        ]
+        assert list(colors) == expected
+
+    def test_get_colors_rgba_shape(self):
+        """Test float output shapes for 1-D and 2-D input."""
+        colors = self.biocrayon.get_colors("test_expression", [0.1, 0.5, 0.9])
+        assert colors.shape == (3, 4)
+        np.testing.assert_allclose(colors[:, 3], 1.0)
+        np.testing.assert_allclose(colors[1], [1.0, 1.0, 1.0, 1.0])
+
+        grid = self.biocrayon.get_colors(
+            "test_expression", np.zeros((4, 5)), output="rgb"
+        )
+        assert grid.shape == (4, 5, 3)
+
+    def test_get_colors_clamps_edges(self):
+        """Test that values outside the positions are clamped."""
+        colors = self.biocrayon.get_colors(
+            "test_expression", [-5.0, 0.0, 1.0, 5.0], output="hex"
+        )
+        assert list(colors) == ["#0000FF", "#0000FF", "#FF0000", "#FF0000"]
+
+    def test_get_colors_nan(self):
+        """Test that NaN/None values map to the default color."""
+        colors = self.biocrayon.get_colors(
+            "test_expression",
+            [np.nan, None, 0.5],
+            output="hex",
+            default_color="#123456",
+        )
+        assert list(colors) == ["#123456", "#123456", "#FFFFFF"]
+
+    def test_get_colors_invalid(self):
+        """Test invalid input handling."""
+        with pytest.raises(ValueError):
+            self.biocrayon.get_colors("test_expression", ["low", "high"])
+        with pytest.raises(ValueError):
+            self.biocrayon.get_colors("test_expression", [0.5], output="hsv")
+        with pytest.raises(KeyError):
+            self.biocrayon.get_colors("nonexistent", [0.5])
+
+    def test_get_colors_lab_matches_get_color_lab(self):
+        """Test that batch LAB output matches scalar get_color_lab."""
+        values = np.linspace(-0.2, 1.2, 281)
+        colors = self.biocrayon.get_colors_lab("test_expression", values, output="hex")
+        expected = [
+            self.biocrayon.get_color_lab("test_expression", float(v)) for v in values
+        ]
+        assert list(colors) == expected
+
+        matrix = self.biocrayon.get_colors_lab(
+            "test_expression", np.full((3, 4), np.nan), output="rgb"
+        )
+        assert matrix.shape == (3, 4, 3)
+        np.testing.assert_allclose(matrix, 0xCC / 255)
+
+    def test_get_colors_invalid_interpolation(self):
+        """Test unsupported interpolation methods."""
+        with pytest.raises(ValueError):
+            self.biocrayon.get_colors("test_expression", [0.5], interpolation="hsv")
+
+    def test_get_colors_lut(self):
+        """Test the quantized lookup-table mode against exact interpolation."""
+        values = np.linspace(0.0, 1.0, 10001)
+        exact = self.biocrayon.get_colors("test_expression", values)
+        quantized = self.biocrayon.get_colors("test_expression", values, lut_size=256)
+        error = self.biocrayon.get_lut_error("test_expression", 256)
+        assert 0 < error < 2
+        assert np.abs(quantized - exact).max() * 255 <= error + 1e-9
+
+        # End colors are exact and NaN still maps to the default color
+        colors = self.biocrayon.get_colors(
+            "test_expression", [-1.0, 2.0, np.nan], output="hex", lut_size=64
+        )
+        assert list(colors) == ["#0000FF", "#FF0000", "#CCCCCC"]
+
+    def test_get_lut_error_lab(self):
+        """Test the reported error bound of LAB lookup tables."""
+        values = np.linspace(0.0, 1.0, 10001)
+        exact = self.biocrayon.get_colors_lab("test_expression", values)
+        quantized = self.biocrayon.get_colors_lab(
+            "test_expression", values, lut_size=1024
+        )
+        error = self.biocrayon.get_lut_error("test_expression", 1024, "lab")
+        assert np.abs(quantized - exact).max() * 255 <= error + 1e-9
+        with pytest.raises(ValueError):
+            self.biocrayon.get_lut_error("test_expression", 1024, "hsv")
+
+    def test_get_colors_lut_cached(self):
+        """Test that lookup tables are cached per colormap and size."""
+        self.biocrayon.get_colors("test_expression", [0.5], lut_size=128)
+        lut = self.biocrayon._get_lut("test_expression", 128)
+        self.biocrayon.get_colors("test_expression", [0.2], lut_size=128)
+        assert self.biocrayon._get_lut("test_expression", 128) is lut
+        assert self.biocrayon._get_lut("test_expression", 64) is not lut
+
+    def test_get_colors_lut_invalid(self):
+        """Test invalid lookup-table arguments."""
+        with pytest.raises(ValueError):
+            self.biocrayon.get_colors("test_expression", [0.5], lut_size=1)
+        with pytest.raises(ValueError):
+            self.biocrayon.get_colors("test_categorical", ["cat1"], lut_size=16)
+
+    def test_map_categories_matches_get_color(self):
+        """Test that batch category lookup matches scalar get_color."""
+        labels = ["cat1", "cat2", "cat1", None, "nan"]
+        colors = self.biocrayon.map_categories("test_categorical", labels, output="hex")
+        expected = [self.biocrayon.get_color("test_categorical", l) for l in labels]
+        assert list(colors) == expected
+
+        rgba = self.biocrayon.map_categories("test_categorical", labels)
+        assert rgba.shape == (5, 4)
+        np.testing.assert_allclose(rgba[0], [1.0, 0.0, 0.0, 1.0])
+
+    def test_map_categories_codes(self):
+        """Test integer codes with explicit categories."""
+        codes = np.array([[0, 1], [-1, 1]], dtype=np.int8)
+        colors = self.biocrayon.map_categories(
+            "test_categorical", codes, categories=["cat1", "cat2"], output="hex"
+        )
+        assert colors.tolist() == [["#FF0000", "#00FF00"], ["#CCCCCC", "#00FF00"]]
+
+        with pytest.raises(ValueError):
+            self.biocrayon.map_categories(
+                "test_categorical", [2], categories=["cat1", "cat2"]
+            )
+
+    def test_map_categories_pandas(self):
+        """Test pandas Categorical and Series input."""
+        pd = pytest.importorskip("pandas")
+        cat = pd.Categorical(["cat2", "cat1", None])
+        expected = ["#00FF00", "#FF0000", "#CCCCCC"]
+
+        colors = self.biocrayon.map_categories("test_categorical", cat, output="hex")
+        assert list(colors) == expected
+        colors = self.biocrayon.map_categories(
+            "test_categorical", pd.Series(cat), output="hex"
+        )
+        assert list(colors) == expected
+
+    def test_map_categories_missing(self):
+        """Test missing category handling."""
+        with pytest.raises(KeyError):
+            self.biocrayon.map_categories("test_categorical", ["cat1", "unknown"])
+
+        colors = self.biocrayon.map_categories(
+            "test_categorical", ["unknown", "cat1", "unknown"], fill_missing=True
+        )
+        assert "unknown" in self.biocrayon["test_categorical"]
+        np.testing.assert_allclose(colors[0], colors[2])
+        assert self.biocrayon.get_color("test_categorical", "unknown") == (
+            self.biocrayon.map_categories(
+                "test_categorical", ["unknown"], output="hex"
+            )[0]
+        )
+
+    def test_get_colors_categorical(self):
+        """Test that get_colors delegates categorical colormaps."""
+        colors = self.biocrayon.get_colors(
+            "test_categorical", ["cat1", "cat2"], output="hex"
+        )
+        assert list(colors) == ["#FF0000", "#00FF00"]
+        with pytest.raises(ValueError):
+            self.biocrayon.map_categories("test_expression", ["cat1"])
+
+
+class TestMounts:
+    """Test mounting collections under namespaces."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.immune = {
+            "colormaps": {
+                "immune_cells": {
+                    "type": "categorical",
+                    "colors": {"T cell": "#FF0000", "B cell": "#00FF00"},
+                },
+                "expression": {
+                    "type": "continuous",
+                    "colors": ["#000000", "#FFFFFF"],
+                    "positions": [0.0, 1.0],
+                },
+            }
+        }
+        self.brain = {
+            "colormaps": {
+                "brain_regions": {
+                    "type": "categorical",
+                    "colors": {"cortex": "#0000FF"},
+                },
+                "expression": {
+                    "type": "continuous",
+                    "colors": ["#FF0000", "#0000FF"],
+                    "positions": [0.0, 1.0],
+                },
+            }
+        }
+        self.biocrayon = BioCrayon(
+            {
+                "colormaps": {
+                    "local": {"type": "categorical", "colors": {"a": "#123456"}}
+                }
+            }
+        )
+
+    def test_qualified_lookup(self):
+        """Test colormap lookups through namespaces."""
+        self.biocrayon.mount("immune", self.immune)
+        assert self.biocrayon.get_color("immune:immune_cells", "T cell") == "#FF0000"
+        assert self.biocrayon["immune:immune_cells"]["B cell"] == "#00FF00"
+        assert self.biocrayon["immune:expression"][1.0] == "#FFFFFF"
+        assert list(
+            self.biocrayon.get_colors("immune:expression", [0.0], output="hex")
+        ) == ["#000000"]
+        assert "immune:expression" in self.biocrayon
+        assert "immune:missing" not in self.biocrayon
+        assert self.biocrayon.get_color("local", "a") == "#123456"
+
+    def test_mounts_load_lazily(self, tmp_path):
+        """Test that mounted sources are only loaded on first access."""
+        path = tmp_path / "brain.json"
+        with open(path, "w") as f:
+            json.dump(self.brain, f)
+        self.biocrayon.mount("brain", path)
+        self.biocrayon.mount("immune", self.immune)
+        assert self.biocrayon._mounts["brain"].instance is None
+
+        self.biocrayon.get_colormap("immune:immune_cells")
+        assert self.biocrayon._mounts["brain"].instance is None
+        assert self.biocrayon.get_color("brain:brain_regions", "cortex") == "#0000FF"
+        assert self.biocrayon._mounts["brain"].instance is not None
+
+    def test_unqualified_lookup_in_mount_order(self):
+        """Test that unqualified names resolve to the first providing mount."""
+        self.biocrayon.mount("immune", self.immune)
+        self.biocrayon.mount("brain", self.brain)
+        assert self.biocrayon.get_color("expression", 0.0) == "#000000"
+        assert self.biocrayon.get_color("brain_regions", "cortex") == "#0000FF"
+        assert self.biocrayon._mount_index["expression"] == "immune"
+        with pytest.raises(KeyError):
+            self.biocrayon.get_colormap("missing")
+
+    def test_fill_missing_in_mount(self):
+        """Test that fill_missing assigns colors inside the mounted collection."""
+        immune = BioCrayon(self.immune)
+        self.biocrayon.mount("immune", immune)
+        color = self.biocrayon.get_color(
+            "immune:immune_cells", "NK cell", fill_missing=True
+        )
+        assert immune.get_color("immune_cells", "NK cell") == color
+        colors = self.biocrayon.map_categories(
+            "immune:immune_cells", ["NK cell"], output="hex"
+        )
+        assert list(colors) == [color]
+
+    def test_list_and_unmount(self):
+        """Test listing mounted colormaps and unmounting."""
+        self.biocrayon.mount("immune", self.immune)
+        assert self.biocrayon.list_mounts() == ["immune"]
+        assert self.biocrayon.list_colormaps() == ["local"]
+        assert self.biocrayon.list_colormaps(include_mounted=True) == [
+            "local",
+            "immune:immune_cells",
+            "immune:expression",
+        ]
+
+        self.biocrayon.unmount("immune")
+        assert "immune:expression" not in self.biocrayon
+        assert "expression" not in self.biocrayon
+        with pytest.raises(KeyError):
+            self.biocrayon.unmount("immune")
+
+    def test_invalid_mounts(self):
+        """Test invalid and duplicate namespaces."""
+        with pytest.raises(ValueError):
+            self.biocrayon.mount("bad:name", self.immune)
+        self.biocrayon.mount("immune", self.immune)
+        with pytest.raises(ValueError):
+            self.biocrayon.mount("immune", self.brain)
+
+
+class TestLazyValidation:
+    """Test lazy per-colormap validation."""
+
+    def setup_method(self):
+        """Set up test data with one invalid colormap."""
+        self.test_data = {
+            "colormaps": {
+                "cells": {
+                    "type": "categorical",
+                    "colors": {"T_cells": "#FF6B6B", "B_cells": "#4ECDC4"},
+                },
+                "broken": {
+                    "type": "continuous",
+                    "colors": ["#000000", "white"],
+                    "positions": [0.0, 1.0],
+                },
+            }
+        }
+
+    def test_strict_by_default(self):
+        """Test that the whole document is validated eagerly by default."""
+        with pytest.raises(ValueError):
+            BioCrayon(self.test_data)
+
+    def test_invalid_colormap_fails_on_access(self, tmp_path):
+        """Test that only the invalid colormap fails, on every access."""
+        bc = BioCrayon(self.test_data, strict=False)
+        assert bc.get_color("cells", "T_cells") == "#FF6B6B"
+        assert "broken" in bc
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="broken"):
+                bc.get_color("broken", 0.5)
+        with pytest.raises(ValueError):
+            bc.get_colors("broken", [0.5])
+        with pytest.raises(ValueError):
+            bc.save(tmp_path / "broken.json")
+
+    def test_validation_memoized(self, monkeypatch):
+        """Test that each colormap is validated once."""
+        from bio_crayon import core
+
+        calls = []
+
+        def counting(name, colormap):
+            calls.append(name)
+            return validate_colormap_entry(name, colormap)
+
+        monkeypatch.setattr(core, "validate_colormap_entry", counting)
+        bc = BioCrayon(self.test_data, strict=False)
+        assert calls == []
+
+        for _ in range(3):
+            bc.get_color("cells", "B_cells")
+            bc.get_colors("cells", ["T_cells"])
+        assert calls == ["cells"]
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                bc.get_colormap("broken")
+        assert calls == ["cells", "broken"]
+
+    def test_structural_errors_at_load(self):
+        """Test that structural problems still fail at load."""
+        self.test_data["colormaps"]["bad"] = {"type": "diverging"}
+        with pytest.raises(ValueError):
+            BioCrayon(self.test_data, strict=False)
+        with pytest.raises(ValueError):
+            BioCrayon({"colormaps": {}}, require_metadata=True, strict=False)
+
+    def test_strict_load_override(self):
+        """Test choosing the mode per load call."""
+        bc = BioCrayon(strict=False)
+        with pytest.raises(ValueError):
+            bc.load(self.test_data, strict=True)
+        bc.load(self.test_data)
+        assert bc.list_colormaps() == ["cells", "broken"]
+
+    def test_mounts_inherit_mode(self):
+        """Test that mounted collections load in the mode of the instance."""
+        bc = BioCrayon(strict=False)
+        bc.mount("lazy", self.test_data)
+        assert bc.get_color("lazy:cells", "T_cells") == "#FF6B6B"
+        with pytest.raises(ValueError):
+            bc.get_color("lazy:broken", 0.5)
+
+
+class TestConcurrency:
+    """Test sharing one instance across threads."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.biocrayon = BioCrayon(
+            {
+                "colormaps": {
+                    "clusters": {
+                        "type": "categorical",
+                        "colors": {"known": "#FF0000"},
+                    },
+                    "expression": {
+                        "type": "continuous",
+                        "colors": ["#000000", "#FFFFFF"],
+                        "positions": [0.0, 1.0],
+                    },
+                }
+            }
+        )
+        self.switch_interval = sys.getswitchinterval()
+        # Switch threads as often as possible to provoke interleavings
+        sys.setswitchinterval(1e-6)
+
+    def teardown_method(self):
+        """Restore the thread switch interval."""
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_threads(self, target, n_threads=8):
+        barrier = threading.Barrier(n_threads)
+        results = [None] * n_threads
+        errors = []
+
+        def run(i):
+            barrier.wait()
+            try:
+                results[i] = target(i)
+            except Exception as error:  # pragma: no cover - reported below
+                errors.append(error)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        return results
+
+    def test_fill_missing_stress(self):
+        """Test concurrent fill_missing for lost updates and color clashes."""
+        categories = [f"cluster_{i}" for i in range(60)]
+        values = np.linspace(0, 1, 50)
+        expected_gradient = self.biocrayon.get_colors("expression", values)
+
+        def work(seed):
+            order = list(categories)
+            random.Random(seed).shuffle(order)
+            seen = {}
+            for i, category in enumerate(order):
+                seen[category] = self.biocrayon.get_color(
+                    "clusters", category, fill_missing=True
+                )
+                if i % 10 == 0:
+                    rgba = self.biocrayon.map_categories(
+                        "clusters", order[: i + 1], output="hex"
+                    )
+                    assert rgba.tolist() == [seen[c] for c in order[: i + 1]]
+                    np.testing.assert_array_equal(
+                        self.biocrayon.get_colors("expression", values),
+                        expected_gradient,
+                    )
+            return seen
+
+        results = self.run_threads(work)
+
+        colors = self.biocrayon["clusters"]
+        assert set(colors) == {"known", *categories}
+        assert len(set(colors.values())) == len(colors)
+        for seen in results:
+            assert seen == {category: colors[category] for category in categories}
+
+    def test_map_categories_fill_missing(self):
+        """Test concurrent bulk fills of overlapping labels."""
+        labels = [f"label_{i}" for i in range(40)]
+
+        def work(i):
+            chunk = labels[i * 4 : i * 4 + 20]
+            return dict(
+                zip(
+                    chunk,
+                    self.biocrayon.map_categories(
+                        "clusters", chunk, output="hex", fill_missing=True
+                    ).tolist(),
+                )
+            )
+
+        results = self.run_threads(work)
+
+        colors = self.biocrayon["clusters"]
+        assert len(colors) == 1 + len(labels)
+        assert len(set(colors.values())) == len(colors)
+        for seen in results:
+            assert all(colors[label] == color for label, color in seen.items())
+
+    def test_readers_keep_snapshot(self):
+        """Test that a colors dict held by a reader is not mutated."""
+        snapshot = self.biocrayon["clusters"]
+        self.biocrayon.get_color("clusters", "new", fill_missing=True)
+        assert "new" not in snapshot
+        assert "new" in self.biocrayon["clusters"]
+
+    def test_lazy_mount_loaded_once(self):
+        """Test that concurrent lookups load a mounted collection once."""
+        loads = []
+
+        class CountingBioCrayon(BioCrayon):
+            def list_colormaps(self, include_mounted=False):
+                loads.append(1)
+                return super().list_colormaps(include_mounted)
+
+        mounted = CountingBioCrayon(
+            {
+                "colormaps": {
+                    "atlas": {"type": "categorical", "colors": {"a": "#000000"}}
+                }
+            }
+        )
+        self.biocrayon.mount("ns", mounted)
+        results = self.run_threads(lambda i: self.biocrayon.get_color("atlas", "a"))
+        assert results == ["#000000"] * 8
+        assert len(loads) == 1
+
 
 class TestIntegrationTests:
     """Integration tests that mirror the GitHub Actions workflow tests."""
@@ -0,0 +1,60 @@
+"""
+Tests for the import cost of the bio_crayon package.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Heavy optional modules that must only be imported when actually used
+LAZY_MODULES = ("matplotlib", "requests", "jsonschema")
+
+
+def _run(code, *args):
+    """Run code in a fresh interpreter and return the completed process."""
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+class TestImportTime:
+    """Test that importing bio_crayon stays cheap."""
+
+    def test_heavy_modules_not_imported(self):
+        """Test that matplotlib, requests and jsonschema are imported lazily."""
+        result = _run(
+            "import sys, bio_crayon; "
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        )
+        assert result.stdout.strip() == ""
+
+    def test_lookups_do_not_import_heavy_modules(self):
+        """Test that loading and color lookups stay free of matplotlib."""
+        result = _run(
+            "import sys; from bio_crayon import BioCrayon; "
+            "bc = BioCrayon({'colormaps': {'c': {'type': 'continuous', "
+            "'colors': ['#000000', '#FFFFFF'], 'positions': [0, 1]}}}); "
+            "bc.get_color('c', 0.5); bc.get_colors('c', [0.1, 0.9]); "
+            "print('matplotlib' in sys.modules, 'requests' in sys.modules)"
+        )
+        assert result.stdout.strip() == "False False"
+
+    @pytest.mark.benchmark
+    def test_benchmark_import_time(self):
+        """Report the -X importtime cost of `import bio_crayon` without NumPy."""
+        result = _run("import bio_crayon", "-X", "importtime")
+
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative_us, name = line.split("|")
+            if cumulative_us.strip().isdigit():
+                cumulative[name.strip()] = int(cumulative_us)
+
+        total = cumulative["bio_crayon"] - cumulative.get("numpy", 0)
+        print(f"import bio_crayon: {total / 1000:.0f} ms without NumPy")
@@ -192,5 +192,81 @@ class TestMissingValues:
         assert original_color == new_color
 
 
+class TestAssignMissingCategories:
+    """Test bulk and incremental assignment of missing categories."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.test_data = {
+            "colormaps": {
+                "clusters": {
+                    "type": "categorical",
+                    "colors": {"known": "#E69F00"},
+                },
+                "expression": {
+                    "type": "continuous",
+                    "colors": ["#000000", "#FFFFFF"],
+                    "positions": [0.0, 1.0],
+                },
+            }
+        }
+        self.biocrayon = BioCrayon(self.test_data)
+
+    def test_bulk_matches_one_by_one(self):
+        """Test that bulk and single assignments pick the same colors."""
+        labels = [f"cluster_{i}" for i in range(300)]
+        bulk = self.biocrayon.assign_missing_categories("clusters", labels)
+
+        single = BioCrayon(self.test_data)
+        for label in labels:
+            color = single.get_color("clusters", label, fill_missing=True)
+            assert color == bulk[label]
+
+        assert list(bulk) == labels
+        assert len(set(bulk.values())) == len(labels)
+        assert "#E69F00" not in bulk.values()
+
+    def test_single_fills_extend_in_place(self):
+        """Test that one-at-a-time fills cost O(1) instead of a copy per label."""
+        self.biocrayon.get_color("clusters", "first", fill_missing=True)
+        colors = self.biocrayon.get_colormap("clusters")["colors"]
+        for i in range(2000):
+            self.biocrayon.get_color("clusters", f"cluster_{i}", fill_missing=True)
+
+        # The dictionary copied by the first fill is extended, not replaced
+        assert self.biocrayon.get_colormap("clusters")["colors"] is colors
+        assert len(colors) == 2002
+        assert self.biocrayon._get_compiled("clusters").index["cluster_1999"] == 2001
+
+    def test_existing_duplicates_and_nan(self):
+        """Test that known, repeated and NaN labels are left alone."""
+        result = self.biocrayon.assign_missing_categories(
+            "clusters", ["known", "new", "new", None, "NaN", float("nan")]
+        )
+        assert result == {"known": "#E69F00", "new": result["new"]}
+        assert list(self.biocrayon["clusters"]) == ["known", "new"]
+
+    def test_incremental_state_follows_edits(self):
+        """Test that colors added by hand are not handed out again."""
+        self.biocrayon.assign_missing_categories("clusters", ["a"])
+        self.biocrayon["clusters"]["manual"] = "#56B4E9"
+        color = self.biocrayon.get_color("clusters", "b", fill_missing=True)
+        assert color not in ("#E69F00", "#56B4E9", self.biocrayon["clusters"]["a"])
+
+    def test_many_clusters_distinct(self):
+        """Test that hundreds of clusters get distinct colors and no gray."""
+        labels = [f"cluster_{i}" for i in range(500)]
+        colors = self.biocrayon.assign_missing_categories("clusters", labels)
+        assert len(set(colors.values())) == len(labels)
+        assert "#CCCCCC" not in colors.values()
+
+    def test_continuous_rejected(self):
+        """Test that only categorical colormaps accept assignments."""
+        with pytest.raises(ValueError):
+            self.biocrayon.assign_missing_categories("expression", ["a"])
+        with pytest.raises(KeyError):
+            self.biocrayon.assign_missing_categories("missing", ["a"])
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
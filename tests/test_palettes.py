@@ -0,0 +1,196 @@
+"""
+Tests for palette generation and colorblindness simulation.
+"""
+
+import numpy as np
+import pytest
+
+from bio_crayon.colorblind import (
+    COLORBLIND_TYPES,
+    audit_colormaps,
+    simulate_all,
+    simulate_colorblindness,
+    simulate_palette,
+)
+from bio_crayon.palettes import PaletteSampler, generate_palette
+from bio_crayon.utils import (
+    COLORBLIND_SAFE_COLORS,
+    DEUTERANOPIA_SAFE_COLORS,
+    colorblind_safety_report,
+    get_colorblind_safe_colors,
+    hex_to_rgb_array,
+    is_colorblind_safe,
+    rgb_to_lab_array,
+)
+
+
+def min_distance(colors, colorblind_type=None):
+    """Smallest pairwise CIELAB distance of a palette."""
+    rgb = hex_to_rgb_array(colors)
+    if colorblind_type is not None:
+        rgb = simulate_colorblindness(rgb, colorblind_type)
+    lab = rgb_to_lab_array(rgb)
+    distances = np.linalg.norm(lab[:, None] - lab[None, :], axis=-1)
+    return distances[np.triu_indices(len(colors), k=1)].min()
+
+
+class TestSimulation:
+    """Test colorblindness simulation."""
+
+    def test_neutral_colors_unchanged(self):
+        """Test that black, white and grays look the same to everyone."""
+        grays = np.array([[0, 0, 0], [128, 128, 128], [255, 255, 255]])
+        for colorblind_type in COLORBLIND_TYPES:
+            simulated = simulate_colorblindness(grays, colorblind_type)
+            np.testing.assert_allclose(simulated, grays, atol=1.0)
+
+    def test_red_green_confusion(self):
+        """Test that red and green move closer for deuteranopes."""
+        red_green = ["#E41A1C", "#4DAF4A"]
+        assert min_distance(red_green, "deuteranopia") < min_distance(red_green) / 2
+
+    def test_unknown_type(self):
+        """Test rejecting unsupported colorblind types."""
+        with pytest.raises(ValueError):
+            simulate_colorblindness(np.zeros((1, 3)), "achromatopsia")
+        with pytest.raises(ValueError):
+            simulate_colorblindness(np.zeros((1, 3)), "protanopia", severity=1.5)
+
+    def test_severity(self):
+        """Test that severity moves from normal vision to dichromacy."""
+        rgb = hex_to_rgb_array(["#E41A1C", "#4DAF4A", "#377EB8"])
+        np.testing.assert_allclose(
+            simulate_colorblindness(rgb, "deuteranopia", severity=0.0), rgb, atol=1e-9
+        )
+        red_green = ["#E41A1C", "#4DAF4A"]
+        distances = [
+            colorblind_safety_report(red_green, "deuteranopia", severity=severity)[
+                "min_distance"
+            ]
+            for severity in (0.0, 0.5, 1.0)
+        ]
+        assert distances[0] > distances[1] > distances[2]
+
+    def test_simulate_all(self):
+        """Test simulating several deficiencies in one call."""
+        lut = np.random.default_rng(0).integers(0, 256, (16, 16, 3))
+        simulated = simulate_all(lut)
+        assert simulated.shape == (3, 16, 16, 3)
+        for index, colorblind_type in enumerate(COLORBLIND_TYPES):
+            np.testing.assert_allclose(
+                simulated[index], simulate_colorblindness(lut, colorblind_type)
+            )
+
+    def test_simulate_palette(self):
+        """Test simulating hex palettes."""
+        assert simulate_palette(["#000000", "#FFFFFF"], "tritanopia") == [
+            "#000000",
+            "#FFFFFF",
+        ]
+        assert simulate_palette([]) == []
+
+    def test_safety_honors_type(self):
+        """Test that safety checks depend on the colorblind type."""
+        green_pink = ["#009E73", "#CC79A7"]
+        assert is_colorblind_safe(green_pink, None)
+        assert not is_colorblind_safe(green_pink, "deuteranopia")
+        assert is_colorblind_safe(green_pink, "tritanopia")
+        with pytest.raises(ValueError):
+            is_colorblind_safe(green_pink, "achromatopsia")
+
+    def test_safe_palettes(self):
+        """Test the shipped safe palettes against the simulation."""
+        assert DEUTERANOPIA_SAFE_COLORS != COLORBLIND_SAFE_COLORS
+        assert is_colorblind_safe(DEUTERANOPIA_SAFE_COLORS, "deuteranopia")
+        for colorblind_type in COLORBLIND_TYPES:
+            colors = get_colorblind_safe_colors(6, colorblind_type)
+            assert is_colorblind_safe(colors, colorblind_type)
+
+    def test_audit_colormaps(self):
+        """Test the batch audit of a collection."""
+        colormaps = {
+            "cells": {
+                "type": "categorical",
+                "colors": {"T": "#009E73", "B": "#CC79A7", "NK": "#000000"},
+            },
+            "single": {"type": "categorical", "colors": {"only": "#FF0000"}},
+            "expression": {
+                "type": "continuous",
+                "colors": ["#000000", "#FFFFFF"],
+                "positions": [0.0, 1.0],
+            },
+        }
+        results = audit_colormaps(colormaps)
+        assert list(results) == ["cells", "single"]
+        assert list(results["cells"]) == list(COLORBLIND_TYPES)
+        report = results["cells"]["deuteranopia"]
+        assert report["offending_pairs"] == [("T", "B", pytest.approx(51.5, abs=0.1))]
+        assert results["cells"]["tritanopia"]["safe"]
+        assert results["single"]["protanopia"]["safe"]
+
+
+class TestGeneratePalette:
+    """Test farthest-point palette generation."""
+
+    def test_distinct_and_spread(self):
+        """Test that generated colors are distinct and well separated."""
+        colors = generate_palette(50)
+        assert len(set(colors)) == 50
+        assert min_distance(colors) > 10
+
+    def test_prefix_stable_and_incremental(self):
+        """Test that palettes extend without changing earlier colors."""
+        palette = generate_palette(40)
+        assert generate_palette(10) == palette[:10]
+
+        sampler = PaletteSampler()
+        assert sampler.take(15) + sampler.take(25) == palette
+        assert sampler.colors == palette
+
+    def test_seeds(self):
+        """Test that seed colors are avoided and not returned."""
+        seeds = ["#FF0000", "#00FF00", "#0000FF"]
+        colors = generate_palette(20, seeds=seeds)
+        assert not set(seeds) & set(colors)
+        assert min_distance(seeds + colors) > 10
+
+    def test_lightness_range(self):
+        """Test the lightness constraint."""
+        colors = generate_palette(30, lightness_range=(40, 70))
+        lightness = rgb_to_lab_array(hex_to_rgb_array(colors))[:, 0]
+        assert lightness.min() >= 40 and lightness.max() <= 70
+
+        with pytest.raises(ValueError):
+            generate_palette(5, lightness_range=(70, 40))
+        with pytest.raises(ValueError):
+            generate_palette(5, lightness_range=(101, 102))
+
+    def test_colorblind_constraint(self):
+        """Test that simulated distances improve with the constraint."""
+        plain = generate_palette(30)
+        safe = generate_palette(30, colorblind_types=("deuteranopia",))
+        assert min_distance(safe, "deuteranopia") > min_distance(plain, "deuteranopia")
+
+    def test_exhausted_grid(self):
+        """Test requesting more colors than the grid has."""
+        assert len(generate_palette(27, grid_levels=3)) == 27
+        with pytest.raises(ValueError):
+            generate_palette(28, grid_levels=3)
+        with pytest.raises(ValueError):
+            generate_palette(-1)
+
+    def test_500_colorblind_aware_colors(self):
+        """Test a large palette distinct under every colorblind type."""
+        colors = generate_palette(500, colorblind_types=COLORBLIND_TYPES)
+        assert len(set(colors)) == 500
+
+
+class TestSafeColors:
+    """Test extending the colorblind-safe palette."""
+
+    def test_many_safe_colors(self):
+        """Test that large safe palettes have no duplicates or grays."""
+        colors = get_colorblind_safe_colors(300)
+        assert len(set(colors)) == 300
+        assert colors.count("#CCCCCC") == 0
+        assert get_colorblind_safe_colors(12) == colors[:12]
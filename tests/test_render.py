@@ -0,0 +1,254 @@
+"""
+Tests for collection swatch sheets and headless raster rendering.
+"""
+
+import struct
+import subprocess
+import sys
+import zlib
+
+import numpy as np
+import pytest
+
+from bio_crayon import BioCrayon
+from bio_crayon.render import (
+    collect_colormaps,
+    colormap_strip,
+    encode_png,
+    render_swatch_image,
+    render_swatch_sheet,
+    write_png,
+)
+
+
+def decode_png(data):
+    """Decode the Sub-filtered 8-bit PNG files written by encode_png."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position, idat = 8, b""
+    while position < len(data):
+        (length,) = struct.unpack(">I", data[position : position + 4])
+        kind = data[position + 4 : position + 8]
+        body = data[position + 8 : position + 8 + length]
+        end = position + 8 + length
+        (crc,) = struct.unpack(">I", data[end : end + 4])
+        assert zlib.crc32(kind + body) == crc
+        if kind == b"IHDR":
+            width, height, _, color_type = struct.unpack(">IIBB", body[:10])
+        elif kind == b"IDAT":
+            idat += body
+        position += 12 + length
+
+    channels = {0: 1, 2: 3, 6: 4}[color_type]
+    rows = np.frombuffer(zlib.decompress(idat), dtype=np.uint8)
+    rows = rows.reshape(height, width * channels + 1)
+    assert (rows[:, 0] == 1).all()
+    pixels = rows[:, 1:].reshape(height, width, channels).astype(np.int64)
+    return (np.cumsum(pixels, axis=1) % 256).astype(np.uint8)
+
+
+class TestSwatchSheet:
+    """Test rendering whole collections."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.cells = BioCrayon(
+            {
+                "colormaps": {
+                    "cells": {
+                        "type": "categorical",
+                        "colors": {"T": "#FF0000", "B": "#00FF00", "NK": "#0000FF"},
+                    },
+                    "expression": {
+                        "type": "continuous",
+                        "colors": ["#000000", "#FFFFFF"],
+                        "positions": [0.0, 1.0],
+                    },
+                }
+            }
+        )
+        self.tissue = BioCrayon(
+            {
+                "colormaps": {
+                    "tissue": {
+                        "type": "categorical",
+                        "colors": {"brain": "#FFFF00"},
+                    }
+                }
+            }
+        )
+
+    def test_colormap_strip(self):
+        """Test sampling single colormaps across a row."""
+        strip = colormap_strip(self.cells.get_colormap("cells"), width=6)
+        assert strip.dtype == np.uint8
+        assert (
+            strip.tolist() == [[255, 0, 0]] * 2 + [[0, 255, 0]] * 2 + [[0, 0, 255]] * 2
+        )
+
+        gradient = colormap_strip(self.cells.get_colormap("expression"), width=5)
+        assert gradient[:, 0].tolist() == [0, 64, 128, 191, 255]
+
+    def test_collect_labels(self):
+        """Test labels for single, multiple and labeled collections."""
+        assert [label for label, _ in collect_colormaps(self.cells)] == [
+            "cells",
+            "expression",
+        ]
+        labeled = collect_colormaps({"blood": self.cells, "organs": self.tissue})
+        assert [label for label, _ in labeled] == [
+            "blood/cells",
+            "blood/expression",
+            "organs/tissue",
+        ]
+
+    def test_swatch_image_layout(self):
+        """Test rows, gaps and colors of the swatch image."""
+        image = render_swatch_image(
+            [self.cells, self.tissue], width=30, row_height=3, gap=2
+        )
+        assert image.shape == (3 * 3 + 2 * 2, 30, 3)
+        assert (image[0:3, 0] == [255, 0, 0]).all()
+        assert (image[3:5] == 255).all()
+        assert (image[5:8, 0] == [0, 0, 0]).all()
+        assert (image[10:13] == [255, 255, 0]).all()
+
+        with pytest.raises(ValueError):
+            render_swatch_image(self.cells, row_height=0)
+
+    def test_process_pool(self):
+        """Test that worker processes produce the same image."""
+        collections = [self.cells, self.tissue] * 3
+        expected = render_swatch_image(collections, width=64)
+        pooled = render_swatch_image(collections, width=64, processes=2, chunk_size=2)
+        np.testing.assert_array_equal(pooled, expected)
+
+    def test_sheet_files(self, tmp_path):
+        """Test saving the sheet as PNG and SVG without pyplot figures."""
+        import matplotlib.pyplot as plt
+
+        open_figures = plt.get_fignums()
+        fig = render_swatch_sheet(
+            {"blood": self.cells, "organs": self.tissue}, tmp_path / "sheet.png"
+        )
+        render_swatch_sheet(self.cells, tmp_path / "sheet.svg")
+        assert plt.get_fignums() == open_figures
+
+        assert (tmp_path / "sheet.png").read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+        assert b"<svg" in (tmp_path / "sheet.svg").read_bytes()
+        ax = fig.axes[0]
+        assert len(ax.images) == 1
+        assert [label.get_text() for label in ax.get_yticklabels()] == [
+            "blood/cells",
+            "blood/expression",
+            "organs/tissue",
+        ]
+
+        with pytest.raises(ValueError):
+            render_swatch_sheet([])
+
+
+class TestRenderArray:
+    """Test coloring 2-D arrays without matplotlib."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.biocrayon = BioCrayon(
+            {
+                "colormaps": {
+                    "expression": {
+                        "type": "continuous",
+                        "colors": ["#000000", "#FF0000", "#FFFFFF"],
+                        "positions": [0.0, 0.5, 1.0],
+                    },
+                    "cells": {"type": "categorical", "colors": {"T": "#FF0000"}},
+                }
+            }
+        )
+
+    def test_matches_get_colors(self):
+        """Test chunked rendering against the exact lookup."""
+        values = np.random.default_rng(1).normal(size=(37, 23)) * 3
+        values[5, 7] = np.nan
+        image = self.biocrayon.render_array(
+            "expression", values, vmin=-2, vmax=2, chunk_rows=8
+        )
+        assert image.dtype == np.uint8
+        assert image.shape == (37, 23, 4)
+
+        expected = self.biocrayon.get_colors("expression", (values + 2) / 4)
+        expected = np.rint(expected * 255)
+        finite = ~np.isnan(values)
+        assert np.abs(image[finite] - expected[finite]).max() <= 1
+        assert (image[finite, 3] == 255).all()
+        assert image[5, 7].tolist() == [0, 0, 0, 0]
+
+    def test_autoscale_and_out(self):
+        """Test the default value range and writing into a given array."""
+        values = np.array([[10.0, 20.0], [np.inf, 30.0]])
+        out = np.zeros((2, 2, 4), dtype=np.uint8)
+        image = self.biocrayon.render_array(
+            "expression", values, out=out, default_color="#00FF00"
+        )
+        assert image is out
+        assert image[0, 0].tolist() == [0, 0, 0, 255]
+        assert image[0, 1].tolist() == [255, 0, 0, 255]
+        assert image[1, 0].tolist() == [255, 255, 255, 255]
+
+        with pytest.raises(ValueError):
+            self.biocrayon.render_array("expression", values, out=out[:1])
+        with pytest.raises(ValueError):
+            self.biocrayon.render_array("expression", values[0])
+        with pytest.raises(ValueError):
+            self.biocrayon.render_array("cells", values)
+        with pytest.raises(ValueError, match="vmin"):
+            self.biocrayon.render_array("expression", values, vmin=2, vmax=1)
+        with pytest.raises(ValueError, match="vmin"):
+            self.biocrayon.render_array("expression", values, vmin=100)
+
+        # Equal bounds are allowed and map everything to the first color
+        flat = self.biocrayon.render_array("expression", values, vmin=5, vmax=5)
+        assert (flat[..., :3] == 0).all()
+
+    def test_png_round_trip(self, tmp_path):
+        """Test the PNG encoder for gray, RGB and RGBA images."""
+        rng = np.random.default_rng(2)
+        for shape in [(5, 7), (300, 3, 3), (9, 600, 4)]:
+            image = rng.integers(0, 256, shape, dtype=np.uint8)
+            decoded = decode_png(encode_png(image))
+            np.testing.assert_array_equal(decoded.reshape(image.shape), image)
+
+        image = self.biocrayon.render_array("expression", rng.random((20, 30)))
+        write_png(tmp_path / "tile.png", image)
+        np.testing.assert_array_equal(
+            decode_png((tmp_path / "tile.png").read_bytes()), image
+        )
+
+        with pytest.raises(ValueError):
+            encode_png(image.astype(np.float32))
+        with pytest.raises(ValueError):
+            encode_png(np.zeros((0, 4, 4), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            encode_png(image, compression=10)
+
+    def test_invalid_image_keeps_file(self, tmp_path):
+        """Test that write_png checks the image before opening the file."""
+        path = tmp_path / "tile.png"
+        path.write_bytes(b"existing")
+        with pytest.raises(ValueError):
+            write_png(path, np.zeros((4, 4), dtype=np.float64))
+        with pytest.raises(ValueError):
+            write_png(path, np.zeros((4, 4, 2), dtype=np.uint8))
+        assert path.read_bytes() == b"existing"
+
+    def test_no_matplotlib_import(self):
+        """Test that raster rendering does not import matplotlib."""
+        script = (
+            "import sys, numpy as np\n"
+            "from bio_crayon import BioCrayon\n"
+            "from bio_crayon.render import encode_png\n"
+            "bc = BioCrayon({'colormaps': {'e': {'type': 'continuous', "
+            "'colors': ['#000000', '#FFFFFF'], 'positions': [0.0, 1.0]}}})\n"
+            "encode_png(bc.render_array('e', np.eye(4)))\n"
+            "assert 'matplotlib' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
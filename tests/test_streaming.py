@@ -0,0 +1,193 @@
+"""
+Tests for incremental loading of JSON collections.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from bio_crayon import BioCrayon
+from bio_crayon.streaming import LazyColormaps, open_json_collection
+
+
+class TestOpenJsonCollection:
+    """Test indexing JSON collections."""
+
+    def setup_method(self):
+        """Set up test data with strings that look like JSON structure."""
+        self.test_data = {
+            "metadata": {
+                "name": "Streaming {Test} [1]",
+                "version": "1.0",
+                "keywords": ["a", "b"],
+                "accessibility": {"colorblind_safe": True, "tested_types": []},
+            },
+            "colormaps": {
+                "cells": {
+                    "type": "categorical",
+                    "description": 'Quoted "}" and escaped \\ characters',
+                    "colors": {"T cells {CD4+}": "#FF0000", "naïve [B]": "#00FF00"},
+                },
+                "expression": {
+                    "type": "continuous",
+                    "colors": ["#000000", "#FFFFFF"],
+                    "positions": [0, 1.0e0],
+                    "interpolation": "linear",
+                },
+                "empty_fields": {"type": "categorical", "colors": {}, "extra": []},
+            },
+        }
+
+    def write(self, tmp_path, data, **kwargs):
+        path = tmp_path / "collection.json"
+        path.write_text(json.dumps(data, **kwargs), encoding="utf-8")
+        return path
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_matches_json_load(self, tmp_path, indent):
+        """Test that every colormap parses to what json.load returns."""
+        path = self.write(tmp_path, self.test_data, indent=indent)
+        data = open_json_collection(path)
+
+        assert data["metadata"] == self.test_data["metadata"]
+        colormaps = data["colormaps"]
+        assert isinstance(colormaps, LazyColormaps)
+        assert list(colormaps) == list(self.test_data["colormaps"])
+        assert dict(colormaps) == self.test_data["colormaps"]
+
+    def test_escaped_keys(self, tmp_path):
+        """Test colormap names written with escape sequences."""
+        path = self.write(tmp_path, {"colormaps": {"café": {}}}, ensure_ascii=True)
+        assert list(open_json_collection(path)["colormaps"]) == ["café"]
+
+    def test_parsed_on_access(self, tmp_path):
+        """Test that only accessed colormaps are parsed, once."""
+        colormaps = open_json_collection(self.write(tmp_path, self.test_data))[
+            "colormaps"
+        ]
+        assert colormaps.loaded == {}
+        assert "cells" in colormaps and len(colormaps) == 3
+
+        cells = colormaps["cells"]
+        assert colormaps["cells"] is cells
+        assert list(colormaps.loaded) == ["cells"]
+
+    def test_mutable_mapping(self, tmp_path):
+        """Test adding, replacing and removing colormaps."""
+        colormaps = open_json_collection(self.write(tmp_path, self.test_data))[
+            "colormaps"
+        ]
+        colormaps["added"] = {"type": "categorical", "colors": {"a": "#000000"}}
+        colormaps["cells"] = {"type": "categorical", "colors": {"b": "#FFFFFF"}}
+        del colormaps["expression"]
+
+        assert list(colormaps) == ["cells", "empty_fields", "added"]
+        assert colormaps["cells"]["colors"] == {"b": "#FFFFFF"}
+        with pytest.raises(KeyError):
+            colormaps["expression"]
+
+    def test_without_colormaps_object(self, tmp_path):
+        """Test documents whose 'colormaps' is missing or not an object."""
+        assert open_json_collection(self.write(tmp_path, {"metadata": {}})) == {
+            "metadata": {}
+        }
+        data = open_json_collection(self.write(tmp_path, {"colormaps": [1, 2]}))
+        assert data == {"colormaps": [1, 2]}
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "[]",
+            '{"colormaps": {"a": {"type": "categorical"}',
+            '{"colormaps": {"a" {}}}',
+            '{"colormaps": {}} trailing',
+            '{"colormaps": {"a": "unterminated}}',
+            # Truncated inside a long array: must fail fast, not backtrack
+            json.dumps(
+                {
+                    "colormaps": {
+                        f"gene_{i}": {
+                            "type": "continuous",
+                            "colors": ["#000000", "#FFFFFF"],
+                            "positions": [k / 40 for k in range(41)],
+                        }
+                        for i in range(3)
+                    }
+                }
+            )[:300],
+        ],
+    )
+    def test_malformed(self, tmp_path, text):
+        """Test that malformed documents raise ValueError without hanging."""
+        path = tmp_path / "malformed.json"
+        path.write_text(text)
+        # A subprocess, since a runaway regex cannot be interrupted in-process
+        script = (
+            "import sys\n"
+            "from bio_crayon.streaming import open_json_collection\n"
+            "try:\n"
+            "    open_json_collection(sys.argv[1])\n"
+            "except ValueError:\n"
+            "    sys.exit(0)\n"
+            "sys.exit(1)\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script, str(path)], check=True, timeout=10
+        )
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            open_json_collection(tmp_path / "missing.json")
+
+
+class TestStreamedBioCrayon:
+    """Test BioCrayon on incrementally loaded files."""
+
+    def setup_method(self):
+        """Set up a collection of many continuous colormaps."""
+        self.test_data = {
+            "metadata": {"name": "Atlas", "version": "1.0"},
+            "colormaps": {
+                f"gene_{i}": {
+                    "type": "continuous",
+                    "colors": ["#000000", f"#{i:06X}"],
+                    "positions": [0.0, 1.0],
+                }
+                for i in range(200)
+            },
+        }
+
+    def test_lazy_file_load(self, tmp_path):
+        """Test that lazy mode only parses the colormaps that are used."""
+        path = tmp_path / "atlas.json"
+        path.write_text(json.dumps(self.test_data))
+
+        bc = BioCrayon(path, strict=False)
+        assert len(bc) == 200
+        assert bc.get_color("gene_17", 1.0) == "#000011"
+        assert bc.get_metadata()["name"] == "Atlas"
+        assert list(bc._colormaps.loaded) == ["gene_17"]
+
+        # Strict mode reads the whole document
+        assert isinstance(BioCrayon(path)._colormaps, dict)
+
+    def test_save_materializes(self, tmp_path):
+        """Test saving an incrementally loaded collection."""
+        path = tmp_path / "atlas.json"
+        path.write_text(json.dumps(self.test_data))
+        bc = BioCrayon(path, strict=False)
+        bc.add_colormap("added", {"type": "categorical", "colors": {"a": "#FF0000"}})
+
+        json_path = tmp_path / "saved.json"
+        bc.save(json_path)
+        saved = json.loads(json_path.read_text())
+        assert list(saved["colormaps"])[-1] == "added"
+        assert len(saved["colormaps"]) == 201
+
+        bundle_path = tmp_path / "saved.bcb"
+        bc.save(bundle_path)
+        assert BioCrayon(bundle_path).get_color("gene_199", 1.0) == "#0000C7"
@@ -0,0 +1,232 @@
+"""
+Tests for tile pyramids of large arrays.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from bio_crayon import BioCrayon
+from bio_crayon.tiles import (
+    LOG_FILENAME,
+    MANIFEST_FILENAME,
+    open_array,
+    pyramid_shapes,
+    render_tiles,
+)
+
+from .test_render import decode_png
+
+
+class TestTiles:
+    """Test rendering tile pyramids."""
+
+    def setup_method(self):
+        """Set up test data."""
+        self.biocrayon = BioCrayon(
+            {
+                "colormaps": {
+                    "expression": {
+                        "type": "continuous",
+                        "colors": ["#000000", "#FFFFFF"],
+                        "positions": [0.0, 1.0],
+                    },
+                    "cells": {"type": "categorical", "colors": {"T": "#FF0000"}},
+                }
+            }
+        )
+        rng = np.random.default_rng(3)
+        self.values = rng.random((70, 45)).astype(np.float32)
+        self.values[3, 4] = np.nan
+
+    def test_pyramid_shapes(self):
+        """Test level sizes of both layouts."""
+        assert pyramid_shapes(70, 45, 16, "xyz") == [
+            (70, 45),
+            (35, 23),
+            (18, 12),
+            (9, 6),
+        ]
+        assert pyramid_shapes(10, 10, 16, "xyz") == [(10, 10)]
+        assert pyramid_shapes(5, 3, 16, "dzi") == [(5, 3), (3, 2), (2, 1), (1, 1)]
+        with pytest.raises(ValueError):
+            pyramid_shapes(5, 3, 16, "tms")
+
+    def test_xyz_tiles(self, tmp_path):
+        """Test tile colors, padding and the manifest of an XYZ pyramid."""
+        np.save(tmp_path / "values.npy", self.values)
+        manifest = render_tiles(
+            self.biocrayon,
+            "expression",
+            tmp_path / "values.npy",
+            tmp_path / "tiles",
+            tile_size=16,
+            vmin=0.0,
+            vmax=1.0,
+            block_size=8,
+        )
+        assert manifest["complete"]
+        assert [level["zoom"] for level in manifest["levels"]] == [3, 2, 1, 0]
+        assert manifest["tile_count"] == 3 * 5 + 2 * 3 + 1 * 2 + 1
+        assert not (tmp_path / "tiles" / ".levels").exists()
+
+        tile = decode_png((tmp_path / "tiles" / "3" / "1" / "0.png").read_bytes())
+        assert tile.shape == (16, 16, 4)
+        expected = np.rint(self.values[:16, 16:32] * 255)
+        assert np.abs(tile[:, :, 0] - expected).max() <= 1
+
+        # Edge tiles are padded with transparent pixels
+        edge = decode_png((tmp_path / "tiles" / "3" / "2" / "4.png").read_bytes())
+        assert (edge[:6, :13, 3] == 255).all()
+        assert (edge[6:, :, 3] == 0).all() and (edge[:, 13:, 3] == 0).all()
+
+        # Coarser levels are NaN-aware 2 x 2 means
+        coarse = decode_png((tmp_path / "tiles" / "2" / "0" / "0.png").read_bytes())
+        block = self.values[2:4, 4:6]
+        assert abs(int(coarse[1, 2, 0]) - np.nanmean(block) * 255) <= 1
+        top = decode_png((tmp_path / "tiles" / "0" / "0" / "0.png").read_bytes())
+        assert top[:9, :6, 3].all() and not top[9:, :, 3].any()
+
+    def test_dzi_tiles(self, tmp_path):
+        """Test the descriptor and partial edge tiles of a Deep Zoom pyramid."""
+        manifest = render_tiles(
+            self.biocrayon,
+            "expression",
+            self.values,
+            tmp_path,
+            layout="dzi",
+            tile_size=32,
+            name="slide",
+        )
+        assert manifest["vmin"] == pytest.approx(float(np.nanmin(self.values)))
+        assert manifest["levels"][0]["zoom"] == 7
+        assert manifest["levels"][-1]["width"] == manifest["levels"][-1]["height"] == 1
+        descriptor = (tmp_path / "slide.dzi").read_text()
+        assert 'TileSize="32"' in descriptor and 'Width="45" Height="70"' in descriptor
+
+        edge = decode_png((tmp_path / "slide_files" / "7" / "1_2.png").read_bytes())
+        assert edge.shape == (6, 13, 4)
+        assert (tmp_path / "slide_files" / "0" / "0_0.png").exists()
+
+    def test_resume(self, tmp_path):
+        """Test that completed tiles are skipped and settings are checked."""
+        kwargs = dict(tile_size=16, vmin=0.0, vmax=1.0)
+        render_tiles(self.biocrayon, "expression", self.values, tmp_path, **kwargs)
+        reference = (tmp_path / "3" / "0" / "0.png").read_bytes()
+
+        # Simulate an interrupted run: a tile is lost and the run not complete
+        manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text())
+        manifest["complete"] = False
+        (tmp_path / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+        log = (tmp_path / LOG_FILENAME).read_text().splitlines()
+        log.remove("3/0/0")
+        (tmp_path / LOG_FILENAME).write_text("\n".join(log) + "\n3/1")
+        (tmp_path / "3" / "0" / "0.png").unlink()
+        (tmp_path / "3" / "1" / "1.png").write_bytes(b"untouched")
+
+        render_tiles(self.biocrayon, "expression", self.values, tmp_path, **kwargs)
+        assert (tmp_path / "3" / "0" / "0.png").read_bytes() == reference
+        assert (tmp_path / "3" / "1" / "1.png").read_bytes() == b"untouched"
+
+        with pytest.raises(ValueError, match="different settings"):
+            render_tiles(
+                self.biocrayon, "expression", self.values, tmp_path, tile_size=32
+            )
+        render_tiles(
+            self.biocrayon, "expression", self.values, tmp_path, resume=False, **kwargs
+        )
+        assert (tmp_path / "3" / "1" / "1.png").read_bytes() != b"untouched"
+
+    def test_process_pool(self, tmp_path):
+        """Test that worker processes write the same tiles."""
+        kwargs = dict(tile_size=16, vmin=0.0, vmax=1.0)
+        render_tiles(
+            self.biocrayon, "expression", self.values, tmp_path / "serial", **kwargs
+        )
+        render_tiles(
+            self.biocrayon,
+            "expression",
+            self.values,
+            tmp_path / "pooled",
+            processes=2,
+            **kwargs,
+        )
+        tiles = {}
+        for run in ("serial", "pooled"):
+            tiles[run] = {
+                path.relative_to(tmp_path / run): path.read_bytes()
+                for path in (tmp_path / run).rglob("*.png")
+            }
+        assert len(tiles["serial"]) == 24
+        assert tiles["pooled"] == tiles["serial"]
+
+    def test_process_pool_resume(self, tmp_path):
+        """Test that resumed pooled runs reuse the spilled full-resolution level."""
+        kwargs = dict(tile_size=16, vmin=0.0, vmax=1.0, processes=2, keep_levels=True)
+        render_tiles(self.biocrayon, "expression", self.values, tmp_path, **kwargs)
+        level_0 = tmp_path / ".levels" / "level_0.npy"
+        assert level_0.exists()
+        mtime = level_0.stat().st_mtime_ns
+
+        manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text())
+        manifest["complete"] = False
+        (tmp_path / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+        (tmp_path / "3" / "0" / "0.png").unlink()
+        log = (tmp_path / LOG_FILENAME).read_text().splitlines()
+        log.remove("3/0/0")
+        (tmp_path / LOG_FILENAME).write_text("\n".join(log) + "\n")
+
+        render_tiles(self.biocrayon, "expression", self.values, tmp_path, **kwargs)
+        assert level_0.stat().st_mtime_ns == mtime
+        assert (tmp_path / "3" / "0" / "0.png").exists()
+
+    def test_mounted_colormap(self, tmp_path):
+        """Test tiling with a mounted "namespace:name" colormap."""
+        kwargs = dict(tile_size=16, vmin=0.0, vmax=1.0)
+        render_tiles(
+            self.biocrayon, "expression", self.values, tmp_path / "local", **kwargs
+        )
+        expected = (tmp_path / "local" / "3" / "1" / "0.png").read_bytes()
+
+        bc = BioCrayon()
+        bc.mount("atlas", self.biocrayon)
+        for processes in (None, 2):
+            output_dir = tmp_path / f"mounted_{processes}"
+            manifest = render_tiles(
+                bc,
+                "atlas:expression",
+                self.values,
+                output_dir,
+                processes=processes,
+                **kwargs,
+            )
+            assert manifest["colormap_name"] == "atlas:expression"
+            assert (output_dir / "3" / "1" / "0.png").read_bytes() == expected
+
+    def test_errors(self, tmp_path):
+        """Test invalid colormaps and arrays."""
+        with pytest.raises(ValueError):
+            render_tiles(self.biocrayon, "cells", self.values, tmp_path)
+        with pytest.raises(KeyError):
+            render_tiles(self.biocrayon, "missing", self.values, tmp_path)
+        with pytest.raises(ValueError):
+            render_tiles(self.biocrayon, "expression", self.values[0], tmp_path)
+        with pytest.raises(FileNotFoundError):
+            open_array(tmp_path / "missing.npy")
+
+    def test_zarr_source(self, tmp_path):
+        """Test reading chunked zarr arrays."""
+        zarr = pytest.importorskip("zarr")
+        array = zarr.open(
+            str(tmp_path / "values.zarr"),
+            mode="w",
+            shape=self.values.shape,
+            chunks=(16, 16),
+            dtype="f4",
+        )
+        array[:] = self.values
+        manifest = render_tiles(
+            self.biocrayon, "expression", tmp_path / "values.zarr", tmp_path / "tiles"
+        )
+        assert manifest["levels"][0]["width"] == 45
@@ -6,9 +6,13 @@ import pytest
 import json
 from pathlib import Path
 
+import numpy as np
+
 from bio_crayon.utils import (
     hex_to_rgb,
     rgb_to_hex,
+    hex_to_rgb_array,
+    rgb_array_to_hex,
     rgb_to_hsv,
     hsv_to_rgb,
     interpolate_colors,
@@ -19,10 +23,15 @@ from bio_crayon.utils import (
     calculate_color_distance,
     rgb_to_lab,
     lab_to_rgb,
+    rgb_to_lab_array,
+    lab_to_rgb_array,
+    interpolate_lab_array,
     interpolate_color_lab,
     is_colorblind_safe,
+    colorblind_safety_report,
     get_colorblind_safe_colors,
 )
+from bio_crayon import utils
 
 
 class TestColorConversions:
@@ -74,6 +83,28 @@ class TestColorConversions:
         with pytest.raises(ValueError):
             rgb_to_hex(0, -1, 0)
 
+    def test_hex_to_rgb_array(self):
+        """Test batch hex to RGB conversion."""
+        rgb = hex_to_rgb_array(["#FF0000", "#0F0", "#0000ff"])
+        assert rgb.shape == (3, 3)
+        assert rgb.dtype == np.uint8
+        assert rgb.tolist() == [[255, 0, 0], [0, 255, 0], [0, 0, 255]]
+
+        with pytest.raises(ValueError):
+            hex_to_rgb_array(["#GGGGGG"])
+
+    def test_rgb_array_to_hex(self):
+        """Test batch RGB to hex conversion."""
+        rgb = np.array([[[255, 0, 0], [0, 128, 255]]])
+        hex_colors = rgb_array_to_hex(rgb)
+        assert hex_colors.shape == (1, 2)
+        assert hex_colors.tolist() == [["#FF0000", "#0080FF"]]
+
+        with pytest.raises(ValueError):
+            rgb_array_to_hex(np.array([[256, 0, 0]]))
+        with pytest.raises(ValueError):
+            rgb_array_to_hex(np.array([[0, 0]]))
+
     def test_rgb_to_hsv(self):
         """Test RGB to HSV conversion."""
         h, s, v = rgb_to_hsv(255, 0, 0)
@@ -162,6 +193,22 @@ class TestLABColorSpace:
         for orig, conv in zip(original_rgb, converted_rgb):
             assert abs(orig - conv) <= 2
 
+    def test_srgb_transfer_curve(self):
+        """Test the sRGB transfer functions shared with the simulation."""
+        assert utils._srgb_to_linear(0.5) == pytest.approx(0.214041, abs=1e-6)
+        assert utils._linear_to_srgb(0.214041) == pytest.approx(0.5, abs=1e-6)
+
+        channel = np.arange(256) / 255.0
+        linear = utils._srgb_to_linear(channel)
+        np.testing.assert_allclose(utils._linear_to_srgb(linear), channel, atol=1e-12)
+        np.testing.assert_allclose(
+            linear, [utils._srgb_to_linear(c) for c in channel.tolist()], rtol=1e-12
+        )
+
+        # Reference CIELAB (D65) values of sRGB colors
+        assert rgb_to_lab(255, 0, 0) == pytest.approx((53.24, 80.09, 67.20), abs=0.05)
+        assert rgb_to_lab(128, 128, 128)[0] == pytest.approx(53.59, abs=0.01)
+
     def test_interpolate_color_lab(self):
         """Test LAB color interpolation."""
         # Test interpolation between black and white
@@ -180,6 +227,51 @@ class TestLABColorSpace:
         assert b > 100
         assert g < 100
 
+    def test_rgb_to_lab_array_matches_scalar(self):
+        """Test that the array conversion matches the scalar function."""
+        rgb = np.array([[0, 0, 0], [255, 255, 255], [255, 128, 64], [5, 10, 200]])
+        lab = rgb_to_lab_array(rgb)
+        assert lab.shape == (4, 3)
+        for row, expected in zip(rgb.tolist(), lab):
+            np.testing.assert_allclose(rgb_to_lab(*row), expected)
+
+        # Arbitrary leading dimensions are supported
+        assert rgb_to_lab_array(rgb.reshape(2, 2, 3)).shape == (2, 2, 3)
+
+    def test_lab_to_rgb_array_matches_scalar(self):
+        """Test that the array conversion matches the scalar function."""
+        lab = np.array([[0, 0, 0], [100, 0, 0], [53, 80, 67], [30, -40, 120]])
+        rgb = lab_to_rgb_array(lab)
+        assert rgb.dtype == np.uint8
+        for row, converted in zip(lab.tolist(), rgb.tolist()):
+            assert tuple(converted) == lab_to_rgb(*row)
+
+    def test_scalar_and_array_agree_on_grid(self):
+        """Test that scalar and array conversions agree across color space."""
+        steps = np.arange(0, 256, 15)
+        rgb = np.stack(np.meshgrid(steps, steps, steps), axis=-1).reshape(-1, 3)
+        lab = rgb_to_lab_array(rgb)
+        scalar_lab = np.array([rgb_to_lab(*row) for row in rgb.tolist()])
+        # NumPy and Python powers may differ in the last bit
+        np.testing.assert_allclose(lab, scalar_lab, rtol=1e-12, atol=1e-12)
+
+        # Include LAB values outside the sRGB gamut, which are clamped
+        l, a, b = np.meshgrid(
+            np.linspace(0, 100, 9), np.linspace(-128, 127, 9), np.linspace(-128, 127, 9)
+        )
+        lab = np.concatenate([lab, np.stack([l, a, b], axis=-1).reshape(-1, 3)])
+        scalar_rgb = np.array([lab_to_rgb(*row) for row in lab.tolist()])
+        np.testing.assert_array_equal(lab_to_rgb_array(lab), scalar_rgb)
+
+    def test_interpolate_lab_array(self):
+        """Test batch LAB interpolation against the scalar version."""
+        t = np.linspace(0, 1, 11)
+        rgb = interpolate_lab_array([255, 0, 0], [0, 0, 255], t)
+        assert rgb.shape == (11, 3)
+        for ti, row in zip(t, rgb.tolist()):
+            expected = hex_to_rgb(interpolate_color_lab("#FF0000", "#0000FF", ti))
+            assert tuple(row) == expected
+
 
 class TestColorblindSafety:
     """Test colorblind safety functions."""
@@ -204,6 +296,62 @@ class TestColorblindSafety:
         """Test colorblind safety with empty list."""
         assert is_colorblind_safe([]) == True
 
+    def test_safety_report(self):
+        """Test the offending pairs and minimum distance of a palette."""
+        colors = ["#000000", "#FF0000", "#0A0A0A", "#FF1000", "#000000"]
+        report = colorblind_safety_report(colors, colorblind_type=None)
+        assert report["safe"] is False
+        assert report["min_distance"] == 0.0
+        assert report["threshold"] == 80.0
+        assert [pair[:2] for pair in report["offending_pairs"]] == [
+            (0, 4),
+            (1, 3),
+            (0, 2),
+            (2, 4),
+        ]
+        assert report["offending_pairs"][1][2] == pytest.approx(16.0)
+
+        safe = colorblind_safety_report(["#000000", "#FFFFFF"], colorblind_type=None)
+        assert safe["safe"] is True
+        assert safe["offending_pairs"] == []
+        assert safe["min_distance"] == pytest.approx(441.67, abs=0.01)
+        assert colorblind_safety_report([])["min_distance"] == float("inf")
+
+    def test_safety_report_matches_pairwise_distances(self, monkeypatch):
+        """Test the blocked distance matrix against calculate_color_distance."""
+        # Force several row blocks
+        monkeypatch.setattr(utils, "_DISTANCE_BLOCK_SIZE", 64)
+        rng = np.random.default_rng(7)
+        colors = rgb_array_to_hex(
+            rng.integers(0, 256, (60, 3)).astype(np.uint8)
+        ).tolist()
+
+        expected = sorted(
+            (calculate_color_distance(colors[i], colors[j]), i, j)
+            for i in range(60)
+            for j in range(i + 1, 60)
+        )
+        report = colorblind_safety_report(colors, colorblind_type=None)
+        assert report["min_distance"] == pytest.approx(expected[0][0])
+        assert [(i, j) for i, j, _ in report["offending_pairs"]] == [
+            (i, j) for distance, i, j in expected if distance < 80
+        ]
+
+    def test_safety_report_kdtree(self, monkeypatch):
+        """Test that the KD-tree path agrees with the distance matrix."""
+        pytest.importorskip("scipy")
+        rng = np.random.default_rng(3)
+        colors = rgb_array_to_hex(
+            rng.integers(0, 256, (300, 3)).astype(np.uint8)
+        ).tolist()
+        expected = colorblind_safety_report(colors)
+        monkeypatch.setattr(utils, "_KDTREE_MIN_COLORS", 2)
+        report = colorblind_safety_report(colors)
+        assert report["min_distance"] == pytest.approx(expected["min_distance"])
+        assert [pair[:2] for pair in report["offending_pairs"]] == [
+            pair[:2] for pair in expected["offending_pairs"]
+        ]
+
     def test_get_colorblind_safe_colors(self):
         """Test getting colorblind-safe colors."""
         colors = get_colorblind_safe_colors(5)
@@ -4,14 +4,22 @@ Tests for validation functions.
 
 import pytest
 import json
+import time
 from pathlib import Path
 
+from bio_crayon import validators
 from bio_crayon.validators import (
+    get_schema_validator,
+    load_schema,
+    reset_schema_cache,
     validate_colormap_data,
+    validate_colormap_entry,
+    validate_colormap_structure,
     validate_hex_color,
     validate_colormap_name,
     validate_continuous_colormap,
     validate_categorical_colormap,
+    validate_colorblind_safety,
     validate_metadata,
     validate_metadata_required,
 )
@@ -409,6 +417,77 @@ class TestCompleteDataValidation:
         assert len(errors) > 0
 
 
+class TestLazyValidation:
+    """Test the structural and per-colormap validators used by lazy loading."""
+
+    def test_structure_ignores_colormap_contents(self):
+        """Test that the structural check only looks at names and types."""
+        data = {
+            "colormaps": {
+                "broken": {"type": "continuous", "colors": ["not-a-color"]},
+            }
+        }
+        assert validate_colormap_structure(data) == []
+        assert len(validate_colormap_data(data)) > 0
+
+    def test_structure_errors(self):
+        """Test structural errors caught at load."""
+        assert len(validate_colormap_structure([])) == 1
+        assert len(validate_colormap_structure({"colormaps": []})) == 1
+        assert len(validate_colormap_structure({"colormap": {}})) == 2
+
+        data = {
+            "colormaps": {
+                "123invalid": {"type": "categorical", "colors": {}},
+                "unknown": {"type": "diverging"},
+                "not_a_dict": "#FF0000",
+            }
+        }
+        assert len(validate_colormap_structure(data)) == 3
+        assert len(validate_colormap_structure(data, require_metadata=True)) == 6
+
+    def test_entry(self):
+        """Test full validation of a single colormap."""
+        valid = {
+            "type": "continuous",
+            "colors": ["#000000", "#FFFFFF"],
+            "positions": [0.0, 1.0],
+        }
+        assert validate_colormap_entry("valid", valid) == []
+
+        # Caught by the schema
+        schema_invalid = dict(valid, colors=["#000000", "white"])
+        assert len(validate_colormap_entry("invalid", schema_invalid)) == 1
+
+        # Only caught by the per-type checks
+        unsorted = dict(valid, positions=[1.0, 0.0])
+        assert validate_colormap_entry("unsorted", unsorted) == [
+            "Positions must be in ascending order"
+        ]
+
+
+class TestColorblindSafetyValidation:
+    """Test colorblind safety validation."""
+
+    def test_offending_pairs_reported(self):
+        """Test that each pair of similar categories is named."""
+        colormap = {
+            "type": "categorical",
+            "colors": {"T cells": "#FF0000", "NK cells": "#FF1010", "B": "#0000FF"},
+        }
+        errors = validate_colorblind_safety(colormap)
+        assert len(errors) == 2
+        assert "'T cells' and 'NK cells' are too similar" in errors[1]
+
+    def test_safe_colormap(self):
+        """Test a colormap without similar colors."""
+        colormap = {
+            "type": "categorical",
+            "colors": {"a": "#000000", "b": "#E69F00", "c": "#56B4E9"},
+        }
+        assert validate_colorblind_safety(colormap) == []
+
+
 class TestMetadataRequiredValidation:
     """Test metadata required validation for community colormaps."""
 
@@ -482,3 +561,79 @@ class TestMetadataRequiredValidation:
         errors = validate_metadata_required(metadata)
         assert len(errors) == 1
         assert "must have 'description' field" in errors[0]
+
+
+class TestSchemaCache:
+    """Test caching of the compiled schema validator."""
+
+    def setup_method(self):
+        """Set up test data."""
+        reset_schema_cache()
+        self.data = {
+            "colormaps": {
+                "cell_types": {
+                    "type": "categorical",
+                    "colors": {"T_cells": "#FF6B6B", "B_cells": "#4ECDC4"},
+                },
+                "expression": {
+                    "type": "continuous",
+                    "colors": ["#000000", "#FFFFFF"],
+                    "positions": [0.0, 1.0],
+                },
+            }
+        }
+
+    def teardown_method(self):
+        """Leave a fresh cache for other tests."""
+        reset_schema_cache()
+
+    def test_validator_reused(self):
+        """Test that the validator is built once and reused."""
+        validator = get_schema_validator()
+        assert validate_colormap_data(self.data) == []
+        assert get_schema_validator() is validator
+
+    def test_reset_schema_cache(self):
+        """Test that resetting rebuilds the validator."""
+        validator = get_schema_validator()
+        reset_schema_cache()
+        assert get_schema_validator() is not validator
+
+    def test_schema_loaded_once(self, monkeypatch):
+        """Test that repeated validations build the validator only once."""
+        calls = []
+
+        def counting_load_schema():
+            calls.append(1)
+            return load_schema()
+
+        monkeypatch.setattr(validators, "load_schema", counting_load_schema)
+        for _ in range(5):
+            assert validate_colormap_data(self.data) == []
+        assert len(calls) == 1
+
+        reset_schema_cache()
+        validate_colormap_data(self.data)
+        assert len(calls) == 2
+
+    @pytest.mark.benchmark
+    def test_benchmark_cached_validation(self):
+        """Report validation cost with a cold cache and with a warm cache."""
+        rounds = 50
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            reset_schema_cache()
+            validate_colormap_data(self.data)
+        cold = (time.perf_counter() - start) / rounds
+
+        validate_colormap_data(self.data)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            validate_colormap_data(self.data)
+        warm = (time.perf_counter() - start) / rounds
+
+        print(
+            f"validate_colormap_data: {cold * 1e6:.0f} us uncached, "
+            f"{warm * 1e6:.0f} us cached"
+        )